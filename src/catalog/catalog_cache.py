@@ -0,0 +1,71 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Any, Callable, Hashable
+
+from src.utils.fork_utils import ForkSafeLock
+
+
+class CatalogCache(object):
+    """
+    Read-through cache of the objects loaded from the catalog.
+
+    Every entry belongs to the catalog version it got loaded at. Lookups
+    with a newer version drop all the entries, so that any change of the
+    catalog is seen by the next lookup. Misses (None) are not cached, they
+    are looked up again on every call.
+    """
+
+    def __init__(self):
+        self._version = None
+        self._entries = {}
+        self._lock = ForkSafeLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, version: int, key: Hashable,
+            loader: Callable[[], Any]) -> Any:
+        """
+        Returns the cached object, loading it on a miss.
+
+        Arguments:
+            version (int): current version of the catalog
+            key (Hashable): key of the object
+            loader (Callable): loads the object from the catalog
+
+        Returns:
+            the cached or loaded object
+        """
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            if key in self._entries:
+                return self._entries[key]
+
+        value = loader()
+        if value is not None:
+            with self._lock:
+                # the catalog may have changed while loading
+                if version == self._version:
+                    self._entries[key] = value
+        return value
+
+    def clear(self):
+        """
+        Drops all the cached objects.
+        """
+        with self._lock:
+            self._entries.clear()
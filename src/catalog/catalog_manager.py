@@ -13,8 +13,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List, Tuple
+from typing import Any, List, Tuple
 
+from sqlalchemy import inspect
+
+from src.catalog.catalog_cache import CatalogCache
 from src.catalog.column_type import ColumnType, NdArrayType
 from src.catalog.models.base_model import init_db, drop_db
 from src.catalog.models.df_column import DataFrameColumn
@@ -25,16 +28,31 @@ from src.catalog.services.df_column_service import DatasetColumnService
 from src.catalog.services.df_service import DatasetService
 from src.catalog.services.udf_service import UdfService
 from src.catalog.services.udf_io_service import UdfIOService
+from src.udfs.udf_registry import UdfRegistry
+from src.utils.fork_utils import ForkSafeLock
 from src.utils.logging_manager import LoggingLevel
 from src.utils.logging_manager import LoggingManager
 
 
 class CatalogManager(object):
+    """
+    Entry point to the catalog.
+
+    Lookups of tables (with their schema), table bindings, UDFs and UDF
+    IOs are served from an in-process cache, which every change of the
+    catalog made through the manager invalidates by bumping the version.
+    The cache holds copies of the catalog objects detached from the
+    database session, which are shared by all the threads and must not be
+    modified.
+    """
     _instance = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(CatalogManager, cls).__new__(cls)
+            cls._instance._version = 0
+            cls._instance._version_lock = ForkSafeLock()
+            cls._instance._cache = CatalogCache()
 
             cls._instance._bootstrap_catalog()
 
@@ -46,6 +64,21 @@ class CatalogManager(object):
         self._udf_service = UdfService()
         self._udf_io_service = UdfIOService()
 
+    @property
+    def version(self) -> int:
+        """
+        Counter incremented on every change of the catalog. Caches of
+        objects read from or derived from the catalog (e.g. metadata,
+        plans) use it to detect stale entries.
+        """
+        return self._version
+
+    def _bump_version(self):
+        # called after the change is written, so that lookups which still
+        # read the old state are cached under the old version
+        with self._version_lock:
+            self._version += 1
+
     def reset(self):
         """
         This method resets the state of the singleton instance.
@@ -54,6 +87,8 @@ class CatalogManager(object):
         """
         self._shutdown_catalog()
         self._bootstrap_catalog()
+        UdfRegistry().reset()
+        self._bump_version()
         self.__init__()
 
     def _bootstrap_catalog(self):
@@ -100,6 +135,7 @@ class CatalogManager(object):
             column.metadata_id = metadata.id
         column_list = self._column_service.create_column(column_list)
         metadata.schema = column_list
+        self._bump_version()
         return metadata
 
     def get_table_bindings(self, database_name: str, table_name: str,
@@ -117,17 +153,29 @@ class CatalogManager(object):
             returns metadata_id of table and a list of column ids
         """
 
-        metadata_id = self._dataset_service.dataset_by_name(table_name)
-        column_ids = []
-        if column_names is not None:
-            if not isinstance(column_names, list):
-                LoggingManager().log(
-                    "CatalogManager::get_table_binding() expected list",
-                    LoggingLevel.WARNING)
-            column_ids = self._column_service.columns_by_dataset_id_and_names(
-                metadata_id,
-                column_names)
-        return metadata_id, column_ids
+        if column_names is not None and not isinstance(column_names, list):
+            LoggingManager().log(
+                "CatalogManager::get_table_binding() expected list",
+                LoggingLevel.WARNING)
+
+        def load():
+            metadata_id = self._dataset_service.dataset_by_name(table_name)
+            if metadata_id is None:
+                return None
+            column_ids = []
+            if column_names is not None:
+                column_ids = \
+                    self._column_service.columns_by_dataset_id_and_names(
+                        metadata_id,
+                        column_names)
+            return metadata_id, column_ids
+
+        key = ('bindings', table_name,
+               None if column_names is None else tuple(column_names))
+        bindings = self._cache.get(self._version, key, load)
+        if bindings is None:
+            return None, []
+        return bindings
 
     def get_metadata(self, metadata_id: int,
                      col_id_list: List[int] = None) -> DataFrameMetadata:
@@ -141,11 +189,15 @@ class CatalogManager(object):
         Returns:
             metadata object with all the details of video/dataset
         """
-        metadata = self._dataset_service.dataset_by_id(metadata_id)
-        df_columns = self._column_service.columns_by_id_and_dataset_id(
-            metadata_id, col_id_list)
-        metadata.schema = df_columns
-        return metadata
+        def load():
+            metadata = self._dataset_service.dataset_by_id(metadata_id)
+            df_columns = self._column_service.columns_by_id_and_dataset_id(
+                metadata_id, col_id_list)
+            return _detached_metadata(metadata, df_columns)
+
+        key = ('metadata', metadata_id,
+               None if col_id_list is None else tuple(col_id_list))
+        return self._cache.get(self._version, key, load)
 
     def get_column_types(self, table_metadata_id: int,
                          col_id_list: List[int]) -> List[ColumnType]:
@@ -223,16 +275,17 @@ class CatalogManager(object):
             DataFrameMetadata
         """
 
-        metadata = self._dataset_service.dataset_object_by_name(
-            database_name, dataset_name)
-        if metadata is None:
-            return None
-        # we are forced to set schema every time metadata is fetched
-        # ToDo: maybe keep schema as a part of persistent metadata object
-        df_columns = self._column_service.columns_by_id_and_dataset_id(
-            metadata.id, None)
-        metadata.schema = df_columns
-        return metadata
+        def load():
+            metadata = self._dataset_service.dataset_object_by_name(
+                database_name, dataset_name)
+            if metadata is None:
+                return None
+            df_columns = self._column_service.columns_by_id_and_dataset_id(
+                metadata.id, None)
+            return _detached_metadata(metadata, df_columns)
+
+        key = ('dataset', database_name, dataset_name)
+        return self._cache.get(self._version, key, load)
 
     def udf_io(
             self, io_name: str, data_type: ColumnType, array_type: NdArrayType,
@@ -273,6 +326,7 @@ class CatalogManager(object):
         for udf_io in udf_io_list:
             udf_io.udf_id = metadata.id
         self._udf_io_service.add_udf_io(udf_io_list)
+        self._bump_version()
         return metadata
 
     def get_udf_by_name(self, name: str) -> UdfMetadata:
@@ -285,7 +339,9 @@ class CatalogManager(object):
         Returns:
             UdfMetadata object
         """
-        return self._udf_service.udf_by_name(name)
+        return self._cache.get(
+            self._version, ('udf', name),
+            lambda: _detached(self._udf_service.udf_by_name(name)))
 
     def delete_metadata(self, table_name: str) -> bool:
         """
@@ -299,11 +355,14 @@ class CatalogManager(object):
            True if successfully deleted else False
         """
         metadata_id = self._dataset_service.dataset_by_name(table_name)
-        return self._dataset_service.delete_dataset_by_id(metadata_id)
+        deleted = self._dataset_service.delete_dataset_by_id(metadata_id)
+        self._bump_version()
+        return deleted
 
     def delete_udf(self, udf_name: str) -> bool:
         """
-        This method drops the udf entry from the catalog
+        This method drops the udf entry from the catalog and removes the
+        loaded udf instances from the registry
 
         Arguments:
            udf_name: udf name to be dropped.
@@ -311,7 +370,10 @@ class CatalogManager(object):
         Returns:
            True if successfully deleted else False
         """
-        return self._udf_service.delete_udf_by_name(udf_name)
+        deleted = self._udf_service.delete_udf_by_name(udf_name)
+        UdfRegistry().invalidate(udf_name)
+        self._bump_version()
+        return deleted
 
     def get_udf_io_by_name(self, udf_io_name: str) -> UdfIO:
         """Returns the catalog object for the input udfio name
@@ -322,4 +384,37 @@ class CatalogManager(object):
         Returns:
             UdfIO: catalog object found
         """
-        return self._udf_io_service.udf_io_by_name(udf_io_name)
+        return self._cache.get(
+            self._version, ('udf_io', udf_io_name),
+            lambda: _detached(self._udf_io_service.udf_io_by_name(
+                udf_io_name)))
+
+
+def _detached(obj: Any) -> Any:
+    """
+    Returns a copy of the columns of a catalog object which is not attached
+    to the database session, hence it is not expired by commits and can be
+    shared by threads. Objects which are not mapped (e.g. None) are
+    returned as they are.
+    """
+    mapper = inspect(type(obj), raiseerr=False)
+    if mapper is None:
+        return obj
+    copy = mapper.class_manager.new_instance()
+    for attribute in mapper.column_attrs:
+        setattr(copy, attribute.key, getattr(obj, attribute.key))
+    return copy
+
+
+def _detached_metadata(metadata: DataFrameMetadata,
+                       df_columns: List[DataFrameColumn]) \
+        -> DataFrameMetadata:
+    """
+    Returns a detached copy of the metadata with the schema of the columns,
+    the schema is not persisted.
+    """
+    if metadata is None:
+        return None
+    detached = _detached(metadata)
+    detached.schema = [_detached(column) for column in df_columns]
+    return detached
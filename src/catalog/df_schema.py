@@ -25,9 +25,9 @@ class DataFrameSchema(object):
 
         self._name = name
         self._column_list = column_list
-        self._petastorm_schema = SchemaUtils \
-            .get_petastorm_schema(self._name, self._column_list)
-        self._pyspark_schema = self._petastorm_schema.as_spark_schema()
+        # built on first use, binding a query does not need them
+        self._petastorm_schema = None
+        self._pyspark_schema = None
 
     def __str__(self):
         schema_str = "SCHEMA:: (" + self._name + ")\n"
@@ -45,10 +45,15 @@ class DataFrameSchema(object):
 
     @property
     def petastorm_schema(self):
+        if self._petastorm_schema is None:
+            self._petastorm_schema = SchemaUtils.get_petastorm_schema(
+                self._name, self._column_list)
         return self._petastorm_schema
 
     @property
     def pyspark_schema(self):
+        if self._pyspark_schema is None:
+            self._pyspark_schema = self.petastorm_schema.as_spark_schema()
         return self._pyspark_schema
 
     def __eq__(self, other):
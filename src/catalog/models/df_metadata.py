@@ -42,7 +42,11 @@ class DataFrameMetadata(BaseModel):
 
     @schema.setter
     def schema(self, column_list):
-        self._schema = DataFrameSchema(self._name, column_list)
+        # a schema built before (e.g. a cached one) is used as it is
+        if isinstance(column_list, DataFrameSchema):
+            self._schema = column_list
+        else:
+            self._schema = DataFrameSchema(self._name, column_list)
 
     @property
     def id(self):
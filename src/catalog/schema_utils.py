@@ -12,24 +12,30 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from typing import TYPE_CHECKING
+
 import numpy as np
 import pandas as pd
 
-from petastorm.codecs import NdarrayCodec
-from petastorm.codecs import ScalarCodec
-from petastorm.unischema import Unischema
-from petastorm.unischema import UnischemaField
-from pyspark.sql.types import IntegerType, FloatType, StringType
-
 from src.catalog.column_type import ColumnType, NdArrayType
 from src.utils.logging_manager import LoggingLevel
 from src.utils.logging_manager import LoggingManager
 
+if TYPE_CHECKING:
+    from petastorm.unischema import Unischema
+
+# petastorm and pyspark take long to import, they are only loaded once a
+# petastorm schema is needed
+
 
 class SchemaUtils(object):
 
     @staticmethod
     def get_petastorm_column(df_column):
+        from petastorm.codecs import NdarrayCodec
+        from petastorm.codecs import ScalarCodec
+        from petastorm.unischema import UnischemaField
+        from pyspark.sql.types import IntegerType, FloatType, StringType
 
         column_type = df_column.type
         column_name = df_column.name
@@ -75,6 +81,8 @@ class SchemaUtils(object):
 
     @staticmethod
     def get_petastorm_schema(name, column_list):
+        from petastorm.unischema import Unischema
+
         petastorm_column_list = []
         for _column in column_list:
             petastorm_column = SchemaUtils.get_petastorm_column(_column)
@@ -84,12 +92,14 @@ class SchemaUtils(object):
         return petastorm_schema
 
     @staticmethod
-    def petastorm_type_cast(schema: Unischema, df: pd.DataFrame) \
+    def petastorm_type_cast(schema: 'Unischema', df: pd.DataFrame) \
             -> pd.DataFrame:
         """
         Try to cast the type if schema defined in UnischemeField for
         Petastorm is not consistent with panda DataFrame provided.
         """
+        from petastorm.codecs import NdarrayCodec
+
         for unischema in schema.fields.values():
             if not isinstance(unischema.codec, NdarrayCodec):
                 continue
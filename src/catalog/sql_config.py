@@ -12,6 +12,8 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import os
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, scoped_session
 from src.configuration.configuration_manager import ConfigurationManager
@@ -50,3 +52,27 @@ class SQLConfig:
         self.engine = create_engine(uri)
         # statements
         self.session = scoped_session(sessionmaker(bind=self.engine))
+
+
+# sessions and connection pools inherited from the parent process
+_inherited = []
+
+
+def _detach_after_fork():
+    """
+    Gives a forked child process its own sessions and connection pool. The
+    inherited ones share their sockets with the parent, closing them (also
+    on garbage collection) would break the connections of the parent, so
+    they are kept alive until the child exits.
+    """
+    config = SQLConfig._instance
+    if config is None or not hasattr(config, 'engine'):
+        return
+    registry = config.session.registry
+    _inherited.append((registry, config.engine.pool))
+    config.session.registry = type(registry)(registry.createfunc)
+    config.engine.pool = config.engine.pool.recreate()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_detach_after_fork)
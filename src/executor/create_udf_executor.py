@@ -16,6 +16,7 @@
 from src.catalog.catalog_manager import CatalogManager
 from src.executor.abstract_executor import AbstractExecutor
 from src.planner.create_udf_plan import CreateUDFPlan
+from src.udfs.udf_registry import UdfRegistry
 
 
 class CreateUDFExecutor(AbstractExecutor):
@@ -29,7 +30,8 @@ class CreateUDFExecutor(AbstractExecutor):
     def exec(self):
         """Create udf executor
 
-        Calls the catalog to create udf metadata.
+        Calls the catalog to create udf metadata and loads the udf into the
+        registry so that the first query does not pay the model load.
         """
         if (self.node.if_not_exists):
             # check catalog if it already has this udf entry
@@ -41,3 +43,4 @@ class CreateUDFExecutor(AbstractExecutor):
         CatalogManager().create_udf(
             self.node.name, impl_path, self.node.udf_type,
             io_list)
+        UdfRegistry().warm_up(self.node.name, impl_path)
@@ -18,6 +18,7 @@ from src.readers.opencv_reader import OpenCVReader
 from src.models.storage.batch import Batch
 from src.executor.abstract_storage_executor import \
     AbstractStorageExecutor
+from src.executor.executor_utils import prefetch
 from src.planner.storage_plan import StoragePlan
 
 
@@ -34,11 +35,12 @@ class DiskStorageExecutor(AbstractStorageExecutor):
         super().__init__(node)
         self.storage = OpenCVReader(node.video,
                                     batch_size=node.batch_size,
-                                    offset=node.offset)
+                                    offset=node.offset,
+                                    skip_frames=node.skip_frames,
+                                    limit=node.limit)
 
     def validate(self):
         pass
 
     def exec(self) -> Iterator[Batch]:
-        for batch in self.storage.read():
-            yield batch
+        yield from prefetch(self.storage.read())
@@ -0,0 +1,198 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import multiprocessing
+import queue
+import traceback
+from typing import Iterator, List
+
+import pandas as pd
+
+from src.configuration.configuration_manager import ConfigurationManager
+from src.executor.abstract_executor import AbstractExecutor
+from src.executor.executor_utils import DEFAULT_PREFETCH_DEPTH
+from src.models.storage.batch import Batch
+from src.planner.exchange_plan import ExchangePlan
+from src.planner.storage_plan import StoragePlan
+
+# how long (in seconds) the gather waits on the workers before checking
+# whether one of them died
+_POLL_TIMEOUT = 0.1
+
+
+class _ShardEnd(object):
+    """
+    Marks the end of the output of a shard, carrying the traceback of the
+    exception raised by its pipeline if any.
+    """
+
+    def __init__(self, error: str = None):
+        self.error = error
+
+
+class ExchangeExecutor(AbstractExecutor):
+    """
+    Fans the child pipeline (e.g. scan + filter + UDFs) out over worker
+    processes, each one reading a single shard of the table, and gathers
+    the batches they produce.
+
+    The workers are forked, so the plan and the loaded UDFs are inherited
+    instead of being pickled; only the output batches are sent back. The
+    server forks while other threads run queries, hence the process wide
+    state shared with them uses ForkSafeLocks, which the workers get
+    unlocked, and the workers open their own catalog connections. Each
+    worker keeps up to `executor.prefetch_depth` batches ahead of the
+    gather. If an order column is given, the shards are read in storage
+    order and their outputs are merged on that column, otherwise the
+    batches are returned as they arrive.
+
+    Arguments:
+        node (ExchangePlan): plan node with the number of workers
+    """
+
+    def __init__(self, node: ExchangePlan):
+        super().__init__(node)
+
+    def validate(self):
+        pass
+
+    def exec(self) -> Iterator[Batch]:
+        child_executor = self.children[0]
+        workers = self.node.workers
+        if workers <= 1 or \
+                'fork' not in multiprocessing.get_all_start_methods():
+            yield from child_executor.exec()
+            return
+
+        context = multiprocessing.get_context('fork')
+        depth = ConfigurationManager().get_value('executor',
+                                                 'prefetch_depth')
+        if depth is None:
+            depth = DEFAULT_PREFETCH_DEPTH
+        depth = max(depth, 1)
+        if self.node.order_column is None:
+            # all the workers share the queue
+            queues = [context.Queue(maxsize=depth * workers)] * workers
+        else:
+            queues = [context.Queue(maxsize=depth) for _ in range(workers)]
+
+        processes = [
+            context.Process(target=_run_shard,
+                            args=(child_executor, shard, workers,
+                                  queues[shard]),
+                            daemon=True)
+            for shard in range(workers)]
+        for process in processes:
+            process.start()
+        try:
+            if self.node.order_column is None:
+                yield from _receive(queues[0], processes, workers)
+            else:
+                yield from self._merge(
+                    [_receive(queues[shard], [processes[shard]], 1)
+                     for shard in range(workers)])
+        finally:
+            # stops the workers if the consumer went away early
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+            for shard_queue in set(queues):
+                shard_queue.close()
+                shard_queue.cancel_join_thread()
+
+    def _merge(self, streams: List[Iterator[Batch]]) -> Iterator[Batch]:
+        """
+        Merges the outputs of the shards on the order column, assuming each
+        shard produces its rows in that order.
+        """
+        column = self.node.order_column
+        heads = {}
+
+        def advance(shard):
+            for batch in streams[shard]:
+                if not batch.empty():
+                    heads[shard] = batch.frames.sort_values(
+                        column, kind='mergesort')
+                    return
+            heads.pop(shard, None)
+
+        for shard in range(len(streams)):
+            advance(shard)
+        while heads:
+            # rows up to the smallest last value of the current batches can
+            # not be preceded by any row the shards produce later
+            bound = min(frame[column].iloc[-1] for frame in heads.values())
+            parts = []
+            for shard in list(heads):
+                frame = heads[shard]
+                count = frame[column].searchsorted(bound, side='right')
+                parts.append(frame.iloc[:count])
+                if count < len(frame):
+                    heads[shard] = frame.iloc[count:]
+                else:
+                    advance(shard)
+            yield Batch(pd.concat(parts).sort_values(
+                column, kind='mergesort', ignore_index=True))
+
+
+def _storage_plans(executor: AbstractExecutor) -> Iterator[StoragePlan]:
+    if isinstance(executor.node, StoragePlan):
+        yield executor.node
+    for child in executor.children:
+        yield from _storage_plans(child)
+
+
+def _run_shard(executor: AbstractExecutor, shard: int, workers: int,
+               output: multiprocessing.Queue):
+    """
+    Entry point of the worker processes, runs the pipeline on a shard.
+    The plan nodes are copies private to the worker after the fork.
+    """
+    end = _ShardEnd()
+    try:
+        for plan in _storage_plans(executor):
+            plan.total_shards = workers
+            plan.curr_shard = shard
+        for batch in executor.exec():
+            if not batch.empty():
+                output.put(batch)
+    except Exception:
+        end = _ShardEnd(traceback.format_exc())
+    output.put(end)
+
+
+def _receive(output: multiprocessing.Queue,
+             processes: List[multiprocessing.Process],
+             ends: int) -> Iterator[Batch]:
+    """
+    Yields the batches sent by the workers until `ends` of them finished.
+    """
+    while ends > 0:
+        try:
+            item = output.get(timeout=_POLL_TIMEOUT)
+        except queue.Empty:
+            for process in processes:
+                if process.exitcode not in (None, 0):
+                    raise RuntimeError(
+                        'Scan worker exited with code {}'.format(
+                            process.exitcode))
+            continue
+        if isinstance(item, _ShardEnd):
+            if item.error is not None:
+                raise RuntimeError(
+                    'Scan worker failed:\n{}'.format(item.error))
+            ends -= 1
+        else:
+            yield item
@@ -38,10 +38,14 @@ class Context:
 
     def __init__(self):
         self._config_manager = ConfigurationManager()
-        self._gpus = self._populate_gpu_ids()
+        # probing the GPUs initializes CUDA, it is deferred until the GPUs
+        # are asked for
+        self._gpus = None
 
     @property
     def gpus(self):
+        if self._gpus is None:
+            self._gpus = self._populate_gpu_ids()
         return self._gpus
 
     def _possible_addresses(self) -> Set:
@@ -0,0 +1,232 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import threading
+import time
+from typing import Callable, Dict, Iterator, List
+
+from src.executor.abstract_executor import AbstractExecutor
+from src.models.storage.batch import Batch
+
+# operator currently pulling a batch on this thread, the UDF calls made
+# while it runs are attributed to it
+_running = threading.local()
+
+
+class OperatorMetrics(object):
+    """
+    Execution metrics of a single operator of the execution tree.
+
+    The times include the children, as they produce their batches while
+    the parent pulls them; `self_time` is the share spent in the operator
+    itself. The CPU time only covers the thread executing the query, the
+    work done by the prefetching threads shows up as wall time.
+
+    Arguments:
+        name (str): name of the operator
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.output_rows = 0
+        self.batches = 0
+        self.bytes = 0
+        self.udf_calls = {}
+        self.children = []
+
+    @property
+    def input_rows(self) -> int:
+        return sum(child.output_rows for child in self.children)
+
+    @property
+    def self_time(self) -> float:
+        children_time = sum(child.wall_time for child in self.children)
+        return max(self.wall_time - children_time, 0.0)
+
+    def add_batch(self, batch: Batch):
+        self.batches += 1
+        self.output_rows += len(batch)
+        self.bytes += batch.nbytes
+
+    def add_udf_call(self, name: str):
+        self.udf_calls[name] = self.udf_calls.get(name, 0) + 1
+
+    def to_dict(self) -> Dict:
+        return {'operator': self.name,
+                'wall_time': self.wall_time,
+                'cpu_time': self.cpu_time,
+                'self_time': self.self_time,
+                'input_rows': self.input_rows,
+                'output_rows': self.output_rows,
+                'batches': self.batches,
+                'bytes': self.bytes,
+                'udf_calls': dict(self.udf_calls),
+                'children': [child.to_dict() for child in self.children]}
+
+    def summary(self) -> str:
+        """
+        Returns:
+            str: the metrics of the operator on a single line
+        """
+        summary = 'wall={:.3f}s cpu={:.3f}s self={:.3f}s rows={}->{} ' \
+                  'batches={} bytes={}'.format(
+                      self.wall_time, self.cpu_time, self.self_time,
+                      self.input_rows, self.output_rows, self.batches,
+                      self.bytes)
+        if self.udf_calls:
+            summary += ' udf_calls={}'.format(self.udf_calls)
+        return summary
+
+    def to_lines(self, depth: int = 0) -> List[str]:
+        """
+        Returns:
+            List[str]: one indented line per operator of the subtree
+        """
+        lines = ['{}{} ({})'.format('  ' * depth, self.name, self.summary())]
+        for child in self.children:
+            lines += child.to_lines(depth + 1)
+        return lines
+
+    def __str__(self):
+        return '\n'.join(self.to_lines())
+
+
+class ExecutionMetrics(object):
+    """
+    Metrics of a query execution, a tree of OperatorMetrics mirroring the
+    execution tree. Filled by the PlanExecutor while the query runs.
+
+    Operators run by the workers of a parallel scan live in other
+    processes, their metrics are not collected.
+    """
+
+    def __init__(self):
+        self.root = None
+
+    def to_dict(self) -> Dict:
+        """
+        Returns:
+            Dict: the metrics tree, None if nothing got executed
+        """
+        if self.root is None:
+            return None
+        return self.root.to_dict()
+
+    def __str__(self):
+        return str(self.root)
+
+
+class InstrumentedExecutor(AbstractExecutor):
+    """
+    Wraps an executor, measuring the time spent in it and counting the
+    batches it produces. The children are the ones of the wrapped executor.
+
+    Arguments:
+        executor (AbstractExecutor): executor to be measured
+    """
+
+    def __init__(self, executor: AbstractExecutor):
+        super().__init__(executor.node)
+        self._executor = executor
+        self._metrics = OperatorMetrics(executor.node.opr_type.name)
+
+    @property
+    def metrics(self) -> OperatorMetrics:
+        return self._metrics
+
+    @property
+    def executor(self) -> AbstractExecutor:
+        return self._executor
+
+    @property
+    def children(self) -> List[AbstractExecutor]:
+        return self._executor.children
+
+    def append_child(self, child: AbstractExecutor):
+        self._executor.append_child(child)
+        if isinstance(child, InstrumentedExecutor):
+            self._metrics.children.append(child.metrics)
+
+    def validate(self):
+        return self._executor.validate()
+
+    def exec(self):
+        # executors like CREATE do their work right away and return None,
+        # the others return a batch generator
+        output = self._measure(self._executor.exec)
+        if output is None:
+            return None
+        return self._iterate(iter(output))
+
+    def _iterate(self, output: Iterator[Batch]) -> Iterator[Batch]:
+        try:
+            while True:
+                try:
+                    batch = self._measure(next, output)
+                except StopIteration:
+                    return
+                self._metrics.add_batch(batch)
+                yield batch
+        finally:
+            close = getattr(output, 'close', None)
+            if close is not None:
+                self._measure(close)
+
+    def _measure(self, func: Callable, *args):
+        outer = getattr(_running, 'metrics', None)
+        _running.metrics = self._metrics
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            return func(*args)
+        finally:
+            self._metrics.wall_time += time.perf_counter() - wall_start
+            self._metrics.cpu_time += time.thread_time() - cpu_start
+            _running.metrics = outer
+
+
+def instrument(executor: AbstractExecutor) -> InstrumentedExecutor:
+    """
+    Wraps the executors of the tree in InstrumentedExecutors, the subtrees
+    that are instrumented already are kept.
+
+    Arguments:
+        executor (AbstractExecutor): root of the execution tree
+
+    Returns:
+        InstrumentedExecutor: root of the instrumented tree
+    """
+    if isinstance(executor, InstrumentedExecutor):
+        return executor
+    children = list(executor.children)
+    executor.children.clear()
+    wrapper = InstrumentedExecutor(executor)
+    for child in children:
+        wrapper.append_child(instrument(child))
+    return wrapper
+
+
+def record_udf_call(name: str):
+    """
+    Counts a UDF call for the operator running on this thread, if the
+    query is instrumented.
+
+    Arguments:
+        name (str): name of the UDF
+    """
+    metrics = getattr(_running, 'metrics', None)
+    if metrics is not None:
+        metrics.add_udf_call(name)
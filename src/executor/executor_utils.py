@@ -0,0 +1,115 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import queue
+import threading
+from typing import Iterable, Iterator
+
+from src.configuration.configuration_manager import ConfigurationManager
+
+# fallback number of prefetched batches if executor.prefetch_depth is not
+# configured
+DEFAULT_PREFETCH_DEPTH = 2
+
+# how long (in seconds) the producer waits on a full queue before checking
+# whether the consumer went away
+_PUT_TIMEOUT = 0.1
+
+
+class _EndOfStream(object):
+    """
+    Marks the end of the prefetched iterable, carrying the exception
+    raised by it if any.
+    """
+
+    def __init__(self, error: BaseException = None):
+        self.error = error
+
+
+def prefetch(iterable: Iterable, depth: int = None) -> Iterator:
+    """
+    Iterates over the iterable in a background thread, keeping up to
+    `depth` items ready while the consumer processes the current one.
+
+    The producer blocks once the queue is full. When the consumer stops
+    early (e.g. because of a LIMIT) the generator is closed, which stops
+    the producer and closes the underlying iterable. Exceptions raised by
+    the iterable are re-raised in the consumer.
+
+    Arguments:
+        iterable (Iterable): items to be prefetched, e.g. a batch generator
+        depth (int): number of prefetched items, `executor.prefetch_depth`
+            if None. Prefetching is disabled if it is not positive.
+
+    Returns:
+        Iterator: the items of the iterable in order
+    """
+    if depth is None:
+        depth = ConfigurationManager().get_value('executor',
+                                                 'prefetch_depth')
+        if depth is None:
+            depth = DEFAULT_PREFETCH_DEPTH
+    if depth <= 0:
+        yield from iterable
+        return
+
+    items = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=_PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        iterator = None
+        end = _EndOfStream()
+        try:
+            iterator = iter(iterable)
+            for item in iterator:
+                if not put(item):
+                    break
+        except BaseException as e:
+            # e.g. SystemExit or KeyboardInterrupt raised by a UDF, the
+            # consumer would wait for the end of the stream forever
+            end = _EndOfStream(e)
+        finally:
+            try:
+                # generators have to be closed by the thread running them
+                close = getattr(iterator, 'close', None)
+                if close is not None:
+                    close()
+            except BaseException as e:
+                if end.error is None:
+                    end = _EndOfStream(e)
+            finally:
+                put(end)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = items.get()
+            if isinstance(item, _EndOfStream):
+                if item.error is not None:
+                    raise item.error
+                return
+            yield item
+    finally:
+        stopped.set()
+        producer.join()
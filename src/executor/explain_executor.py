@@ -0,0 +1,73 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Iterator, List
+
+import pandas as pd
+
+from src.executor.abstract_executor import AbstractExecutor
+from src.executor.execution_metrics import OperatorMetrics, instrument
+from src.models.storage.batch import Batch
+from src.planner.abstract_plan import AbstractPlan
+from src.planner.explain_plan import ExplainPlan
+
+
+class ExplainExecutor(AbstractExecutor):
+    """
+    Returns the physical plan of the child as a single `plan` column with
+    a row per plan node, indented by its depth in the tree.
+
+    With ANALYZE the child plan is executed first, its output is discarded
+    and every node is annotated with the actual rows, time and memory
+    measured while executing it.
+
+    Arguments:
+        node (ExplainPlan): The Explain Plan
+    """
+
+    def __init__(self, node: ExplainPlan):
+        super().__init__(node)
+
+    def validate(self):
+        pass
+
+    def exec(self) -> Iterator[Batch]:
+        metrics = None
+        if self.node.analyze:
+            child_executor = instrument(self.children[0])
+            self.children[0] = child_executor
+            output = child_executor.exec()
+            if output is not None:
+                try:
+                    for _ in output:
+                        pass
+                finally:
+                    output.close()
+            metrics = child_executor.metrics
+
+        lines = self._explain(self.node.children[0], metrics)
+        yield Batch(pd.DataFrame({'plan': lines}))
+
+    def _explain(self, plan: AbstractPlan, metrics: OperatorMetrics,
+                 depth: int = 0) -> List[str]:
+        line = '  ' * depth + plan.describe()
+        if metrics is not None:
+            line += ' (actual {})'.format(metrics.summary())
+        lines = [line]
+        for index, child in enumerate(plan.children):
+            child_metrics = None
+            if metrics is not None:
+                child_metrics = metrics.children[index]
+            lines += self._explain(child, child_metrics, depth + 1)
+        return lines
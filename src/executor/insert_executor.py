@@ -19,6 +19,7 @@ from src.executor.abstract_executor import AbstractExecutor
 from src.storage.storage_engine import StorageEngine
 from src.models.storage.batch import Batch
 from src.catalog.schema_utils import SchemaUtils
+from src.udfs.udf_result_cache import drop_udf_results
 
 
 class InsertExecutor(AbstractExecutor):
@@ -49,3 +50,5 @@ class InsertExecutor(AbstractExecutor):
         batch.frames = SchemaUtils.petastorm_type_cast(
             metadata.schema.petastorm_schema, batch.frames)
         StorageEngine.write(metadata, batch)
+        # the stored UDF results may belong to older frames with these ids
+        drop_udf_results(metadata.file_url)
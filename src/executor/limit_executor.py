@@ -41,9 +41,13 @@ class LimitExecutor(AbstractExecutor):
     def exec(self) -> Iterator[Batch]:
         child_executor = self.children[0]
         remaining_tuples = self._limit_count
+        batches = child_executor.exec()
         # aggregates the batches into one large batch
-        for batch in child_executor.exec():
+        for batch in batches:
             if len(batch) > remaining_tuples:
+                # stop the child executors (e.g. prefetching scans) right
+                # away instead of waiting for the generator to be collected
+                batches.close()
                 yield batch[:remaining_tuples]
                 return
 
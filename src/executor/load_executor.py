@@ -43,5 +43,4 @@ class LoadDataExecutor(AbstractExecutor):
         StorageEngine.create(self.node.table_metainfo)
 
         video_reader = OpenCVReader(self.node.file_path)
-        for batch in video_reader.read():
-            StorageEngine.write(self.node.table_metainfo, batch)
+        StorageEngine.bulk_write(self.node.table_metainfo, video_reader.read())
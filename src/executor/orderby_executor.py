@@ -12,18 +12,36 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Iterator
+import os
+import pickle
+import tempfile
+from typing import Iterator, List
 
+import numpy as np
+import pandas as pd
+
+from src.configuration.configuration_manager import ConfigurationManager
 from src.models.storage.batch import Batch
 from src.executor.abstract_executor import AbstractExecutor
 from src.parser.types import ParserOrderBySortType
 from src.planner.orderby_plan import OrderByPlan
+from src.utils.logging_manager import LoggingManager, LoggingLevel
+
+# fallback memory budget (in MB) if executor.sort_buffer_size is not
+# configured
+DEFAULT_SORT_BUFFER_SIZE = 1024
 
 
 class OrderByExecutor(AbstractExecutor):
     """
     Sort the frames which satisfy the condition
 
+    The input is sorted in memory as long as it fits into
+    `executor.sort_buffer_size` MB. Larger inputs are sorted as an external
+    merge sort: every time the buffered batches exceed the budget they are
+    sorted and spilled to a temporary file as a run, and the runs are merged
+    back chunk by chunk. Missing values are ordered last in both cases.
+
     Arguments:
         node (AbstractPlan): The OrderBy Plan
 
@@ -35,6 +53,11 @@ class OrderByExecutor(AbstractExecutor):
         self._columns = node.columns
         self._sort_types = node.sort_types
         self.batch_sizes = []
+        buffer_size = ConfigurationManager().get_value('executor',
+                                                       'sort_buffer_size')
+        if buffer_size is None:
+            buffer_size = DEFAULT_SORT_BUFFER_SIZE
+        self._buffer_size = buffer_size * 1024 * 1024
 
     def validate(self):
         pass
@@ -58,12 +81,41 @@ class OrderByExecutor(AbstractExecutor):
     def exec(self) -> Iterator[Batch]:
         child_executor = self.children[0]
         aggregated_batch_list = []
+        buffered_bytes = 0
+        run_files = []
+        self._sorted = True
+        self._identifier_column = None
+
+        try:
+            # aggregates the batches into one large batch, spilling sorted
+            # runs whenever the memory budget is exceeded
+            for batch in child_executor.exec():
+                if self._identifier_column is None:
+                    self._identifier_column = batch.identifier_column
+                self.batch_sizes.append(batch.batch_size)
+                aggregated_batch_list.append(batch)
+                buffered_bytes += self._estimate_size(batch)
+                if buffered_bytes >= self._buffer_size:
+                    run_files.append(self._spill(aggregated_batch_list))
+                    aggregated_batch_list = []
+                    buffered_bytes = 0
 
-        # aggregates the batches into one large batch
-        for batch in child_executor.exec():
-            self.batch_sizes.append(batch.batch_size)
-            aggregated_batch_list.append(batch)
-        aggregated_batch = Batch.concat(aggregated_batch_list, copy=False)
+            if not run_files:
+                yield from self._split(
+                    [self._sort(aggregated_batch_list).frames])
+                return
+
+            if aggregated_batch_list:
+                run_files.append(self._spill(aggregated_batch_list))
+            LoggingManager().log('Merging {} sorted runs spilled to disk'
+                                 .format(len(run_files)), LoggingLevel.INFO)
+            yield from self._split(self._merge(run_files))
+        finally:
+            for run_file in run_files:
+                os.remove(run_file)
+
+    def _sort(self, batch_list: List[Batch]) -> Batch:
+        aggregated_batch = Batch.concat(batch_list, copy=False)
 
         # sorts the batch
         try:
@@ -72,13 +124,123 @@ class OrderByExecutor(AbstractExecutor):
                 sort_type=self.extract_sort_types())
         except KeyError:
             # pass for now
-            pass
-
-        # split the aggregated batch into smaller ones based
-        #  on self.batch_sizes which holds the input batches sizes
-        index = 0
-        for i in self.batch_sizes:
-            batch = aggregated_batch[index: index + i]
-            batch.reset_index()
-            index += i
-            yield batch
+            self._sorted = False
+        return aggregated_batch
+
+    def _spill(self, batch_list: List[Batch]) -> str:
+        """
+        Sorts the batches and writes them out as a run of pickled frames,
+        one chunk per input batch.
+
+        Returns:
+            str: path of the run file
+        """
+        sizes = [batch.batch_size for batch in batch_list]
+        frames = self._sort(batch_list).frames
+        fd, run_file = tempfile.mkstemp(prefix='eva_sort_', suffix='.run')
+        with os.fdopen(fd, 'wb') as f:
+            index = 0
+            for size in sizes:
+                pickle.dump(frames.iloc[index: index + size], f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+                index += size
+        return run_file
+
+    @staticmethod
+    def _read_run(run_file: str) -> Iterator[pd.DataFrame]:
+        with open(run_file, 'rb') as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+
+    def _merge(self, run_files: List[str]) -> Iterator[pd.DataFrame]:
+        """
+        k-way merge of the sorted runs, keeping one chunk per run in memory.
+
+        The remaining rows of the current chunks are sorted together, and
+        every row up to the last row of the run that ends first is emitted:
+        the unread rows of every run do not sort before it. That chunk is
+        then replaced with the next one of its run.
+
+        Returns:
+            Iterator[pd.DataFrame]: sorted frames
+        """
+        if not self._sorted:
+            # the runs could not be sorted, keep the input order
+            for run_file in run_files:
+                yield from self._read_run(run_file)
+            return
+
+        columns = self.extract_column_names()
+        ascending = self.extract_sort_types()
+        runs = [self._read_run(run_file) for run_file in run_files]
+        heads = [pd.DataFrame() for _ in runs]
+        while True:
+            # refill the exhausted chunks, dropping the finished runs
+            for run_id, run in enumerate(runs):
+                while run is not None and not len(heads[run_id]):
+                    heads[run_id] = next(run, None)
+                    if heads[run_id] is None:
+                        runs[run_id] = run = None
+                        heads[run_id] = pd.DataFrame()
+            active = [run_id for run_id, run in enumerate(runs)
+                      if run is not None]
+            if len(active) <= 1:
+                break
+
+            lengths = np.array([len(heads[run_id]) for run_id in active])
+            candidates = pd.concat([heads[run_id] for run_id in active],
+                                   ignore_index=True, copy=False)
+            # stable, so the rows of each run keep their order
+            merged = candidates.sort_values(by=columns, ascending=ascending,
+                                            kind='mergesort')
+            order = merged.index.to_numpy()
+            positions = np.empty_like(order)
+            positions[order] = np.arange(len(order))
+            end = positions[np.cumsum(lengths) - 1].min() + 1
+            yield merged.iloc[:end]
+
+            run_of_row = np.repeat(np.arange(len(active)), lengths)
+            emitted = np.bincount(run_of_row[order[:end]],
+                                  minlength=len(active))
+            for index, run_id in enumerate(active):
+                heads[run_id] = heads[run_id].iloc[emitted[index]:]
+
+        # a single run is left, it is already sorted
+        for run_id in active:
+            yield heads[run_id]
+            yield from runs[run_id]
+
+    def _split(self, frames: Iterator[pd.DataFrame]) -> Iterator[Batch]:
+        """
+        split the sorted frames into batches based on self.batch_sizes
+        which holds the input batches sizes
+        """
+        batch_sizes = iter(self.batch_sizes)
+        pending = []
+        pending_rows = 0
+        size = next(batch_sizes, None)
+        for frame in frames:
+            while size is not None and len(frame):
+                needed = size - pending_rows
+                pending.append(frame.iloc[:needed])
+                pending_rows += len(pending[-1])
+                frame = frame.iloc[needed:]
+                if pending_rows == size:
+                    batch = Batch(pd.concat(pending, ignore_index=True,
+                                            copy=False),
+                                  identifier_column=self._identifier_column)
+                    batch.reset_index()
+                    yield batch
+                    pending, pending_rows = [], 0
+                    size = next(batch_sizes, None)
+
+    @staticmethod
+    def _estimate_size(batch: Batch) -> int:
+        """
+        Memory held by the batch, including the numpy arrays (e.g. decoded
+        frames) stored in object columns.
+        """
+        return batch.nbytes
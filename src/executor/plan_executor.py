@@ -15,6 +15,8 @@
 from typing import Iterator
 
 from src.executor.abstract_executor import AbstractExecutor
+from src.executor.execution_metrics import ExecutionMetrics, \
+    InstrumentedExecutor
 from src.executor.limit_executor import LimitExecutor
 from src.executor.sample_executor import SampleExecutor
 from src.executor.seq_scan_executor import SequentialScanExecutor
@@ -29,6 +31,9 @@ from src.executor.load_executor import LoadDataExecutor
 from src.executor.storage_executor import StorageExecutor
 from src.executor.union_executor import UnionExecutor
 from src.executor.orderby_executor import OrderByExecutor
+from src.executor.topk_executor import TopKExecutor
+from src.executor.exchange_executor import ExchangeExecutor
+from src.executor.explain_executor import ExplainExecutor
 
 
 class PlanExecutor:
@@ -38,11 +43,15 @@ class PlanExecutor:
 
     Arguments:
         plan (AbstractPlan): Physical plan tree which needs to be executed
+        metrics (ExecutionMetrics): Filled with the metrics of every
+            operator while the plan is executed, the executors are not
+            instrumented if None
 
     """
 
-    def __init__(self, plan: AbstractPlan):
+    def __init__(self, plan: AbstractPlan, metrics: ExecutionMetrics = None):
         self._plan = plan
+        self._metrics = metrics
 
     def _build_execution_tree(self, plan: AbstractPlan) -> AbstractExecutor:
         """build the execution tree from plan tree
@@ -82,6 +91,15 @@ class PlanExecutor:
             executor_node = LimitExecutor(node=plan)
         elif plan_opr_type == PlanOprType.SAMPLE:
             executor_node = SampleExecutor(node=plan)
+        elif plan_opr_type == PlanOprType.TOP_K:
+            executor_node = TopKExecutor(node=plan)
+        elif plan_opr_type == PlanOprType.EXCHANGE:
+            executor_node = ExchangeExecutor(node=plan)
+        elif plan_opr_type == PlanOprType.EXPLAIN:
+            executor_node = ExplainExecutor(node=plan)
+
+        if self._metrics is not None:
+            executor_node = InstrumentedExecutor(executor_node)
 
         # Build Executor Tree for children
         for children in plan.children:
@@ -95,14 +113,27 @@ class PlanExecutor:
         Arguments:
             tree_root {AbstractExecutor} -- root of execution tree to delete
         """
-        # ToDo
-        # clear all the nodes from the execution tree
+        for child in tree_root.children:
+            self._clean_execution_tree(child)
+        tree_root.children.clear()
 
     def execute_plan(self) -> Iterator[Batch]:
         """execute the plan tree
+
+        The batch generators of the execution tree are closed as soon as
+        the output is exhausted or the caller closes this generator (e.g.
+        after a LIMIT), which shuts down the readers right away instead of
+        on garbage collection.
         """
         execution_tree = self._build_execution_tree(self._plan)
+        if self._metrics is not None:
+            self._metrics.root = execution_tree.metrics
         output = execution_tree.exec()
-        if output is not None:
-            yield from output
-        self._clean_execution_tree(execution_tree)
+        try:
+            if output is not None:
+                yield from output
+        finally:
+            close = getattr(output, 'close', None)
+            if close is not None:
+                close()
+            self._clean_execution_tree(execution_tree)
@@ -16,7 +16,11 @@ from typing import Iterator
 
 from src.models.storage.batch import Batch
 from src.executor.abstract_executor import AbstractExecutor
+from src.expression.abstract_expression import AbstractExpression
+from src.expression.expression_compiler import compile_predicate
+from src.optimizer.optimizer_utils import reorder_predicate
 from src.planner.seq_scan_plan import SeqScanPlan
+from src.udfs.udf_result_memo import UdfResultMemo
 
 
 class SequentialScanExecutor(AbstractExecutor):
@@ -31,24 +35,45 @@ class SequentialScanExecutor(AbstractExecutor):
         super().__init__(node)
         self.predicate = node.predicate
         self.project_expr = node.columns
+        self.shared_udf_calls = node.shared_udf_calls
+        self.id_column = node.id_column
+        self._predicate_mask = None
 
     def validate(self):
         pass
 
     def exec(self) -> Iterator[Batch]:
+        if isinstance(self.predicate, AbstractExpression):
+            # the UDF runtimes observed since the plan was optimized, e.g.
+            # by earlier executions of a cached plan, may change the order
+            self.predicate = reorder_predicate(self.predicate)
+            self._predicate_mask = compile_predicate(self.predicate)
 
         child_executor = self.children[0]
         for batch in child_executor.exec():
+            # UDF results are shared by the expressions within a batch, they
+            # are kept here and not in the plan, which may be executed by
+            # several queries at once
+            kwargs = {}
+            if self.shared_udf_calls:
+                kwargs['shared_results'] = [
+                    UdfResultMemo(self.id_column)
+                    for _ in range(self.shared_udf_calls)]
+
             # We do the predicate first
             if not batch.empty() and self.predicate is not None:
-                outcomes = self.predicate.evaluate(batch).frames
-                batch = Batch(
-                    batch.frames[(outcomes > 0).to_numpy()].reset_index(
-                        drop=True))
+                batch = batch[self._mask(batch, **kwargs)]
 
             # Then do project
             if not batch.empty() and self.project_expr is not None:
-                batches = [expr.evaluate(batch) for expr in self.project_expr]
+                batches = [expr.evaluate(batch, **kwargs)
+                           for expr in self.project_expr]
                 batch = Batch.merge_column_wise(batches)
 
             yield batch
+
+    def _mask(self, batch: Batch, **kwargs):
+        if self._predicate_mask is not None:
+            return self._predicate_mask(batch, **kwargs)
+        outcomes = self.predicate.evaluate(batch, **kwargs).frames
+        return (outcomes.iloc[:, 0] > 0).to_numpy()
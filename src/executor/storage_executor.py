@@ -15,6 +15,7 @@
 from typing import Iterator
 from src.models.storage.batch import Batch
 from src.executor.abstract_executor import AbstractExecutor
+from src.executor.executor_utils import prefetch
 from src.planner.storage_plan import StoragePlan
 from src.storage.storage_engine import StorageEngine
 
@@ -28,4 +29,11 @@ class StorageExecutor(AbstractExecutor):
         pass
 
     def exec(self) -> Iterator[Batch]:
-        return StorageEngine.read(self.node.video)
+        # decode the next batches while the parent executors process the
+        # current one
+        return prefetch(StorageEngine.read(
+            self.node.video, skip_frames=self.node.skip_frames,
+            limit=self.node.limit, schema_fields=self.node.columns,
+            column_ranges=self.node.column_ranges,
+            total_shards=self.node.total_shards,
+            curr_shard=self.node.curr_shard))
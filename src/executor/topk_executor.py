@@ -0,0 +1,111 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Iterator, List
+
+import numpy as np
+import pandas as pd
+
+from src.models.storage.batch import Batch
+from src.executor.orderby_executor import OrderByExecutor
+from src.planner.topk_plan import TopKPlan
+from src.utils.logging_manager import LoggingManager, LoggingLevel
+
+
+class TopKExecutor(OrderByExecutor):
+    """
+    Returns the first k frames in the sort order, i.e. ORDER BY ... LIMIT k
+
+    Instead of sorting the whole input, every incoming batch is shrunk to
+    the rows that can still be among the first k: rows whose first sort
+    column is behind the k-th smallest value (np.partition) of the
+    candidates are dropped in linear time. The candidates are only sorted
+    and truncated to k rows once they exceed 2k rows, e.g. on many ties,
+    and at the end. Memory is bounded by 2k plus the size of a single
+    batch, the input batches are not modified.
+
+    Arguments:
+        node (AbstractPlan): The TopK Plan
+
+    """
+
+    def __init__(self, node: TopKPlan):
+        super().__init__(node)
+        self._limit_count = node.limit_value
+
+    def exec(self) -> Iterator[Batch]:
+        child_executor = self.children[0]
+        if self._limit_count <= 0:
+            return
+
+        columns = self.extract_column_names()
+        ascending = self.extract_sort_types()
+        top_k = None
+        identifier_column = None
+        for batch in child_executor.exec():
+            if batch.empty():
+                continue
+            if top_k is None:
+                identifier_column = batch.identifier_column
+                self._check_columns(batch, columns)
+                top_k = self._shrink(batch.frames, columns, ascending)
+            else:
+                top_k = self._shrink(
+                    pd.concat([top_k,
+                               self._shrink(batch.frames, columns,
+                                            ascending)],
+                              ignore_index=True, copy=False),
+                    columns, ascending)
+            if len(top_k) > 2 * self._limit_count:
+                top_k = self._sort(top_k, columns, ascending)
+
+        if top_k is not None:
+            yield Batch(self._sort(top_k, columns, ascending),
+                        identifier_column)
+
+    @staticmethod
+    def _check_columns(batch: Batch, columns: List[str]):
+        for column in columns:
+            if column not in batch.columns:
+                message = 'Can not orderby non-projected column: {}'.format(
+                    column)
+                LoggingManager().log(message, LoggingLevel.ERROR)
+                raise KeyError(message)
+
+    def _shrink(self, frames: pd.DataFrame, columns: List[str],
+                ascending: List[bool]) -> pd.DataFrame:
+        """
+        Drops the rows which are behind the first k rows on the first sort
+        column, ties are kept for the other columns to decide.
+        """
+        if len(frames) <= self._limit_count:
+            return frames
+        values = frames[columns[0]].to_numpy()
+        if values.dtype.kind not in 'biuf':
+            # e.g. strings, compared when the candidates are sorted
+            return frames
+        keys = values.astype(np.float64)
+        if not ascending[0]:
+            keys = -keys
+        # like sort_values, missing values go last in both directions
+        keys[np.isnan(keys)] = np.inf
+        bound = np.partition(keys, self._limit_count - 1)[
+            self._limit_count - 1]
+        return frames[keys <= bound]
+
+    def _sort(self, frames: pd.DataFrame, columns: List[str],
+              ascending: List[bool]) -> pd.DataFrame:
+        return frames.sort_values(by=columns, ascending=ascending,
+                                  kind='mergesort',
+                                  ignore_index=True)[:self._limit_count]
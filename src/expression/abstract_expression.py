@@ -54,6 +54,25 @@ class ExpressionType(IntEnum):
     # add other types
 
 
+# infix notation of the binary operators, used to print the expressions
+_OPERATOR_SYMBOLS = {
+    ExpressionType.COMPARE_EQUAL: '=',
+    ExpressionType.COMPARE_GREATER: '>',
+    ExpressionType.COMPARE_LESSER: '<',
+    ExpressionType.COMPARE_GEQ: '>=',
+    ExpressionType.COMPARE_LEQ: '<=',
+    ExpressionType.COMPARE_NEQ: '!=',
+    ExpressionType.COMPARE_CONTAINS: '@>',
+    ExpressionType.COMPARE_IS_CONTAINED: '<@',
+    ExpressionType.LOGICAL_AND: 'AND',
+    ExpressionType.LOGICAL_OR: 'OR',
+    ExpressionType.ARITHMETIC_ADD: '+',
+    ExpressionType.ARITHMETIC_SUBTRACT: '-',
+    ExpressionType.ARITHMETIC_MULTIPLY: '*',
+    ExpressionType.ARITHMETIC_DIVIDE: '/'
+}
+
+
 @unique
 class ExpressionReturnType(IntEnum):
     INVALID = auto()
@@ -129,6 +148,29 @@ class AbstractExpression(ABC):
     def evaluate(self, *args, **kwargs):
         NotImplementedError('Must be implemented in subclasses.')
 
+    def fingerprint(self) -> int:
+        """
+        Structural hash of the expression tree, equal trees have equal
+        fingerprints.
+        """
+        return generic_utils.structural_hash(
+            (type(self).__name__, self.children,
+             {name: value for name, value in vars(self).items()
+              if name != '_children'}))
+
+    def __str__(self) -> str:
+        symbol = _OPERATOR_SYMBOLS.get(self.etype)
+        if symbol is not None and self.get_children_count() == 2:
+            return '({} {} {})'.format(self.children[0], symbol,
+                                       self.children[1])
+        if self.etype == ExpressionType.LOGICAL_NOT:
+            return 'NOT {}'.format(self.children[0])
+        name = self.etype.name
+        if name.startswith('AGGREGATION_'):
+            name = name[len('AGGREGATION_'):]
+        return '{}({})'.format(name, ', '.join(
+            str(child) for child in self.children))
+
     def __eq__(self, other):
         is_subtree_equal = True
         if not isinstance(other, AbstractExpression):
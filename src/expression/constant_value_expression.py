@@ -43,6 +43,11 @@ class ConstantValueExpression(AbstractExpression):
     # ToDo implement other functinalities like maintaining hash
     # comparing two objects of this class(==)
 
+    def __str__(self) -> str:
+        if isinstance(self._value, str):
+            return "'{}'".format(self._value)
+        return str(self._value)
+
     def __eq__(self, other):
         is_subtree_equal = super().__eq__(other)
         if not isinstance(other, ConstantValueExpression):
@@ -0,0 +1,162 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import operator
+from typing import Callable, Tuple
+
+import numpy as np
+
+from src.catalog.column_type import ColumnType
+from src.expression.abstract_expression import AbstractExpression, \
+    ExpressionType
+from src.models.storage.batch import Batch
+
+_COMPARISONS = {
+    ExpressionType.COMPARE_EQUAL: operator.eq,
+    ExpressionType.COMPARE_GREATER: operator.gt,
+    ExpressionType.COMPARE_LESSER: operator.lt,
+    ExpressionType.COMPARE_GEQ: operator.ge,
+    ExpressionType.COMPARE_LEQ: operator.le,
+    ExpressionType.COMPARE_NEQ: operator.ne
+}
+
+_ARITHMETICS = {
+    ExpressionType.ARITHMETIC_ADD: operator.add,
+    ExpressionType.ARITHMETIC_SUBTRACT: operator.sub,
+    ExpressionType.ARITHMETIC_MULTIPLY: operator.mul,
+    ExpressionType.ARITHMETIC_DIVIDE: operator.truediv
+}
+
+# kernel(batch, columns) -> value per row or a scalar for all the rows
+Kernel = Callable[[Batch, '_Columns'], np.ndarray]
+
+
+class _Columns(object):
+    """
+    NumPy arrays of the columns of a batch, extracted on first use, and the
+    keyword arguments of the nodes falling back to `evaluate`
+    """
+
+    def __init__(self, batch: Batch, **kwargs):
+        self._batch = batch
+        self._arrays = {}
+        self.kwargs = kwargs
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name not in self._arrays:
+            self._arrays[name] = self._batch.column_as_numpy_array(name)
+        return self._arrays[name]
+
+
+def compile_predicate(predicate: AbstractExpression) \
+        -> Callable[..., np.ndarray]:
+    """
+    Compiles a bound predicate into a single function over the NumPy arrays
+    of the columns, instead of building a DataFrame and a Batch for every
+    node of the tree on every batch.
+
+    Columns, scalar constants, comparisons, arithmetic and logical
+    operators are fused into NumPy operations. The other nodes (e.g. UDF
+    calls or comparisons of arrays) fall back to their `evaluate`. Like
+    `LogicalExpression`, AND/OR only evaluate such a right side on the rows
+    whose outcome is not decided by the left side yet.
+
+    Arguments:
+        predicate (AbstractExpression): predicate to be compiled
+
+    Returns:
+        Callable[..., np.ndarray]: boolean mask of the rows of a batch
+            satisfying the predicate, the keyword arguments are passed on
+            to `evaluate`
+    """
+    kernel, _ = _compile(predicate)
+
+    def evaluate(batch: Batch, **kwargs) -> np.ndarray:
+        values = kernel(batch, _Columns(batch, **kwargs))
+        return np.broadcast_to(np.asarray(values, dtype=bool), (len(batch),))
+
+    return evaluate
+
+
+def _compile(expr: AbstractExpression) -> Tuple[Kernel, bool]:
+    """
+    Returns:
+        Tuple[Kernel, bool]: kernel of the expression and whether the whole
+            tree got compiled, i.e. it is cheap to evaluate on all the rows
+    """
+    etype = getattr(expr, 'etype', None)
+    if etype == ExpressionType.TUPLE_VALUE:
+        name = expr.col_name
+        return (lambda batch, columns: columns[name]), True
+
+    if etype == ExpressionType.CONSTANT_VALUE and _is_scalar(expr):
+        value = expr.value
+        return (lambda batch, columns: value), True
+
+    if etype in _COMPARISONS or etype in _ARITHMETICS:
+        # comparisons of arrays keep the element wise semantics of evaluate
+        if expr.get_children_count() == 2 and not any(
+                child.etype == ExpressionType.CONSTANT_VALUE and
+                not _is_scalar(child) for child in expr.children):
+            function = _COMPARISONS.get(etype) or _ARITHMETICS[etype]
+            (left, left_compiled), (right, right_compiled) = \
+                [_compile(child) for child in expr.children]
+            return (lambda batch, columns: function(
+                left(batch, columns), right(batch, columns))), \
+                left_compiled and right_compiled
+
+    if etype in (ExpressionType.LOGICAL_AND, ExpressionType.LOGICAL_OR) \
+            and expr.get_children_count() == 2:
+        return _compile_conjunction(expr)
+
+    if etype == ExpressionType.LOGICAL_NOT and \
+            expr.get_children_count() == 1:
+        child, compiled = _compile(expr.get_child(0))
+        return (lambda batch, columns: np.logical_not(
+            child(batch, columns))), compiled
+
+    return (lambda batch, columns: _first_column(
+        expr.evaluate(batch, **columns.kwargs))), False
+
+
+def _compile_conjunction(expr: AbstractExpression) -> Tuple[Kernel, bool]:
+    is_and = expr.etype == ExpressionType.LOGICAL_AND
+    function = np.logical_and if is_and else np.logical_or
+    (left, left_compiled), (right, right_compiled) = \
+        [_compile(child) for child in expr.children]
+    if right_compiled:
+        return (lambda batch, columns: function(
+            left(batch, columns), right(batch, columns))), left_compiled
+
+    def kernel(batch: Batch, columns: _Columns) -> np.ndarray:
+        outcomes = np.array(np.broadcast_to(
+            np.asarray(left(batch, columns), dtype=bool), (len(batch),)))
+        rows = np.flatnonzero(outcomes if is_and else ~outcomes)
+        if len(rows) == len(batch):
+            return function(outcomes, right(batch, columns))
+        if len(rows):
+            remaining = batch[rows]
+            outcomes[rows] = right(remaining,
+                                   _Columns(remaining, **columns.kwargs))
+        return outcomes
+
+    return kernel, False
+
+
+def _is_scalar(expr: AbstractExpression) -> bool:
+    return expr.v_type != ColumnType.NDARRAY and np.isscalar(expr.value)
+
+
+def _first_column(batch: Batch) -> np.ndarray:
+    return batch.frames.iloc[:, 0].to_numpy()
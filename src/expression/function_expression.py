@@ -12,17 +12,23 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import time
+
 import pandas as pd
 from enum import Enum, unique
 from typing import Callable
 
 from src.constants import NO_GPU
 from src.executor.execution_context import Context
+from src.executor.execution_metrics import record_udf_call
 from src.expression.abstract_expression import AbstractExpression, \
     ExpressionType
 from src.models.storage.batch import Batch
 from src.udfs.gpu_compatible import GPUCompatible
+from src.catalog.models.udf import UdfMetadata
 from src.catalog.models.udf_io import UdfIO
+from src.udfs.udf_result_cache import UdfResultCache
+from src.udfs.udf_runtime_statistics import UdfRuntimeStatistics
 
 
 @unique
@@ -53,6 +59,17 @@ class FunctionExpression(AbstractExpression):
         output_obj(UdfIO): The catalog object corresponding to the func_output.
         To be populated by optimizer.
 
+        udf_obj(UdfMetadata): The catalog object of the UDF. To be populated
+        by optimizer.
+
+        result_cache(UdfResultCache): Stored results of the function for the
+        frames of the scanned table, the function is only called for the
+        frames without results. To be populated by optimizer.
+
+        shared_results_key(int): Index of the results shared with the equal
+        calls of the same plan in the `shared_results` passed to evaluate
+        by the scan. To be populated by optimizer.
+
     """
 
     def __init__(self, func: Callable,
@@ -70,6 +87,9 @@ class FunctionExpression(AbstractExpression):
         self._is_temp = is_temp
         self._output = output
         self._output_obj = None
+        self._udf_obj = None
+        self._result_cache = None
+        self._shared_results_key = None
 
     @property
     def name(self):
@@ -87,6 +107,30 @@ class FunctionExpression(AbstractExpression):
     def output_obj(self, val: UdfIO):
         self._output_obj = val
 
+    @property
+    def udf_obj(self):
+        return self._udf_obj
+
+    @udf_obj.setter
+    def udf_obj(self, val: UdfMetadata):
+        self._udf_obj = val
+
+    @property
+    def result_cache(self):
+        return self._result_cache
+
+    @result_cache.setter
+    def result_cache(self, val: UdfResultCache):
+        self._result_cache = val
+
+    @property
+    def shared_results_key(self):
+        return self._shared_results_key
+
+    @shared_results_key.setter
+    def shared_results_key(self, val: int):
+        self._shared_results_key = val
+
     @property
     def function(self):
         return self._function
@@ -102,8 +146,16 @@ class FunctionExpression(AbstractExpression):
         if len(child_batches):
             new_batch = Batch.merge_column_wise(child_batches)
 
-        func = self._gpu_enabled_function()
-        outcomes = func(new_batch.frames)
+        cache = self._result_cache
+        shared_results = kwargs.get('shared_results')
+        if cache is None and shared_results and \
+                self._shared_results_key is not None:
+            cache = shared_results[self._shared_results_key]
+        if cache is not None and cache.id_column in batch.frames:
+            outcomes = cache.evaluate(batch.frames[cache.id_column],
+                                      new_batch.frames, self._call)
+        else:
+            outcomes = self._call(new_batch.frames)
         outcomes = Batch(pd.DataFrame(outcomes))
 
         if self._output:
@@ -111,6 +163,17 @@ class FunctionExpression(AbstractExpression):
         else:
             return outcomes
 
+    def _call(self, frames: pd.DataFrame):
+        func = self._gpu_enabled_function()
+        record_udf_call(self._name or type(self._function).__name__)
+        start = time.perf_counter()
+        outcomes = func(frames)
+        # per row runtimes of the UDFs drive the predicate ordering
+        if self._name is not None:
+            UdfRuntimeStatistics().record(self._name, len(frames),
+                                          time.perf_counter() - start)
+        return outcomes
+
     def _gpu_enabled_function(self):
         if isinstance(self._function, GPUCompatible):
             device = self._context.gpu_device()
@@ -118,6 +181,14 @@ class FunctionExpression(AbstractExpression):
                 return self._function.to_device(device)
         return self._function
 
+    def __str__(self) -> str:
+        name = self._name or type(self._function).__name__
+        out_string = '{}({})'.format(name, ', '.join(
+            str(child) for child in self.children))
+        if self._output:
+            out_string += '.' + self._output
+        return out_string
+
     def __eq__(self, other):
         is_subtree_equal = super().__eq__(other)
         if not isinstance(other, FunctionExpression):
@@ -71,6 +71,9 @@ class TupleValueExpression(AbstractExpression):
             batch = batch[kwargs["mask"]]
         return batch.project([self.col_name])
 
+    def __str__(self) -> str:
+        return str(self._col_name)
+
     def __eq__(self, other):
         is_subtree_equal = super().__eq__(other)
         if not isinstance(other, TupleValueExpression):
@@ -1,8 +1,13 @@
 import json
+import struct
 
 from enum import Enum
 from src.models.storage.batch import Batch
 
+# length of the json header of a binary response (8 bytes), followed by
+# the header and the serialized batch if any
+_HEADER_LENGTH = struct.Struct('!Q')
+
 
 class ResponseStatus(str, Enum):
     FAIL = -1
@@ -44,9 +49,31 @@ class Response:
         obj = json.loads(json_str, object_hook=as_response)
         return cls(**obj)
 
+    def to_bytes(self) -> bytes:
+        header = json.dumps({'status': self.status,
+                             'metrics': self.metrics,
+                             'batch': self.batch is not None}).encode()
+        batch = self.batch.to_bytes() if self.batch is not None else b''
+        return _HEADER_LENGTH.pack(len(header)) + header + batch
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        length, = _HEADER_LENGTH.unpack_from(data)
+        header_end = _HEADER_LENGTH.size + length
+        obj = json.loads(data[_HEADER_LENGTH.size:header_end].decode())
+        batch = None
+        if obj['batch']:
+            batch = Batch.from_bytes(data[header_end:])
+        return cls(status=ResponseStatus(obj['status']), batch=batch,
+                   metrics=obj['metrics'])
+
     def __eq__(self, other: 'Response'):
+        if self.batch is None or other.batch is None:
+            same_batch = self.batch is other.batch
+        else:
+            same_batch = self.batch == other.batch
         return self.status == other.status and \
-            self.batch == other.batch and \
+            same_batch and \
             self.metrics == other.metrics
 
     def __str__(self):
@@ -16,7 +16,7 @@ import json
 import numpy as np
 import pandas as pd
 
-from typing import Iterable
+from typing import Dict, Iterable, List
 
 from pandas import DataFrame
 from src.utils.logging_manager import LoggingManager, LoggingLevel
@@ -36,10 +36,105 @@ def as_batch(d):
         return d
 
 
+# number of rows of an object column whose arrays are measured by nbytes
+_NBYTES_SAMPLES = 32
+
+# metadata keys of the Arrow serialization of a batch
+_IDENTIFIER_KEY = b'eva.identifier_column'
+_COLUMNAR_KEY = b'eva.columnar'
+# shape of the ndarray of every row of a column, if they are the same
+_SHAPE_KEY = b'eva.shape'
+# shapes of the ndarrays of the rows of a column otherwise
+_SHAPES_KEY = b'eva.shapes'
+
+
+def _to_arrow(values: np.ndarray):
+    """
+    Converts the values of a column to an Arrow array. The ndarrays of the
+    rows are stored as their flat values, along with their shapes.
+
+    Returns:
+        Tuple[pa.Array, Dict]: array and field metadata
+    """
+    import pyarrow as pa
+
+    if values.dtype == object and len(values) and \
+            all(isinstance(value, np.ndarray) for value in values):
+        shapes = {value.shape for value in values}
+        if len(shapes) == 1:
+            values = np.stack(values)
+        else:
+            flat = np.concatenate([value.reshape(-1) for value in values])
+            offsets = np.cumsum([0] + [value.size for value in values])
+            array = pa.ListArray.from_arrays(pa.array(offsets, pa.int32()),
+                                             pa.array(flat))
+            return array, {_SHAPES_KEY: json.dumps(
+                [value.shape for value in values])}
+    if values.ndim > 1:
+        row_size = int(np.prod(values.shape[1:]))
+        array = pa.FixedSizeListArray.from_arrays(
+            pa.array(np.ascontiguousarray(values).reshape(-1)), row_size)
+        return array, {_SHAPE_KEY: json.dumps(values.shape[1:])}
+    try:
+        return pa.array(values, from_pandas=True), None
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # e.g. lists of multi-dimensional ndarrays, kept as nested lists
+        return pa.array([_as_lists(value) for value in values],
+                        from_pandas=True), None
+
+
+def _as_lists(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [_as_lists(item) for item in value]
+    return value
+
+
+def _from_arrow(array, metadata: Dict) -> np.ndarray:
+    """
+    Converts an Arrow array written by `_to_arrow` back to the column
+    values, the ndarrays of the rows share the buffer of the array.
+    """
+    if _SHAPE_KEY in metadata:
+        shape = tuple(json.loads(metadata[_SHAPE_KEY]))
+        flat = array.flatten().to_numpy(zero_copy_only=False)
+        return flat.reshape((len(array),) + shape)
+    if _SHAPES_KEY in metadata:
+        flat = array.flatten().to_numpy(zero_copy_only=False)
+        offsets = array.offsets.to_numpy()
+        values = np.empty(len(array), dtype=object)
+        for index, shape in enumerate(json.loads(metadata[_SHAPES_KEY])):
+            values[index] = flat[offsets[index]:offsets[index + 1]].reshape(
+                shape)
+        return values
+    return array.to_pandas().to_numpy()
+
+
+def _as_cells(values: np.ndarray) -> np.ndarray:
+    """
+    The rows of a multi-dimensional array as the cells of an object column
+    """
+    if values.ndim == 1:
+        return values
+    cells = np.empty(len(values), dtype=object)
+    for index, value in enumerate(values):
+        cells[index] = value
+    return cells
+
+
 class Batch:
     """
     Data model used for storing a batch of frames
 
+    A batch either wraps a DataFrame or is columnar, i.e. holds a NumPy
+    array per column, where a column of frames is a single (N, H, W, C)
+    array. Projections, column wise merges, slices and masks of columnar
+    batches only pass the arrays (or views of them) along. The DataFrame is
+    built on first access of `frames`, after which it is the source of
+    truth. Columns are kept in the order they were given in, the sorted
+    order is only used to compare and to serialize batches.
+
     Arguments:
         frames (DataFrame): pandas Dataframe holding frames data
         identifier_column (str): A column used to uniquely a row
@@ -48,21 +143,31 @@ class Batch:
     """
 
     def __init__(self,
-                 frames=pd.DataFrame(),
+                 frames=None,
                  identifier_column='id'):
         super().__init__()
-        # store the batch with columns sorted
+        if frames is None:
+            frames = pd.DataFrame()
         self.frames = frames
         self._identifier_column = identifier_column
 
     @property
     def frames(self):
+        if self._frames is None:
+            self._frames = pd.DataFrame(
+                {name: list(array) if array.ndim > 1 else array
+                 for name, array in self._columns.items()})
+            # the frame arrays stay around to be returned without copying
+            self._columns = {name: array
+                             for name, array in self._columns.items()
+                             if array.ndim > 1}
         return self._frames
 
     @frames.setter
     def frames(self, values):
         if isinstance(values, DataFrame):
-            self._frames = values[sorted(values.columns)]
+            self._frames = values
+            self._columns = {}
         else:
             LoggingManager().log('Batch constructor not properly called!',
                                  LoggingLevel.DEBUG)
@@ -70,6 +175,13 @@ class Batch:
                 Expected pandas.DataFrame')
         self._batch_size = len(values)
 
+    @property
+    def columns(self) -> List[str]:
+        """names of the columns, in the order they were given in"""
+        if self._frames is None:
+            return list(self._columns)
+        return list(self._frames.columns)
+
     @property
     def batch_size(self):
         return self._batch_size
@@ -81,11 +193,90 @@ class Batch:
     def identifier_column(self):
         return self._identifier_column
 
+    @property
+    def nbytes(self) -> int:
+        """
+        estimated memory (in bytes) held by the rows of the batch, including
+        the arrays stored in object columns (e.g. the decoded frames). The
+        arrays of object columns are extrapolated from a sample of rows.
+        """
+        if self._frames is None:
+            return sum(array.nbytes for array in self._columns.values())
+        nbytes = int(self._frames.memory_usage(index=False).sum())
+        for name, column in self._frames.items():
+            if name in self._columns:
+                nbytes += self._columns[name].nbytes
+            elif column.dtype == object and len(column):
+                values = column.to_numpy()
+                sample = values[::max(1, len(values) // _NBYTES_SAMPLES)]
+                sample_nbytes = sum(value.nbytes for value in sample
+                                    if isinstance(value, np.ndarray))
+                nbytes += sample_nbytes * len(values) // len(sample)
+        return nbytes
+
     def column_as_numpy_array(self, column_name='data'):
-        return np.array(self._frames[column_name])
+        """
+        Returns the column as a numpy array. The columns of columnar
+        batches, including the frame arrays wrapped by `from_frame_array`,
+        are returned without copying.
+        """
+        if column_name in self._columns:
+            return self._columns[column_name]
+        return self.frames[column_name].to_numpy()
+
+    @classmethod
+    def from_columns(cls,
+                     columns: Dict[str, np.ndarray],
+                     identifier_column: str = 'id') -> 'Batch':
+        """
+        Wraps the column arrays without copying them.
+
+        Arguments:
+            columns (Dict[str, np.ndarray]): array per column name, the
+                rows are stacked along the first axis of every array
+            identifier_column (str): name of the id column
+
+        Returns:
+            Batch: columnar batch wrapping the arrays
+        """
+        lengths = {len(array) for array in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError('Columns of a batch must have the same length, '
+                             'got {}'.format(lengths))
+        batch = cls(identifier_column=identifier_column)
+        batch._frames = None
+        batch._columns = dict(columns)
+        batch._batch_size = lengths.pop() if lengths else 0
+        return batch
+
+    @classmethod
+    def from_frame_array(cls,
+                         data: np.ndarray,
+                         start_id: int = 0,
+                         column_name: str = 'data',
+                         identifier_column: str = 'id',
+                         id_step: int = 1) -> 'Batch':
+        """
+        Wraps a contiguous (N, H, W, C) array of frames without copying it.
+        Row i holds a view of data[i] and the id start_id + i * id_step.
+
+        Arguments:
+            data (np.ndarray): frames stacked along the first axis
+            start_id (int): id of the first frame
+            column_name (str): name of the frame column
+            identifier_column (str): name of the id column
+            id_step (int): difference between the ids of consecutive frames,
+                e.g. when only every id_step-th frame got decoded
+
+        Returns:
+            Batch: batch wrapping the array
+        """
+        ids = np.arange(start_id, start_id + len(data) * id_step, id_step)
+        return cls.from_columns({identifier_column: ids, column_name: data},
+                                identifier_column)
 
     def to_json(self):
-        obj = {'frames': self.frames,
+        obj = {'frames': self._sorted_frames(),
                'batch_size': self.batch_size,
                'identifier_column': self.identifier_column}
         return json.dumps(obj, cls=BatchEncoder)
@@ -96,6 +287,59 @@ class Batch:
         return cls(frames=obj['frames'],
                    identifier_column=obj['identifier_column'])
 
+    def to_bytes(self) -> bytes:
+        """
+        Binary serialization of the batch as an Arrow IPC stream. Unlike
+        `to_json`, ndarray frames are stored as raw buffers, the frame array
+        of a columnar batch as a single one. Unlike pickle, reading it does
+        not run any code, so batches can be read from untrusted peers.
+        """
+        # deferred, the client only needs it once a query returns rows
+        import pyarrow as pa
+
+        if self._frames is None:
+            columns = {name: self._columns[name]
+                       for name in sorted(self._columns)}
+        else:
+            frames = self._sorted_frames()
+            columns = {name: frames[name].to_numpy()
+                       for name in frames.columns}
+        arrays = []
+        fields = []
+        for name, values in columns.items():
+            array, metadata = _to_arrow(values)
+            arrays.append(array)
+            fields.append(pa.field(str(name), array.type, metadata=metadata))
+        schema = pa.schema(fields, metadata={
+            _IDENTIFIER_KEY: json.dumps(self.identifier_column),
+            _COLUMNAR_KEY: json.dumps(self._frames is None)})
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, schema) as writer:
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+        return sink.getvalue().to_pybytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        """
+        Reads a batch written by `to_bytes`. The frame arrays are read-only
+        views of `data`.
+        """
+        import pyarrow as pa
+
+        table = pa.ipc.open_stream(data).read_all()
+        metadata = table.schema.metadata
+        identifier_column = json.loads(metadata[_IDENTIFIER_KEY])
+        columnar = json.loads(metadata[_COLUMNAR_KEY])
+        columns = {field.name: _from_arrow(column.combine_chunks(),
+                                           field.metadata or {})
+                   for field, column in zip(table.schema, table.columns)}
+        if columnar:
+            return cls.from_columns(columns, identifier_column)
+        frames = pd.DataFrame({name: _as_cells(values)
+                               for name, values in columns.items()},
+                              columns=list(columns))
+        return cls(frames=frames, identifier_column=identifier_column)
+
     def __str__(self):
         """
         For debug propose
@@ -104,43 +348,72 @@ class Batch:
                '@dataframe: %s\n' \
                '@batch_size: %d\n' \
                '@identifier_column: %s' \
-               % (self._frames, self._batch_size, self.identifier_column)
+               % (self.frames, self._batch_size, self.identifier_column)
 
     def __eq__(self, other: 'Batch'):
-        return self.frames.equals(other.frames)
+        return self._sorted_frames().equals(other._sorted_frames())
+
+    def _sorted_frames(self) -> DataFrame:
+        """frames with the columns in sorted order"""
+        frames = self.frames
+        columns = sorted(frames.columns)
+        if list(frames.columns) == columns:
+            return frames
+        return frames[columns]
 
     def __getitem__(self, indices) -> 'Batch':
         """
         Returns a batch with the desired frames
 
         Arguments:
-            indices (list, slice or mask): list must be
-            a list of indices; mask is boolean array-like
-            (i.e. list, NumPy array, DataFrame, etc.)
-            of appropriate size with True for desired frames.
+            indices (list, slice or np.ndarray): list must be
+            a list of indices; an array is either a boolean mask
+            of appropriate size with True for desired frames or
+            an array of positions. The rows selected by an array
+            get a new index.
         """
         if isinstance(indices, list):
             return self._get_frames_from_indices(indices)
         elif isinstance(indices, slice):
             start = indices.start if indices.start else 0
-            end = indices.stop if indices.stop else len(self.frames)
+            end = indices.stop if indices.stop else len(self)
             if end < 0:
-                end = len(self.frames) + end
+                end = len(self) + end
             step = indices.step if indices.step else 1
+            if self._frames is None:
+                # slices of the arrays are views
+                return self._take(slice(start, end, step))
             return self._get_frames_from_indices(range(start, end, step))
+        elif isinstance(indices, (np.ndarray, pd.Series)):
+            indices = np.asarray(indices)
+            if self._frames is None:
+                return self._take(indices)
+            if indices.dtype == bool:
+                frames = self._frames[indices]
+            else:
+                frames = self._frames.iloc[indices]
+            return Batch(frames.reset_index(drop=True),
+                         self._identifier_column)
 
     def _get_frames_from_indices(self, required_frame_ids):
+        if self._frames is None:
+            return self._take(list(required_frame_ids))
         new_frames = self.frames.iloc[required_frame_ids, :]
-        new_batch = Batch(new_frames)
+        new_batch = Batch(new_frames, self._identifier_column)
         return new_batch
 
+    def _take(self, indices) -> 'Batch':
+        return Batch.from_columns(
+            {name: array[indices] for name, array in self._columns.items()},
+            self._identifier_column)
+
     def sort(self, by=None):
         """
         in_place sort
         """
-        if by is None and self.identifier_column in self._frames:
+        if by is None and self.identifier_column in self.columns:
             by = [self.identifier_column]
-        self._frames.sort_values(by=by, ignore_index=True, inplace=True)
+        self.frames = self.frames.sort_values(by=by, ignore_index=True)
 
     def sort_orderby(self, by, sort_type):
         """
@@ -159,7 +432,7 @@ class Batch:
 
         if by is not None:
             for column in by:
-                if column not in self._frames.columns:
+                if column not in self.columns:
                     LoggingManager().log(
                         'Can not orderby non-projected column: {}'.format(
                             column),
@@ -168,8 +441,8 @@ class Batch:
                         'Can not orderby non-projected column: {}'.format(
                             column))
 
-            self._frames.sort_values(
-                by, ascending=sort_type, ignore_index=True, inplace=True)
+            self.frames = self.frames.sort_values(
+                by, ascending=sort_type, ignore_index=True)
         else:
             LoggingManager().log(
                 'Columns and Sort Type are required for orderby',
@@ -178,15 +451,25 @@ class Batch:
     def project(self, cols: []) -> 'Batch':
         """
         Takes as input the column list, returns the projection.
-        We do a copy for now.
+        Columnar batches share the arrays with the projection, the
+        frames of the others are copied.
         """
-        verfied_cols = [c for c in cols if c in self._frames]
+        columns = self.columns
+        verfied_cols = [c for c in cols if c in columns]
         unknown_cols = list(set(cols) - set(verfied_cols))
         if len(unknown_cols):
             LoggingManager().log("Unexpected columns %s\n\
-                                 Frames: %s" % (unknown_cols, self._frames),
+                                 Frames: %s" % (unknown_cols, self.frames),
                                  LoggingLevel.WARNING)
-        return Batch(self._frames[verfied_cols], self._identifier_column)
+        if self._frames is None:
+            return Batch.from_columns(
+                {col: self._columns[col] for col in verfied_cols},
+                self._identifier_column)
+        batch = Batch(self._frames[verfied_cols], self._identifier_column)
+        batch._columns = {col: array for col, array
+                          in self._columns.items()
+                          if col in verfied_cols}
+        return batch
 
     @classmethod
     def merge_column_wise(cls,
@@ -204,13 +487,22 @@ class Batch:
 
         if not len(batches):
             return Batch()
+        identifier_column = batches[0].identifier_column
+        columns = [col for batch in batches for col in batch.columns]
+        if all(batch._frames is None for batch in batches) \
+                and len(set(columns)) == len(columns) \
+                and len({len(batch) for batch in batches}) == 1:
+            return Batch.from_columns(
+                {col: array for batch in batches
+                 for col, array in batch._columns.items()},
+                identifier_column)
         frames = [batch.frames for batch in batches]
         new_frames = pd.concat(frames, axis=1, copy=False)
         if new_frames.columns.duplicated().any():
             LoggingManager().log(
                 'Duplicated column name detected {}'.format(new_frames),
                 LoggingLevel.WARNING)
-        return Batch(new_frames)
+        return Batch(new_frames, identifier_column)
 
     def __add__(self, other: 'Batch'):
         """
@@ -243,12 +535,22 @@ class Batch:
 
         # pd.concat will convert generator into list, so it does not hurt
         # if we convert ourselves.
-        frame_list = list([batch.frames for batch in batch_list])
-        if len(frame_list) == 0:
+        batch_list = list(batch_list)
+        if len(batch_list) == 0:
             return Batch()
+        identifier_column = batch_list[0].identifier_column
+        columns = batch_list[0].columns
+        if columns and all(batch._frames is None and batch.columns == columns
+                           for batch in batch_list):
+            return Batch.from_columns(
+                {col: np.concatenate([batch._columns[col]
+                                      for batch in batch_list])
+                 for col in columns},
+                identifier_column)
+        frame_list = [batch.frames for batch in batch_list]
         frame = pd.concat(frame_list, ignore_index=True, copy=copy)
 
-        return Batch(frame)
+        return Batch(frame, identifier_column)
 
     def empty(self):
         """Checks if the batch is empty
@@ -259,9 +561,13 @@ class Batch:
 
     def reverse(self):
         """ Reverses dataframe """
-        self._frames = self._frames[::-1]
-        self._frames.reset_index(drop=True, inplace=True)
+        if self._frames is None:
+            self._columns = {name: array[::-1]
+                             for name, array in self._columns.items()}
+            return
+        self.frames = self._frames[::-1].reset_index(drop=True)
 
     def reset_index(self):
         """ Resets the index of the data frame in the batch"""
-        self._frames.reset_index(drop=True, inplace=True)
+        if self._frames is not None:
+            self._frames = self._frames.reset_index(drop=True)
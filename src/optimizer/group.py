@@ -95,6 +95,14 @@ class Group:
         if not existing_winner or existing_winner.cost > cost:
             self._winner_exprs[property] = Winner(expr, cost)
 
+    def remove_expr(self, expr: GroupExpression):
+        exprs = self._logical_exprs if expr.opr.is_logical() \
+            else self._physical_exprs
+        for index, group_expr in enumerate(exprs):
+            if group_expr is expr:
+                del exprs[index]
+                return
+
     def clear_grp_exprs(self):
         self._logical_exprs.clear()
         self._physical_exprs.clear()
@@ -28,6 +28,7 @@ class GroupExpression:
         self._group_id = group_id
         self._children = children
         self._rules_explored = RuleType.INVALID_RULE
+        self._fingerprint = None
 
     @property
     def opr(self):
@@ -48,9 +49,11 @@ class GroupExpression:
     @children.setter
     def children(self, new_children):
         self._children = new_children
+        self._fingerprint = None
 
     def append_child(self, child_id: int):
         self._children.append(child_id)
+        self._fingerprint = None
 
     @property
     def rules_explored(self):
@@ -73,10 +76,11 @@ class GroupExpression:
         )
 
     def __hash__(self):
-        # correct this hash function.
-        # we are taking hash of just the opr type
-
-        curr_hash = id(self.opr)
-        for child_id in self.children:
-            curr_hash ^= hash(child_id)
-        return curr_hash
+        # computed once, so that rules mutating the operator in place do not
+        # move the expression within the memo
+        if self._fingerprint is None:
+            opr = self.opr
+            opr_hash = opr.fingerprint() if isinstance(opr, Operator) \
+                else hash(opr)
+            self._fingerprint = hash((opr_hash, tuple(self.children)))
+        return self._fingerprint
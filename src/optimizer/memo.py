@@ -19,7 +19,13 @@ from src.optimizer.group import Group, INVALID_GROUP_ID
 
 class Memo:
     """
-    For now, we assume every group has only one logic expression.
+    Groups of equivalent expressions explored by the optimizer.
+
+    Expressions are keyed by their structural fingerprint, so that adding an
+    expression equal to one of the memo returns the existing one in O(1)
+    instead of opening a new group. A group holds its logical expression
+    and all the physical alternatives implementing it, which are costed by
+    OptimizeInputs.
     """
 
     def __init__(self):
@@ -38,8 +44,9 @@ class Memo:
         """
         Find whether expr is in any exising group.
         """
-        if expr in self.group_exprs:
-            return self.group_exprs[expr]
+        existing = self._group_exprs.get(expr)
+        if existing is not None:
+            return existing.group_id
         else:
             return INVALID_GROUP_ID
 
@@ -55,7 +62,7 @@ class Memo:
         expr.group_id = len(self._groups)
         self._groups.append(Group(expr.group_id))
         self.groups[expr.group_id].add_expr(expr)
-        self._group_exprs[expr] = expr.group_id
+        self._group_exprs.setdefault(expr, expr)
 
     def _insert_expr(self, expr: GroupExpression, group_id: int):
         """
@@ -66,29 +73,23 @@ class Memo:
             'Expression: %s is already in the memo' % expr
         assert group_id < len(self.groups), 'Group Id out of the bound'
 
-        group = self.groups[group_id]
-        assert len(group.logical_exprs) == 0, \
-            'Expression exists in the targeted inserted group. Details: %s' \
-            % group.logical_exprs
-
-        self.groups[group_id].add_expr(expr)
-        self._group_exprs[expr] = group_id
         expr.group_id = group_id
+        self.groups[group_id].add_expr(expr)
+        # an equal expression of another group stays the one found by
+        # get_group_id
+        self._group_exprs.setdefault(expr, expr)
 
     def _remove_expr(self, expr: GroupExpression):
         """
         Remove the expr from the memo, and update the group_id of expr
         to be INVALID_GROUP_ID.
         """
-        group_id = self.get_group_id(expr)
-        assert group_id == expr.group_id, \
-            'Inconsistent memo found when removing expression: %s' % expr
-
-        if group_id == INVALID_GROUP_ID:
+        if expr.group_id == INVALID_GROUP_ID:
             return
 
-        del self._group_exprs[expr]
-        self.groups[group_id].clear_grp_exprs()
+        if self._group_exprs.get(expr) is expr:
+            del self._group_exprs[expr]
+        self.groups[expr.group_id].remove_expr(expr)
         expr.group_id = INVALID_GROUP_ID
 
     def add_group_expr(self, expr: GroupExpression) -> GroupExpression:
@@ -96,15 +97,16 @@ class Memo:
         Add an expression into the memo.
         If expr.group_id is not set, we will try reuse the exsiting one
         (i.e., for rule_explored).
-        Otherwise, the expr will be considered as a new expression and
-        inserted into targeted group.
+        Otherwise, the expr will be inserted into the targeted group: a
+        logical expr is the rewrite of the group and replaces its
+        expressions, a physical expr is added as an alternative.
         """
         # If not forcing a group id
         if expr.group_id == INVALID_GROUP_ID:
-            group_id = self.get_group_id(expr)
-            if group_id != INVALID_GROUP_ID:
+            existing = self._group_exprs.get(expr)
+            if existing is not None:
                 # we found exsiting one
-                return self.groups[group_id].logical_exprs[0]
+                return existing
             else:
                 # we append the expr as new one
                 self._append_expr(expr)
@@ -113,12 +115,13 @@ class Memo:
         else:
             group_id = expr.group_id
             assert group_id < len(self.groups), 'Group Id out of the bound'
-            assert len(self.groups[group_id].logical_exprs) < 2, \
-                'Unexpected number of expressions: %s' \
-                % self.groups[group_id].logical_exprs
-            if len(self.groups[group_id].logical_exprs) == 1:
-                old_expr = self.groups[group_id].logical_exprs[0]
-                self._remove_expr(old_expr)
+            group = self.groups[group_id]
+            existing = self._group_exprs.get(expr)
+            if existing is not None and existing.group_id == group_id:
+                return existing
+            if expr.opr.is_logical():
+                for old_expr in group.logical_exprs + group.physical_exprs:
+                    self._remove_expr(old_expr)
 
             expr.group_id = INVALID_GROUP_ID
             self._insert_expr(expr, group_id)
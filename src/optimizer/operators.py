@@ -21,6 +21,7 @@ from src.parser.table_ref import TableRef
 from src.expression.abstract_expression import AbstractExpression
 from src.catalog.models.df_column import DataFrameColumn
 from src.catalog.models.udf_io import UdfIO
+from src.utils.generic_utils import structural_hash
 from pathlib import Path
 
 
@@ -41,6 +42,7 @@ class OperatorType(IntEnum):
     LOGICALORDERBY = auto()
     LOGICALLIMIT = auto()
     LOGICALSAMPLE = auto()
+    LOGICALEXPLAIN = auto()
     LOGICALDELIMITER = auto()
 
 
@@ -78,6 +80,16 @@ class Operator:
             ', '.join('%s=%s' % item for item in vars(self).items())
         )
 
+    def fingerprint(self) -> int:
+        """
+        Structural hash of the operator tree, including the expressions of
+        the operators. Equal trees have equal fingerprints.
+        """
+        return structural_hash(
+            (type(self).__name__, self.children,
+             {name: value for name, value in vars(self).items()
+              if name != '_children'}))
+
     def __eq__(self, other):
         is_subtree_equal = True
         if not isinstance(other, Operator):
@@ -105,6 +117,8 @@ class LogicalGet(Operator):
         self._dataset_metadata = dataset_metadata
         self._predicate = None
         self._target_list = None
+        self._sample_freq = None
+        self._limit_count = None
 
     @property
     def video(self):
@@ -130,6 +144,22 @@ class LogicalGet(Operator):
     def target_list(self, target_list):
         self._target_list = target_list
 
+    @property
+    def sample_freq(self):
+        return self._sample_freq
+
+    @sample_freq.setter
+    def sample_freq(self, sample_freq):
+        self._sample_freq = sample_freq
+
+    @property
+    def limit_count(self):
+        return self._limit_count
+
+    @limit_count.setter
+    def limit_count(self, limit_count):
+        self._limit_count = limit_count
+
     def __eq__(self, other):
         is_subtree_equal = super().__eq__(other)
         if not isinstance(other, LogicalGet):
@@ -138,7 +168,9 @@ class LogicalGet(Operator):
                 and self.video == other.video
                 and self.dataset_metadata == other.dataset_metadata
                 and self.predicate == other.predicate
-                and self.target_list == other.target_list)
+                and self.target_list == other.target_list
+                and self.sample_freq == other.sample_freq
+                and self.limit_count == other.limit_count)
 
 
 class LogicalQueryDerivedGet(Operator):
@@ -216,17 +248,27 @@ class LogicalOrderBy(Operator):
                  children: List = None):
         super().__init__(OperatorType.LOGICALORDERBY, children)
         self._orderby_list = orderby_list
+        self._limit_count = None
 
     @property
     def orderby_list(self):
         return self._orderby_list
 
+    @property
+    def limit_count(self):
+        return self._limit_count
+
+    @limit_count.setter
+    def limit_count(self, limit_count):
+        self._limit_count = limit_count
+
     def __eq__(self, other):
         is_subtree_equal = super().__eq__(other)
         if not isinstance(other, LogicalOrderBy):
             return False
         return (is_subtree_equal
-                and self.orderby_list == other.orderby_list)
+                and self.orderby_list == other.orderby_list
+                and self.limit_count == other.limit_count)
 
 
 class LogicalLimit(Operator):
@@ -265,6 +307,23 @@ class LogicalSample(Operator):
                 and self.sample_freq == other.sample_freq)
 
 
+class LogicalExplain(Operator):
+    def __init__(self, analyze: bool = False, children: List = None):
+        super().__init__(OperatorType.LOGICALEXPLAIN, children)
+        self._analyze = analyze
+
+    @property
+    def analyze(self):
+        return self._analyze
+
+    def __eq__(self, other):
+        is_subtree_equal = super().__eq__(other)
+        if not isinstance(other, LogicalExplain):
+            return False
+        return (is_subtree_equal
+                and self.analyze == other.analyze)
+
+
 class LogicalUnion(Operator):
     def __init__(self, all: bool, children: List = None):
         super().__init__(OperatorType.LOGICALUNION, children)
@@ -19,6 +19,7 @@ from src.optimizer.group_expression import GroupExpression
 from src.optimizer.binder import Binder
 from src.optimizer.property import PropertyType
 from src.utils.logging_manager import LoggingManager, LoggingLevel
+from src.constants import INVALID_GROUP_ID
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -90,6 +91,9 @@ class TopDownRewrite(OptimizerTask):
         when we have more rules it might be a better idea to
         push optimization task to a queue.
         """
+        # the expression got rewritten through another parent of its group
+        if self.root_expr.group_id == INVALID_GROUP_ID:
+            return
         rewrite_rules = RulesManager().rewrite_rules
         valid_rules = []
         for rule in rewrite_rules:
@@ -149,6 +153,8 @@ class BottomUpRewrite(OptimizerTask):
         self._root_expr = expr
 
     def execute(self):
+        if self.root_expr.group_id == INVALID_GROUP_ID:
+            return
         if not self._children_explored:
             self.optimizer_context.task_stack.push(BottomUpRewrite(
                 self.root_expr, self.optimizer_context, True))
@@ -206,7 +212,8 @@ class OptimizeExpression(OptimizerTask):
         implementation_rules = RulesManager().implementation_rules
         valid_rules = []
         for rule in implementation_rules:
-            if rule.top_match(self.root_expr.opr):
+            if not self.root_expr.is_rule_explored(rule.rule_type) and \
+                    rule.top_match(self.root_expr.opr):
                 valid_rules.append(rule)
 
         sorted(valid_rules, key=lambda x: x.promise(), reverse=True)
@@ -216,6 +223,8 @@ class OptimizeExpression(OptimizerTask):
             for match in iter(binder):
                 if not rule.check(match, self.optimizer_context):
                     continue
+                # every alternative is only implemented once per expression
+                self.root_expr.mark_rule_explored(rule.rule_type)
                 LoggingManager().log('In Optimize physical expression,'
                                      'Rule {} matched for {}'
                                      .format(rule, self.root_expr),
@@ -245,6 +254,9 @@ class OptimizeGroup(OptimizerTask):
 
     def execute(self):
         grp = self.optimizer_context.memo.groups[self.root_id]
+        # the group is shared by several parents and already optimized
+        if grp.get_best_expr(PropertyType.DEFAULT) is not None:
+            return
         for expr in grp.logical_exprs:
             self.optimizer_context.task_stack.push(
                 OptimizeExpression(expr, self.optimizer_context)
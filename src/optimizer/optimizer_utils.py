@@ -12,7 +12,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import List
+from typing import Dict, List, Tuple
 
 from src.catalog.models.df_metadata import DataFrameMetadata
 from src.expression.function_expression import FunctionExpression
@@ -21,16 +21,29 @@ from src.catalog.catalog_manager import CatalogManager
 from src.catalog.column_type import ColumnType, NdArrayType
 
 from src.expression.abstract_expression import AbstractExpression
+from src.expression.logical_expression import LogicalExpression
 from src.expression.tuple_value_expression import ExpressionType, \
     TupleValueExpression
 
 from src.parser.create_statement import ColumnDefinition, \
     ColConstraintInfo
-from src.utils.generic_utils import path_to_class, generate_file_path
+from src.configuration.configuration_manager import ConfigurationManager
+from src.utils.generic_utils import generate_file_path
+from src.udfs.udf_registry import UdfRegistry
+from src.udfs.udf_result_cache import UdfResultCache
+from src.udfs.udf_runtime_statistics import UdfRuntimeStatistics
 
 from src.utils.logging_manager import LoggingLevel
 from src.utils.logging_manager import LoggingManager
 
+# fallback if executor.udf_result_cache is not configured
+DEFAULT_UDF_RESULT_CACHE = False
+
+# estimated seconds per row of a UDF that has not been called yet and of
+# any other operator
+DEFAULT_UDF_COST = 1e-2
+OPERATOR_COST = 1e-7
+
 
 def bind_dataset(video_info: TableInfo) -> DataFrameMetadata:
     """
@@ -102,7 +115,8 @@ def _old_bind_tuple_value_expr(expr):
         LoggingManager().log(
             "Optimizer Utils:: bind_tuple_expr: \
             Cannot bind column name provided", LoggingLevel.ERROR)
-    expr.col_metadata_id = column_ids.pop()
+    # the column ids are shared with the catalog cache
+    expr.col_metadata_id = column_ids[-1]
 
 
 def bind_predicate_expr(predicate: AbstractExpression, column_mapping):
@@ -131,7 +145,294 @@ def bind_function_expr(expr: FunctionExpression, column_mapping):
                 LoggingManager().log(
                     'Invalid output {} selected for UDF {}'.format(
                         expr.output, expr.name), LoggingLevel().ERROR)
-        expr.function = path_to_class(udf_obj.impl_file_path, udf_obj.name)()
+        expr.udf_obj = udf_obj
+        expr.function = UdfRegistry().get(udf_obj.name,
+                                          udf_obj.impl_file_path)
+
+
+def bind_udf_result_cache(exprs: List[AbstractExpression],
+                          table: DataFrameMetadata) -> bool:
+    """
+    Attaches the stored results of the UDF calls on the columns of the
+    table, unless `executor.udf_result_cache` is disabled. Only calls whose
+    arguments are all columns can be cached.
+
+    Arguments:
+        exprs (List[AbstractExpression]): expression trees evaluated on the
+            rows of the table, None entries are ignored
+        table (DataFrameMetadata): the scanned table
+
+    Returns:
+        bool: True if any of the calls uses stored results
+    """
+    enabled = ConfigurationManager().get_value('executor',
+                                               'udf_result_cache')
+    if enabled is None:
+        enabled = DEFAULT_UDF_RESULT_CACHE
+    if not enabled:
+        return False
+
+    bound = False
+    pending = [expr for expr in exprs if expr is not None]
+    while pending:
+        expr = pending.pop()
+        pending.extend(expr.children)
+        if expr.etype != ExpressionType.FUNCTION_EXPRESSION or \
+                expr.udf_obj is None or expr.get_children_count() == 0 or \
+                any(child.etype != ExpressionType.TUPLE_VALUE
+                    for child in expr.children):
+            continue
+        try:
+            expr.result_cache = UdfResultCache(
+                table.file_url, table.identifier_column, expr.udf_obj.name,
+                expr.udf_obj.impl_file_path,
+                [child.col_name for child in expr.children])
+        except OSError as e:
+            LoggingManager().log(
+                'Can not cache the results of UDF {}: {}'.format(
+                    expr.name, e), LoggingLevel.WARNING)
+            continue
+        bound = True
+    return bound
+
+
+def bind_shared_udf_results(exprs: List[AbstractExpression]) -> int:
+    """
+    Lets the equal UDF calls of the expression trees evaluated on the rows
+    of a scan share their results, so that e.g. a detector used by both the
+    predicate and the projection runs once per frame. Calls are equal if
+    they apply the same function to equal arguments, the selected outputs
+    may differ. Calls with stored results already share them.
+
+    Only the groups of equal calls are recorded in the expressions, the
+    results themselves are kept by the scan executor for the batch being
+    processed.
+
+    Arguments:
+        exprs (List[AbstractExpression]): expression trees evaluated on the
+            rows of the scan, None entries are ignored
+
+    Returns:
+        int: number of groups of equal calls
+    """
+    calls = []
+    pending = [expr for expr in exprs if expr is not None]
+    while pending:
+        expr = pending.pop()
+        pending.extend(expr.children)
+        if expr.etype == ExpressionType.FUNCTION_EXPRESSION and \
+                expr.result_cache is None:
+            calls.append(expr)
+
+    groups = 0
+    while calls:
+        call = calls.pop(0)
+        equal = [other for other in calls if other.name == call.name and
+                 other.function == call.function and
+                 other.children == call.children]
+        if not equal:
+            continue
+        for expr in [call] + equal:
+            expr.shared_results_key = groups
+        calls = [other for other in calls
+                 if not any(other is expr for expr in equal)]
+        groups += 1
+    return groups
+
+
+def extract_referenced_columns(exprs: List[AbstractExpression]) -> List[str]:
+    """
+    Collects the names of the columns read by the expressions.
+
+    Arguments:
+        exprs (List[AbstractExpression]): expression trees to be inspected,
+            None entries are ignored
+
+    Returns:
+        List[str]: column names in the order of their first reference, or
+            None if an expression needs all the columns of the row
+    """
+    columns = []
+    pending = [expr for expr in reversed(exprs) if expr is not None]
+    while pending:
+        expr = pending.pop()
+        if expr.etype == ExpressionType.TUPLE_VALUE:
+            if expr.col_name not in columns:
+                columns.append(expr.col_name)
+        elif expr.etype == ExpressionType.FUNCTION_EXPRESSION and \
+                expr.get_children_count() == 0:
+            # a function without arguments is called with the whole row
+            return None
+        pending.extend(reversed(expr.children))
+    return columns
+
+
+# comparisons bounding the column on their left side from below/above
+_LOWER_BOUNDS = {ExpressionType.COMPARE_GREATER, ExpressionType.COMPARE_GEQ}
+_UPPER_BOUNDS = {ExpressionType.COMPARE_LESSER, ExpressionType.COMPARE_LEQ}
+# comparison operators with their operands swapped
+_MIRRORED = {ExpressionType.COMPARE_GREATER: ExpressionType.COMPARE_LESSER,
+             ExpressionType.COMPARE_GEQ: ExpressionType.COMPARE_LEQ,
+             ExpressionType.COMPARE_LESSER: ExpressionType.COMPARE_GREATER,
+             ExpressionType.COMPARE_LEQ: ExpressionType.COMPARE_GEQ,
+             ExpressionType.COMPARE_EQUAL: ExpressionType.COMPARE_EQUAL}
+
+
+def extract_column_ranges(predicate: AbstractExpression) \
+        -> Dict[str, Tuple]:
+    """
+    Derives the value ranges of the columns implied by a predicate. Only
+    comparisons of a column with a constant that are combined with AND are
+    considered, other terms do not restrict the ranges. The bounds are
+    inclusive, so rows within them may still fail the predicate.
+
+    Arguments:
+        predicate (AbstractExpression): predicate to be inspected
+
+    Returns:
+        Dict[str, Tuple]: (low, high) bounds per column, None for an
+            unbounded side
+    """
+    ranges = {}
+    pending = [] if predicate is None else [predicate]
+    while pending:
+        expr = pending.pop()
+        if expr.etype == ExpressionType.LOGICAL_AND:
+            pending.extend(expr.children)
+            continue
+        if expr.etype not in _MIRRORED or expr.get_children_count() != 2:
+            continue
+        etype = expr.etype
+        column, constant = expr.children
+        if column.etype == ExpressionType.CONSTANT_VALUE:
+            column, constant = constant, column
+            etype = _MIRRORED[etype]
+        if column.etype != ExpressionType.TUPLE_VALUE or \
+                constant.etype != ExpressionType.CONSTANT_VALUE or \
+                constant.v_type == ColumnType.NDARRAY:
+            continue
+
+        low, high = ranges.get(column.col_name, (None, None))
+        try:
+            if etype in _LOWER_BOUNDS or etype == \
+                    ExpressionType.COMPARE_EQUAL:
+                low = constant.value if low is None \
+                    else max(low, constant.value)
+            if etype in _UPPER_BOUNDS or etype == \
+                    ExpressionType.COMPARE_EQUAL:
+                high = constant.value if high is None \
+                    else min(high, constant.value)
+        except TypeError:
+            # bounds of different types, keep the first one
+            continue
+        ranges[column.col_name] = (low, high)
+    return ranges
+
+
+# default fractions of the rows satisfying a comparison, as in System R
+_SELECTIVITIES = {
+    ExpressionType.COMPARE_EQUAL: 0.1,
+    ExpressionType.COMPARE_NEQ: 0.9,
+    ExpressionType.COMPARE_GREATER: 1 / 3,
+    ExpressionType.COMPARE_LESSER: 1 / 3,
+    ExpressionType.COMPARE_GEQ: 1 / 3,
+    ExpressionType.COMPARE_LEQ: 1 / 3,
+    ExpressionType.COMPARE_CONTAINS: 0.1,
+    ExpressionType.COMPARE_IS_CONTAINED: 0.1
+}
+_DEFAULT_SELECTIVITY = 0.5
+_CONNECTIVES = {ExpressionType.LOGICAL_AND, ExpressionType.LOGICAL_OR}
+
+
+def reorder_predicate(predicate: AbstractExpression) -> AbstractExpression:
+    """
+    Orders the terms of the conjunctions and disjunctions of a predicate so
+    that the cheap and selective ones are evaluated first. AND and OR only
+    evaluate their right side on the rows the left side has not decided,
+    e.g. `FastRCNN(data).label @> ['car'] AND id < 100` is turned into
+    `id < 100 AND FastRCNN(data).label @> ['car']`, which only runs the
+    detector on the frames with small ids.
+
+    Terms are ranked by the fraction of the rows they decide per second of
+    their estimated per-row cost. The cost of a UDF is its observed runtime,
+    or DEFAULT_UDF_COST if it has not been called yet.
+
+    Arguments:
+        predicate (AbstractExpression): predicate to be reordered
+
+    Returns:
+        AbstractExpression: the predicate itself if the order is kept, else
+            an equivalent predicate
+    """
+    if predicate is None or predicate.etype not in _CONNECTIVES or \
+            predicate.get_children_count() != 2:
+        return predicate
+
+    etype = predicate.etype
+    terms = []
+    pending = [predicate]
+    while pending:
+        expr = pending.pop()
+        if expr.etype == etype and expr.get_children_count() == 2:
+            pending.extend(reversed(expr.children))
+        else:
+            terms.append(expr)
+    reordered = [reorder_predicate(term) for term in terms]
+
+    def rank(term: AbstractExpression) -> float:
+        decided = _estimate_selectivity(term)
+        if etype == ExpressionType.LOGICAL_AND:
+            decided = 1 - decided
+        return -decided / max(_estimate_cost(term), OPERATOR_COST)
+
+    ordered = sorted(reordered, key=rank)
+    if all(term is original for term, original in zip(ordered, terms)):
+        return predicate
+    reordered = ordered[-1]
+    for term in reversed(ordered[:-1]):
+        reordered = LogicalExpression(etype, term, reordered)
+    return reordered
+
+
+def _estimate_selectivity(expr: AbstractExpression) -> float:
+    """
+    Returns:
+        float: estimated fraction of the rows satisfying the predicate
+    """
+    if expr.etype in _CONNECTIVES and expr.get_children_count() == 2:
+        left, right = [_estimate_selectivity(child)
+                       for child in expr.children]
+        if expr.etype == ExpressionType.LOGICAL_AND:
+            return left * right
+        return left + right - left * right
+    if expr.etype == ExpressionType.LOGICAL_NOT and \
+            expr.get_children_count() == 1:
+        return 1 - _estimate_selectivity(expr.get_child(0))
+    return _SELECTIVITIES.get(expr.etype, _DEFAULT_SELECTIVITY)
+
+
+def _estimate_cost(expr: AbstractExpression) -> float:
+    """
+    Returns:
+        float: estimated seconds per row to evaluate the expression
+    """
+    if expr.etype in _CONNECTIVES and expr.get_children_count() == 2:
+        # the right side only runs on the rows left undecided
+        left, right = expr.children
+        undecided = _estimate_selectivity(left)
+        if expr.etype == ExpressionType.LOGICAL_OR:
+            undecided = 1 - undecided
+        return OPERATOR_COST + _estimate_cost(left) + \
+            undecided * _estimate_cost(right)
+
+    cost = sum(_estimate_cost(child) for child in expr.children)
+    if expr.etype == ExpressionType.FUNCTION_EXPRESSION:
+        udf_cost = UdfRuntimeStatistics().cost(expr.name)
+        cost += DEFAULT_UDF_COST if udf_cost is None else udf_cost
+    elif expr.etype not in (ExpressionType.TUPLE_VALUE,
+                            ExpressionType.CONSTANT_VALUE):
+        cost += OPERATOR_COST
+    return cost
 
 
 def create_column_metadata(col_list: List[ColumnDefinition]):
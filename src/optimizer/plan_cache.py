@@ -0,0 +1,117 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import re
+from collections import OrderedDict
+
+from src.catalog.catalog_manager import CatalogManager
+from src.configuration.configuration_manager import ConfigurationManager
+from src.planner.abstract_plan import AbstractPlan
+from src.utils.fork_utils import ForkSafeLock
+
+# fallback number of cached plans if optimizer.plan_cache_size is not
+# configured
+DEFAULT_PLAN_CACHE_SIZE = 128
+
+# quoted literals are kept as they are, whitespace elsewhere is collapsed
+_TOKENS = re.compile(r"('(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|\s+)")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Collapses the whitespace outside of quoted literals and drops the
+    trailing semicolons, so that formatting differences map to the same
+    cached plan.
+    """
+    tokens = []
+    for token in _TOKENS.split(query.strip().rstrip(';').strip()):
+        if token and token.isspace():
+            tokens.append(' ')
+        else:
+            tokens.append(token)
+    return ''.join(tokens)
+
+
+class PlanCache(object):
+    """
+    LRU cache of optimized physical plans.
+
+    Plans are keyed by the normalized query text and the catalog version,
+    so that any change to the catalog (CREATE, CREATE UDF, LOAD of a new
+    table, deleting tables or udfs) makes the stale plans unreachable.
+    `invalidate` drops all the plans, e.g. after statements which change
+    the data of a table.
+
+    A cached plan is executed by every query with the same text, also by
+    concurrent ones, hence plans must not be modified by their executors.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(PlanCache, cls).__new__(cls)
+            cls._instance._plans = OrderedDict()
+            cls._instance._lock = ForkSafeLock()
+        return cls._instance
+
+    def __init__(self):
+        size = ConfigurationManager().get_value('optimizer',
+                                                'plan_cache_size')
+        if size is None:
+            size = DEFAULT_PLAN_CACHE_SIZE
+        self._max_size = size
+
+    def __len__(self):
+        return len(self._plans)
+
+    def get(self, query: str) -> AbstractPlan:
+        """
+        Returns the cached plan of the query or None on a miss.
+        """
+        key = self._key(query, CatalogManager().version)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+            return plan
+
+    def put(self, query: str, plan: AbstractPlan, version: int):
+        """
+        Caches the optimized plan of the query.
+
+        Arguments:
+            query (str): query the plan was built for
+            plan (AbstractPlan): optimized physical plan
+            version (int): catalog version read before the query was
+                parsed, the catalog may have changed while it was optimized
+        """
+        if self._max_size <= 0:
+            return
+        key = self._key(query, version)
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self._max_size:
+                self._plans.popitem(last=False)
+
+    def invalidate(self):
+        """
+        Drops all the cached plans.
+        """
+        with self._lock:
+            self._plans.clear()
+
+    def _key(self, query: str, version: int):
+        return (normalize_query(query), version)
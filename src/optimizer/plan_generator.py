@@ -12,6 +12,8 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from typing import Dict
+
 from src.optimizer.operators import Operator
 from src.optimizer.optimizer_context import OptimizerContext
 from src.optimizer.optimizer_tasks import (
@@ -32,8 +34,14 @@ class PlanGenerator:
 
     def build_optimal_physical_plan(self,
                                     root_grp_id: int,
-                                    optimizer_context: OptimizerContext):
-        physical_plan = None
+                                    optimizer_context: OptimizerContext,
+                                    built_plans: Dict = None):
+        # groups referenced by several parents are built once
+        if built_plans is None:
+            built_plans = {}
+        if root_grp_id in built_plans:
+            return built_plans[root_grp_id]
+
         root_grp = optimizer_context.memo.groups[root_grp_id]
         best_grp_expr = root_grp.get_best_expr(PropertyType.DEFAULT)
 
@@ -41,9 +49,10 @@ class PlanGenerator:
 
         for child_grp_id in best_grp_expr.children:
             child_plan = self.build_optimal_physical_plan(
-                child_grp_id, optimizer_context)
+                child_grp_id, optimizer_context, built_plans)
             physical_plan.append_child(child_plan)
 
+        built_plans[root_grp_id] = physical_plan
         return physical_plan
 
     def optimize(self, logical_plan: Operator):
@@ -14,6 +14,7 @@
 # limitations under the License.
 
 from __future__ import annotations
+import copy
 from abc import ABC, abstractmethod
 from enum import Flag, auto, IntEnum
 from typing import TYPE_CHECKING
@@ -21,13 +22,18 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from src.optimizer.optimizer_context import OptimizerContext
 
+from src.configuration.configuration_manager import ConfigurationManager
+from src.expression.abstract_expression import ExpressionType
 from src.optimizer.rules.pattern import Pattern
+from src.optimizer.optimizer_utils import extract_referenced_columns, \
+    extract_column_ranges, bind_udf_result_cache, bind_shared_udf_results, \
+    reorder_predicate
 from src.optimizer.operators import OperatorType, Operator
 from src.optimizer.operators import (
     LogicalCreate, LogicalInsert, LogicalLoadData,
     LogicalCreateUDF, LogicalProject, LogicalGet, LogicalFilter,
     LogicalUnion, LogicalOrderBy, LogicalLimit, LogicalQueryDerivedGet,
-    LogicalSample)
+    LogicalSample, LogicalExplain)
 from src.planner.create_plan import CreatePlan
 from src.planner.create_udf_plan import CreateUDFPlan
 from src.planner.insert_plan import InsertPlan
@@ -38,6 +44,13 @@ from src.planner.union_plan import UnionPlan
 from src.planner.orderby_plan import OrderByPlan
 from src.planner.limit_plan import LimitPlan
 from src.planner.sample_plan import SamplePlan
+from src.planner.topk_plan import TopKPlan
+from src.planner.exchange_plan import ExchangePlan
+from src.planner.explain_plan import ExplainPlan
+
+# fallback number of parallel scan processes if
+# executor.parallel_scan_workers is not configured
+DEFAULT_PARALLEL_SCAN_WORKERS = 1
 
 
 class RuleType(Flag):
@@ -54,20 +67,26 @@ class RuleType(Flag):
     EMBED_PROJECT_INTO_DERIVED_GET = auto()
     PUSHDOWN_FILTER_THROUGH_SAMPLE = auto()
     PUSHDOWN_PROJECT_THROUGH_SAMPLE = auto()
+    EMBED_LIMIT_INTO_ORDERBY = auto()
+    EMBED_SAMPLE_INTO_GET = auto()
+    EMBED_LIMIT_INTO_GET = auto()
 
     REWRITE_DELIMETER = auto()
 
     # IMPLEMENTATION RULES (LOGICAL -> PHYSICAL)
     LOGICAL_UNION_TO_PHYSICAL = auto()
     LOGICAL_ORDERBY_TO_PHYSICAL = auto()
+    LOGICAL_ORDERBY_TO_TOPK = auto()
     LOGICAL_LIMIT_TO_PHYSICAL = auto()
     LOGICAL_INSERT_TO_PHYSICAL = auto()
     LOGICAL_LOAD_TO_PHYSICAL = auto()
     LOGICAL_CREATE_TO_PHYSICAL = auto()
     LOGICAL_CREATE_UDF_TO_PHYSICAL = auto()
     LOGICAL_GET_TO_SEQSCAN = auto()
+    LOGICAL_GET_TO_PARALLEL_SEQSCAN = auto()
     LOGICAL_SAMPLE_TO_UNIFORMSAMPLE = auto()
     LOGICAL_DERIVED_GET_TO_PHYSICAL = auto()
+    LOGICAL_EXPLAIN_TO_PHYSICAL = auto()
     IMPLEMENTATION_DELIMETER = auto()
 
 
@@ -80,6 +99,7 @@ class Promise(IntEnum):
     # IMPLEMENTATION RULES
     LOGICAL_UNION_TO_PHYSICAL = auto()
     LOGICAL_ORDERBY_TO_PHYSICAL = auto()
+    LOGICAL_ORDERBY_TO_TOPK = auto()
     LOGICAL_LIMIT_TO_PHYSICAL = auto()
     LOGICAL_INSERT_TO_PHYSICAL = auto()
     LOGICAL_LOAD_TO_PHYSICAL = auto()
@@ -87,7 +107,9 @@ class Promise(IntEnum):
     LOGICAL_CREATE_UDF_TO_PHYSICAL = auto()
     LOGICAL_SAMPLE_TO_UNIFORMSAMPLE = auto()
     LOGICAL_GET_TO_SEQSCAN = auto()
+    LOGICAL_GET_TO_PARALLEL_SEQSCAN = auto()
     LOGICAL_DERIVED_GET_TO_PHYSICAL = auto()
+    LOGICAL_EXPLAIN_TO_PHYSICAL = auto()
     IMPLEMENTATION_DELIMETER = auto()
 
     # REWRITE RULES
@@ -97,6 +119,9 @@ class Promise(IntEnum):
     EMBED_PROJECT_INTO_DERIVED_GET = auto()
     PUSHDOWN_FILTER_THROUGH_SAMPLE = auto()
     PUSHDOWN_PROJECT_THROUGH_SAMPLE = auto()
+    EMBED_LIMIT_INTO_ORDERBY = auto()
+    EMBED_SAMPLE_INTO_GET = auto()
+    EMBED_LIMIT_INTO_GET = auto()
 
 
 class Rule(ABC):
@@ -187,6 +212,18 @@ class Rule(ABC):
 # REWRITE RULES START
 
 
+def _copy_operator(opr: Operator) -> Operator:
+    """
+    Shallow copy of the operator with its own list of children.
+
+    Structurally equal subtrees share a single group in the memo, so a rule
+    has to modify a copy of a matched operator instead of the operator itself.
+    """
+    opr_copy = copy.copy(opr)
+    opr_copy.children = list(opr.children)
+    return opr_copy
+
+
 class EmbedFilterIntoGet(Rule):
     def __init__(self):
         pattern = Pattern(OperatorType.LOGICALFILTER)
@@ -202,8 +239,7 @@ class EmbedFilterIntoGet(Rule):
 
     def apply(self, before: LogicalFilter, context: OptimizerContext):
         predicate = before.predicate
-        # logical_get = copy.deepcopy(before.children[0])
-        logical_get = before.children[0]
+        logical_get = _copy_operator(before.children[0])
         logical_get.predicate = predicate
         return logical_get
 
@@ -223,8 +259,7 @@ class EmbedProjectIntoGet(Rule):
 
     def apply(self, before: LogicalProject, context: OptimizerContext):
         select_list = before.target_list
-        # logical_get = copy.deepcopy(before.children[0])
-        logical_get = before.children[0]
+        logical_get = _copy_operator(before.children[0])
         logical_get.target_list = select_list
         return logical_get
 
@@ -248,8 +283,7 @@ class EmbedFilterIntoDerivedGet(Rule):
 
     def apply(self, before: LogicalFilter, context: OptimizerContext):
         predicate = before.predicate
-        # logical_derived_get = copy.deepcopy(before.children[0])
-        logical_derived_get = before.children[0]
+        logical_derived_get = _copy_operator(before.children[0])
         logical_derived_get.predicate = predicate
         return logical_derived_get
 
@@ -271,8 +305,7 @@ class EmbedProjectIntoDerivedGet(Rule):
 
     def apply(self, before: LogicalProject, context: OptimizerContext):
         select_list = before.target_list
-        # logical_derived_get = copy.deepcopy(before.children[0])
-        logical_derived_get = before.children[0]
+        logical_derived_get = _copy_operator(before.children[0])
         logical_derived_get.target_list = select_list
         return logical_derived_get
 
@@ -293,9 +326,10 @@ class PushdownFilterThroughSample(Rule):
         return True
 
     def apply(self, before: LogicalFilter, context: OptimizerContext):
-        sample = before.children[0]
-        logical_get = sample.children[0]
+        sample = _copy_operator(before.children[0])
+        logical_get = _copy_operator(sample.children[0])
         logical_get.predicate = before.predicate
+        sample.children = [logical_get]
         return sample
 
 
@@ -315,12 +349,80 @@ class PushdownProjectThroughSample(Rule):
         return True
 
     def apply(self, before: LogicalProject, context: OptimizerContext):
-        sample = before.children[0]
-        logical_get = sample.children[0]
+        sample = _copy_operator(before.children[0])
+        logical_get = _copy_operator(sample.children[0])
         logical_get.target_list = before.target_list
+        sample.children = [logical_get]
         return sample
 
 
+class EmbedLimitIntoOrderBy(Rule):
+    def __init__(self):
+        pattern = Pattern(OperatorType.LOGICALLIMIT)
+        pattern_orderby = Pattern(OperatorType.LOGICALORDERBY)
+        pattern_orderby.append_child(Pattern(OperatorType.DUMMY))
+        pattern.append_child(pattern_orderby)
+        super().__init__(RuleType.EMBED_LIMIT_INTO_ORDERBY, pattern)
+
+    def promise(self):
+        return Promise.EMBED_LIMIT_INTO_ORDERBY
+
+    def check(self, before: Operator, context: OptimizerContext):
+        # nothing else to check if logical match found return true
+        return True
+
+    def apply(self, before: LogicalLimit, context: OptimizerContext):
+        # the sort only has to retain the first limit_count rows
+        logical_orderby = _copy_operator(before.children[0])
+        logical_orderby.limit_count = before.limit_count
+        return logical_orderby
+
+
+class EmbedSampleIntoGet(Rule):
+    def __init__(self):
+        pattern = Pattern(OperatorType.LOGICALSAMPLE)
+        pattern.append_child(Pattern(OperatorType.LOGICALGET))
+        super().__init__(RuleType.EMBED_SAMPLE_INTO_GET, pattern)
+
+    def promise(self):
+        return Promise.EMBED_SAMPLE_INTO_GET
+
+    def check(self, before: Operator, context: OptimizerContext):
+        # nothing else to check if logical match found return true
+        return True
+
+    def apply(self, before: LogicalSample, context: OptimizerContext):
+        # the storage skips the frames that are not sampled before decoding
+        logical_get = _copy_operator(before.children[0])
+        logical_get.sample_freq = before.sample_freq
+        return logical_get
+
+
+class EmbedLimitIntoGet(Rule):
+    def __init__(self):
+        pattern = Pattern(OperatorType.LOGICALLIMIT)
+        pattern.append_child(Pattern(OperatorType.LOGICALGET))
+        super().__init__(RuleType.EMBED_LIMIT_INTO_GET, pattern)
+
+    def promise(self):
+        return Promise.EMBED_LIMIT_INTO_GET
+
+    def check(self, before: LogicalLimit, context: OptimizerContext):
+        # rows dropped by a predicate would have to be made up for
+        logical_get = before.children[0]
+        return (logical_get.predicate is None
+                and logical_get.limit_count is None)
+
+    def apply(self, before: LogicalLimit, context: OptimizerContext):
+        # the storage stops decoding once it returned limit_count rows, the
+        # limit itself stays on top of the scan
+        logical_get = _copy_operator(before.children[0])
+        logical_get.limit_count = before.limit_count
+        after = _copy_operator(before)
+        after.children = [logical_get]
+        return after
+
+
 # REWRITE RULES END
 ##############################################
 
@@ -414,11 +516,64 @@ class LogicalGetToSeqScan(Rule):
         return Promise.LOGICAL_GET_TO_SEQSCAN
 
     def check(self, before: Operator, context: OptimizerContext):
-        return True
+        return _parallel_scan_workers() <= 1
 
     def apply(self, before: LogicalGet, context: OptimizerContext):
-        after = SeqScanPlan(before.predicate, before.target_list)
-        after.append_child(StoragePlan(before.dataset_metadata))
+        skip_frames = 0
+        if before.sample_freq is not None:
+            skip_frames = before.sample_freq.value
+        limit = None
+        if before.limit_count is not None:
+            limit = before.limit_count.value
+        # run the cheap and selective terms of the predicate first
+        predicate = reorder_predicate(before.predicate)
+        # only decode the columns used by the predicate and the projection
+        columns = None
+        if before.target_list is not None:
+            columns = extract_referenced_columns(
+                before.target_list + [predicate])
+        # the stored and the shared UDF results are looked up by frame id
+        id_column = before.dataset_metadata.identifier_column
+        exprs = (before.target_list or []) + [predicate]
+        cached = bind_udf_result_cache(exprs, before.dataset_metadata)
+        shared_udf_calls = bind_shared_udf_results(exprs)
+        if (cached or shared_udf_calls) and \
+                columns is not None and id_column not in columns:
+            columns.append(id_column)
+        # skip the row groups that can not satisfy the predicate, the
+        # predicate itself is still evaluated on the remaining rows
+        column_ranges = extract_column_ranges(predicate) or None
+        after = SeqScanPlan(predicate, before.target_list,
+                            shared_udf_calls, id_column)
+        after.append_child(StoragePlan(before.dataset_metadata,
+                                       skip_frames=skip_frames,
+                                       limit=limit,
+                                       columns=columns,
+                                       column_ranges=column_ranges))
+        return after
+
+
+class LogicalGetToParallelSeqScan(Rule):
+    def __init__(self):
+        pattern = Pattern(OperatorType.LOGICALGET)
+        super().__init__(RuleType.LOGICAL_GET_TO_PARALLEL_SEQSCAN, pattern)
+
+    def promise(self):
+        return Promise.LOGICAL_GET_TO_PARALLEL_SEQSCAN
+
+    def check(self, before: Operator, context: OptimizerContext):
+        return _parallel_scan_workers() > 1
+
+    def apply(self, before: LogicalGet, context: OptimizerContext):
+        # keep the frames in id order as long as the ids are projected
+        id_column = before.dataset_metadata.identifier_column
+        order_column = None
+        if before.target_list is None or any(
+                expr.etype == ExpressionType.TUPLE_VALUE and
+                expr.col_name == id_column for expr in before.target_list):
+            order_column = id_column
+        after = ExchangePlan(_parallel_scan_workers(), order_column)
+        after.append_child(LogicalGetToSeqScan().apply(before, context))
         return after
 
 
@@ -453,7 +608,8 @@ class LogicalDerivedGetToPhysical(Rule):
 
     def apply(self, before: LogicalQueryDerivedGet,
               context: OptimizerContext):
-        after = SeqScanPlan(before.predicate, before.target_list)
+        after = SeqScanPlan(reorder_predicate(before.predicate),
+                            before.target_list)
         return after
 
 
@@ -485,14 +641,31 @@ class LogicalOrderByToPhysical(Rule):
     def promise(self):
         return Promise.LOGICAL_ORDERBY_TO_PHYSICAL
 
-    def check(self, before: Operator, context: OptimizerContext):
-        return True
+    def check(self, before: LogicalOrderBy, context: OptimizerContext):
+        return before.limit_count is None
 
     def apply(self, before: LogicalOrderBy, context: OptimizerContext):
         after = OrderByPlan(before.orderby_list)
         return after
 
 
+class LogicalOrderByToTopK(Rule):
+    def __init__(self):
+        pattern = Pattern(OperatorType.LOGICALORDERBY)
+        pattern.append_child(Pattern(OperatorType.DUMMY))
+        super().__init__(RuleType.LOGICAL_ORDERBY_TO_TOPK, pattern)
+
+    def promise(self):
+        return Promise.LOGICAL_ORDERBY_TO_TOPK
+
+    def check(self, before: LogicalOrderBy, context: OptimizerContext):
+        return before.limit_count is not None
+
+    def apply(self, before: LogicalOrderBy, context: OptimizerContext):
+        after = TopKPlan(before.orderby_list, before.limit_count)
+        return after
+
+
 class LogicalLimitToPhysical(Rule):
     def __init__(self):
         pattern = Pattern(OperatorType.LOGICALLIMIT)
@@ -510,6 +683,23 @@ class LogicalLimitToPhysical(Rule):
         return after
 
 
+class LogicalExplainToPhysical(Rule):
+    def __init__(self):
+        pattern = Pattern(OperatorType.LOGICALEXPLAIN)
+        pattern.append_child(Pattern(OperatorType.DUMMY))
+        super().__init__(RuleType.LOGICAL_EXPLAIN_TO_PHYSICAL, pattern)
+
+    def promise(self):
+        return Promise.LOGICAL_EXPLAIN_TO_PHYSICAL
+
+    def check(self, before: Operator, context: OptimizerContext):
+        return True
+
+    def apply(self, before: LogicalExplain, context: OptimizerContext):
+        after = ExplainPlan(before.analyze)
+        return after
+
+
 # IMPLEMENTATION RULES END
 ##############################################
 
@@ -531,7 +721,10 @@ class RulesManager:
             EmbedFilterIntoDerivedGet(),
             EmbedProjectIntoDerivedGet(),
             PushdownFilterThroughSample(),
-            PushdownProjectThroughSample()
+            PushdownProjectThroughSample(),
+            EmbedLimitIntoOrderBy(),
+            EmbedSampleIntoGet(),
+            EmbedLimitIntoGet()
         ]
 
         self._implementation_rules = [
@@ -541,10 +734,13 @@ class RulesManager:
             LogicalLoadToPhysical(),
             LogicalSampleToUniformSample(),
             LogicalGetToSeqScan(),
+            LogicalGetToParallelSeqScan(),
             LogicalDerivedGetToPhysical(),
             LogicalUnionToPhysical(),
             LogicalOrderByToPhysical(),
-            LogicalLimitToPhysical()
+            LogicalOrderByToTopK(),
+            LogicalLimitToPhysical(),
+            LogicalExplainToPhysical()
         ]
 
     @property
@@ -554,3 +750,11 @@ class RulesManager:
     @property
     def implementation_rules(self):
         return self._implementation_rules
+
+
+def _parallel_scan_workers() -> int:
+    workers = ConfigurationManager().get_value('executor',
+                                               'parallel_scan_workers')
+    if workers is None:
+        workers = DEFAULT_PARALLEL_SCAN_WORKERS
+    return workers
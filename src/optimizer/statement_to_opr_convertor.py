@@ -19,13 +19,14 @@ from src.optimizer.operators import (LogicalGet, LogicalFilter, LogicalProject,
                                      LogicalCreateUDF, LogicalLoadData,
                                      LogicalQueryDerivedGet, LogicalUnion,
                                      LogicalOrderBy, LogicalLimit,
-                                     LogicalSample)
+                                     LogicalSample, LogicalExplain)
 from src.parser.statement import AbstractStatement
 from src.parser.select_statement import SelectStatement
 from src.parser.insert_statement import InsertTableStatement
 from src.parser.create_statement import CreateTableStatement
 from src.parser.create_udf_statement import CreateUDFStatement
 from src.parser.load_statement import LoadDataStatement
+from src.parser.explain_statement import ExplainStatement
 from src.optimizer.optimizer_utils import (bind_table_ref, bind_columns_expr,
                                            bind_predicate_expr,
                                            create_column_metadata,
@@ -43,7 +44,9 @@ class StatementToPlanConvertor:
         self._column_map = {}  # key: column_name (str) value: DataFrameColumn
 
     def _populate_column_map(self, dataset: DataFrameMetadata):
-        for column in dataset.columns:
+        # the catalog returns the metadata detached from the session, the
+        # columns are read from its schema instead of the relationship
+        for column in dataset.schema.column_list:
             self._column_map[column.name.lower()] = column
 
     def visit_table_ref(self, table_ref: TableRef):
@@ -225,6 +228,17 @@ class StatementToPlanConvertor:
         load_data_opr = LogicalLoadData(table_metainfo, statement.path)
         self._plan = load_data_opr
 
+    def visit_explain(self, statement: ExplainStatement):
+        """Convertor for parsed explain statement
+
+        Arguments:
+            statement (ExplainStatement): [Explain statement]
+        """
+        self.visit_select(statement.explainable_stmt)
+        explain_opr = LogicalExplain(statement.analyze)
+        explain_opr.append_child(self._plan)
+        self._plan = explain_opr
+
     def visit(self, statement: AbstractStatement):
         """Based on the instance of the statement the corresponding
            visit is called.
@@ -243,6 +257,8 @@ class StatementToPlanConvertor:
             self.visit_create_udf(statement)
         elif isinstance(statement, LoadDataStatement):
             self.visit_load_data(statement)
+        elif isinstance(statement, ExplainStatement):
+            self.visit_explain(statement)
         return self._plan
 
     @property
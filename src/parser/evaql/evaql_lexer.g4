@@ -18,6 +18,7 @@ LINE_COMMENT:                        (
 
 ALL:                                 'ALL';
 ALTER:                               'ALTER';
+ANALYZE:                             'ANALYZE';
 AND:                                 'AND';
 ANY:                                 'ANY';
 AS:                                  'AS';
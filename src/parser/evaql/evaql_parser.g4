@@ -35,7 +35,7 @@ dmlStatement
     ;
 
 utilityStatement
-    : simpleDescribeStatement | helpStatement
+    : simpleDescribeStatement | helpStatement | explainStatement
     ;
 
 // Data Definition Language
@@ -308,6 +308,10 @@ helpStatement
     : HELP STRING_LITERAL
     ;
 
+explainStatement
+    : EXPLAIN ANALYZE? selectStatement
+    ;
+
 // Common Clauses
 
 //    DB Objects
@@ -0,0 +1,55 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from src.parser.statement import AbstractStatement
+
+from src.parser.types import StatementType
+from src.parser.select_statement import SelectStatement
+
+
+class ExplainStatement(AbstractStatement):
+    """
+    Explain Statement constructed after parsing the input query
+
+    Arguments:
+    explainable_stmt (SelectStatement): query whose plan is explained
+    analyze (bool): execute the query and report the actual rows, time and
+        memory of every plan node
+    """
+
+    def __init__(self, explainable_stmt: SelectStatement,
+                 analyze: bool = False):
+        super().__init__(StatementType.EXPLAIN)
+        self._explainable_stmt = explainable_stmt
+        self._analyze = analyze
+
+    def __str__(self) -> str:
+        print_str = "EXPLAIN "
+        if self._analyze:
+            print_str += "ANALYZE "
+        return print_str + str(self._explainable_stmt)
+
+    @property
+    def explainable_stmt(self) -> SelectStatement:
+        return self._explainable_stmt
+
+    @property
+    def analyze(self) -> bool:
+        return self._analyze
+
+    def __eq__(self, other):
+        if not isinstance(other, ExplainStatement):
+            return False
+        return (self.explainable_stmt == other.explainable_stmt
+                and self.analyze == other.analyze)
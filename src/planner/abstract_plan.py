@@ -16,7 +16,7 @@
 
 from abc import ABC
 from src.planner.types import PlanOprType
-from typing import List
+from typing import Dict, List
 
 
 class AbstractPlan(ABC):
@@ -73,8 +73,28 @@ class AbstractPlan(ABC):
         """
         return self._opr_type
 
+    @property
+    def details(self) -> Dict:
+        """
+        Attributes of the plan node shown by EXPLAIN, e.g. the predicates
+        and columns pushed down into it. Attributes set to None are omitted.
+
+        Returns:
+            Dict -- attribute values by name
+        """
+        return {}
+
+    def describe(self) -> str:
+        """one line description of the plan node"""
+        details = ', '.join('{}={}'.format(name, value)
+                            for name, value in self.details.items()
+                            if value is not None)
+        if not details:
+            return self.opr_type.name
+        return '{}({})'.format(self.opr_type.name, details)
+
     def __str__(self, level=0):
-        out_string = "\t" * level + '' + "\n"
+        out_string = "\t" * level + self.describe() + "\n"
         for child in self.children:
             out_string += child.__str__(level + 1)
         return out_string
@@ -38,3 +38,7 @@ class AbstractScan(AbstractPlan):
     @property
     def predicate(self) -> AbstractExpression:
         return self._predicate
+
+    @property
+    def details(self):
+        return {'predicate': self._predicate}
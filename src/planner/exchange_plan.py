@@ -0,0 +1,47 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from src.planner.abstract_plan import AbstractPlan
+from src.planner.types import PlanOprType
+
+
+class ExchangePlan(AbstractPlan):
+    """
+    This plan runs its child pipeline once per shard of the scanned table,
+    each in a separate worker process, and gathers the results.
+
+    Arguments:
+        workers (int): number of worker processes, one shard each
+        order_column (str): column the outputs of the shards are merged on
+            to keep its order, None if the batches are returned in the
+            order they arrive
+    """
+
+    def __init__(self, workers: int, order_column: str = None):
+        self._workers = workers
+        self._order_column = order_column
+        super().__init__(PlanOprType.EXCHANGE)
+
+    @property
+    def workers(self):
+        return self._workers
+
+    @property
+    def order_column(self):
+        return self._order_column
+
+    @property
+    def details(self):
+        return {'workers': self._workers,
+                'order_column': self._order_column}
@@ -0,0 +1,40 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from src.planner.abstract_plan import AbstractPlan
+from src.planner.types import PlanOprType
+
+
+class ExplainPlan(AbstractPlan):
+    """
+    This plan returns a description of its child plan instead of the rows
+    produced by it.
+
+    Arguments:
+        analyze: bool
+            Execute the child plan and annotate every node with the
+            actual rows, time and memory
+    """
+
+    def __init__(self, analyze: bool = False):
+        self._analyze = analyze
+        super().__init__(PlanOprType.EXPLAIN)
+
+    @property
+    def analyze(self):
+        return self._analyze
+
+    @property
+    def details(self):
+        return {'analyze': self._analyze or None}
@@ -40,3 +40,7 @@ class LimitPlan(AbstractPlan):
     @property
     def limit_value(self):
         return self._limit_count.value
+
+    @property
+    def details(self):
+        return {'limit': self.limit_value}
@@ -42,3 +42,9 @@ class OrderByPlan(AbstractPlan):
     @property
     def orderby_list(self):
         return self._orderby_list
+
+    @property
+    def details(self):
+        orderby = ', '.join('{} {}'.format(column, sort_type.name)
+                            for column, sort_type in self._orderby_list)
+        return {'orderby': orderby}
@@ -36,3 +36,7 @@ class SamplePlan(AbstractPlan):
     @property
     def sample_freq(self):
         return self._sample_freq
+
+    @property
+    def details(self):
+        return {'frequency': self._sample_freq}
@@ -14,7 +14,8 @@
 # limitations under the License.
 from typing import List
 
-from src.expression.abstract_expression import AbstractExpression
+from src.expression.abstract_expression import AbstractExpression, \
+    ExpressionType
 from src.planner.abstract_scan_plan import AbstractScan
 from src.planner.types import PlanOprType
 
@@ -29,15 +30,54 @@ class SeqScanPlan(AbstractScan):
             list of column names string in the plan
         predicate: AbstractExpression
             An expression used for filtering
+        shared_udf_calls: int
+            number of groups of equal UDF calls in the predicate and the
+            columns, which share their results within a batch
+        id_column: str
+            column holding the frame ids the shared results are keyed by
     """
 
     def __init__(self,
                  predicate: AbstractExpression,
-                 column_ids: List[AbstractExpression]):
+                 column_ids: List[AbstractExpression],
+                 shared_udf_calls: int = 0,
+                 id_column: str = None):
         self._column_ids = column_ids
+        self._shared_udf_calls = shared_udf_calls
+        self._id_column = id_column
         super().__init__(PlanOprType.SEQUENTIAL_SCAN,
                          predicate)
 
     @property
     def columns(self):
         return self._column_ids
+
+    @property
+    def shared_udf_calls(self):
+        return self._shared_udf_calls
+
+    @property
+    def id_column(self):
+        return self._id_column
+
+    @property
+    def details(self):
+        details = super().details
+        if self._column_ids is not None:
+            details['columns'] = '[{}]'.format(
+                ', '.join(str(column) for column in self._column_ids))
+        # UDF calls answered from the results stored with the table
+        cached = []
+        pending = [expr for expr in [self.predicate] + (
+            self._column_ids or []) if expr is not None]
+        while pending:
+            expr = pending.pop()
+            pending.extend(expr.children)
+            if expr.etype == ExpressionType.FUNCTION_EXPRESSION and \
+                    expr.result_cache is not None:
+                cached.append(str(expr))
+        if cached:
+            details['cached_udfs'] = '[{}]'.format(', '.join(cached))
+        if self._shared_udf_calls:
+            details['shared_udf_results'] = self._shared_udf_calls
+        return details
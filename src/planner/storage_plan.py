@@ -12,9 +12,13 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from typing import Dict, List, Tuple
+
 from src.catalog.models.df_metadata import DataFrameMetadata
+from src.configuration.configuration_manager import ConfigurationManager
 from src.planner.abstract_plan import AbstractPlan
 from src.planner.types import PlanOprType
+from src.readers.abstract_reader import DEFAULT_BATCH_SIZE
 
 
 class StoragePlan(AbstractPlan):
@@ -30,11 +34,17 @@ class StoragePlan(AbstractPlan):
         limit (int): limit on data records to be retrieved
         total_shards (int): number of shards of data (if sharded)
         curr_shard (int): current curr_shard if data is sharded
+        columns (List[str]): names of the columns to be read, all the
+            columns if None
+        column_ranges (Dict[str, Tuple]): inclusive (low, high) bounds per
+            column used to skip the row groups outside of them
     """
 
     def __init__(self, video: DataFrameMetadata, batch_size: int = 1,
                  skip_frames: int = 0, offset: int = None, limit: int = None,
-                 total_shards: int = 0, curr_shard: int = 0):
+                 total_shards: int = 0, curr_shard: int = 0,
+                 columns: List[str] = None,
+                 column_ranges: Dict[str, Tuple] = None):
         super().__init__(PlanOprType.STORAGE_PLAN)
         self._video = video
         self._batch_size = batch_size
@@ -43,6 +53,8 @@ class StoragePlan(AbstractPlan):
         self._limit = limit
         self._total_shards = total_shards
         self._curr_shard = curr_shard
+        self._columns = columns
+        self._column_ranges = column_ranges
 
     @property
     def video(self):
@@ -68,6 +80,36 @@ class StoragePlan(AbstractPlan):
     def total_shards(self):
         return self._total_shards
 
+    @total_shards.setter
+    def total_shards(self, total_shards: int):
+        self._total_shards = total_shards
+
     @property
     def curr_shard(self):
         return self._curr_shard
+
+    @curr_shard.setter
+    def curr_shard(self, curr_shard: int):
+        self._curr_shard = curr_shard
+
+    @property
+    def columns(self):
+        return self._columns
+
+    @property
+    def column_ranges(self):
+        return self._column_ranges
+
+    @property
+    def details(self):
+        # the readers batch the rows by executor.batch_size
+        batch_size = ConfigurationManager().get_value('executor',
+                                                      'batch_size')
+        return {'table': self._video.name,
+                'columns': self._columns,
+                'column_ranges': self._column_ranges,
+                'skip_frames': self._skip_frames or None,
+                'offset': self._offset,
+                'limit': self._limit,
+                'shards': self._total_shards or None,
+                'batch_size': batch_size or DEFAULT_BATCH_SIZE}
@@ -0,0 +1,64 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from src.planner.abstract_plan import AbstractPlan
+from src.planner.types import PlanOprType
+from src.expression.constant_value_expression import ConstantValueExpression
+
+
+class TopKPlan(AbstractPlan):
+    """
+    This plan is used for storing information required for order by
+    operations that are followed by a limit. Only the first limit_count
+    rows of the sorted output are retained.
+
+    Arguments:
+        orderby_list: List[(TupleValueExpression, EnumInt), ...]
+            A tuple of the column names string and the type of sort in the plan
+        limit_count: ConstantValueExpression
+            A ConstantValueExpression which is the count of the
+            number of rows returned
+    """
+
+    def __init__(self, orderby_list,
+                 limit_count: ConstantValueExpression):
+        self._orderby_list = orderby_list
+        self._limit_count = limit_count
+        super().__init__(PlanOprType.TOP_K)
+
+    @property
+    def columns(self):
+        return [_[0] for _ in self._orderby_list]
+
+    @property
+    def sort_types(self):
+        return [_[1] for _ in self._orderby_list]
+
+    @property
+    def orderby_list(self):
+        return self._orderby_list
+
+    @property
+    def limit_expression(self):
+        return self._limit_count
+
+    @property
+    def limit_value(self):
+        return self._limit_count.value
+
+    @property
+    def details(self):
+        orderby = ', '.join('{} {}'.format(column, sort_type.name)
+                            for column, sort_type in self._orderby_list)
+        return {'orderby': orderby, 'limit': self.limit_value}
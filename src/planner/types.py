@@ -28,4 +28,7 @@ class PlanOprType(IntEnum):
     ORDER_BY = auto()
     LIMIT = auto()
     SAMPLE = auto()
+    TOP_K = auto()
+    EXCHANGE = auto()
+    EXPLAIN = auto()
     # add other types
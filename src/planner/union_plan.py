@@ -33,3 +33,7 @@ class UnionPlan(AbstractPlan):
     @property
     def all(self):
         return self._all
+
+    @property
+    def details(self):
+        return {'all': self._all}
@@ -20,6 +20,9 @@ import pandas as pd
 from src.models.storage.batch import Batch
 from src.configuration.configuration_manager import ConfigurationManager
 
+# fallback number of rows per batch if executor.batch_size is not configured
+DEFAULT_BATCH_SIZE = 50
+
 
 class AbstractReader(metaclass=ABCMeta):
     """
@@ -31,10 +34,14 @@ class AbstractReader(metaclass=ABCMeta):
         file_url (str): path to read data from
         batch_size (int, optional): No. of frames to read in batch from video
         offset (int, optional): Start frame location in video
+        skip_frames (int, optional): Only every skip_frames-th frame is
+            returned, the others are skipped without being decoded when the
+            format allows it
+        limit (int, optional): Maximum number of frames to be returned
         """
 
     def __init__(self, file_url: str, batch_size=None,
-                 offset=None):
+                 offset=None, skip_frames=None, limit=None):
         # Opencv doesn't support pathlib.Path so convert to raw str
         if isinstance(file_url, Path):
             file_url = str(file_url)
@@ -42,26 +49,63 @@ class AbstractReader(metaclass=ABCMeta):
         self.file_url = file_url
         self.batch_size = batch_size
         self.offset = offset
+        self.skip_frames = skip_frames if skip_frames else 1
+        self.limit = limit
 
     def read(self) -> Iterator[Batch]:
         """
         This calls the sub class read implementation and
-        yields the batch to the caller
+        yields the batch to the caller.
+        The sub class generator is closed as soon as the limit is reached
+        or the caller closes this generator.
         """
 
-        data_batch = []
         # Fetch batch_size from Config if not provided
         if self.batch_size is None or self.batch_size < 0:
             self.batch_size = ConfigurationManager().get_value(
                 "executor", "batch_size")
             if self.batch_size is None:
-                self.batch_size = 50
+                self.batch_size = DEFAULT_BATCH_SIZE
+
+        remaining = self.limit
+        batch_size = self.batch_size
+        if remaining is not None:
+            if remaining <= 0:
+                return
+            # do not decode a full batch if fewer rows are needed
+            batch_size = min(batch_size, remaining)
+
+        batches = self._read_batch(batch_size)
+        try:
+            for batch in batches:
+                if remaining is not None:
+                    if len(batch) > remaining:
+                        batch = batch[:remaining]
+                    remaining -= len(batch)
+                yield batch
+                if remaining == 0:
+                    return
+        finally:
+            batches.close()
 
-        for data in self._read():
-            data_batch.append(data)
-            if len(data_batch) % self.batch_size == 0:
-                yield Batch(pd.DataFrame(data_batch))
-                data_batch = []
+    def _read_batch(self, batch_size: int) -> Iterator[Batch]:
+        """
+        Groups the objects yielded by `_read` into batches, dropping the
+        skipped ones. Sub classes that can decode a whole batch at once or
+        skip frames without decoding them override it.
+        """
+        data_batch = []
+        rows = self._read()
+        try:
+            for index, data in enumerate(rows):
+                if index % self.skip_frames:
+                    continue
+                data_batch.append(data)
+                if len(data_batch) % batch_size == 0:
+                    yield Batch(pd.DataFrame(data_batch))
+                    data_batch = []
+        finally:
+            rows.close()
         if data_batch:
             yield Batch(pd.DataFrame(data_batch))
 
@@ -13,13 +13,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import cv2
-from typing import Iterator, Dict
+import numpy as np
+from typing import TYPE_CHECKING, Iterator, Dict
 
+from src.models.storage.batch import Batch
 from src.readers.abstract_reader import AbstractReader
 from src.utils.logging_manager import LoggingLevel
 from src.utils.logging_manager import LoggingManager
 
+if TYPE_CHECKING:
+    import cv2
+
 
 class OpenCVReader(AbstractReader):
 
@@ -39,17 +43,73 @@ class OpenCVReader(AbstractReader):
         self._start_frame_id = start_frame_id
         super().__init__(*args, **kwargs)
 
-    def _read(self) -> Iterator[Dict]:
+    def _video_capture(self) -> 'cv2.VideoCapture':
+        # opencv is only loaded once a video is read
+        import cv2
+
         video = cv2.VideoCapture(self.file_url)
         video_offset = self.offset if self.offset else 0
         video.set(cv2.CAP_PROP_POS_FRAMES, video_offset)
 
         LoggingManager().log("Reading frames", LoggingLevel.INFO)
+        return video
 
-        _, frame = video.read()
-        frame_id = self._start_frame_id
-
-        while frame is not None:
-            yield {'id': frame_id, 'data': frame}
+    def _read(self) -> Iterator[Dict]:
+        video = self._video_capture()
+        try:
             _, frame = video.read()
-            frame_id += 1
+            frame_id = self._start_frame_id
+
+            while frame is not None:
+                yield {'id': frame_id, 'data': frame}
+                _, frame = video.read()
+                frame_id += 1
+        finally:
+            video.release()
+
+    def _skip(self, video: 'cv2.VideoCapture'):
+        """
+        Advances over the frames between two sampled ones. grab() only
+        demuxes the frame, the expensive decoding happens in retrieve().
+        """
+        for _ in range(self.skip_frames - 1):
+            if not video.grab():
+                return
+
+    def _read_batch(self, batch_size: int) -> Iterator[Batch]:
+        """
+        Decodes the frames of a batch directly into a preallocated
+        (N, H, W, C) buffer, which the yielded batch wraps without copying.
+        Skipped frames are grabbed but never decoded.
+        """
+        video = self._video_capture()
+        try:
+            frame_id = self._start_frame_id
+
+            ok, frame = video.read()
+            while ok:
+                buffer = np.empty((batch_size,) + frame.shape,
+                                  dtype=frame.dtype)
+                buffer[0] = frame
+                num_frames = 1
+                while num_frames < batch_size:
+                    self._skip(video)
+                    ok, frame = video.read(buffer[num_frames])
+                    # opencv allocates a new frame if the frame size changed,
+                    # which then starts the next batch
+                    if not ok or not np.shares_memory(frame, buffer):
+                        break
+                    num_frames += 1
+
+                yield Batch.from_frame_array(buffer[:num_frames],
+                                             start_id=frame_id,
+                                             id_step=self.skip_frames)
+                frame_id += num_frames * self.skip_frames
+
+                # the next frame is only decoded once it is asked for, so
+                # that a closed reader does not decode ahead
+                if num_frames == batch_size:
+                    self._skip(video)
+                    ok, frame = video.read()
+        finally:
+            video.release()
@@ -20,7 +20,8 @@ from src.readers.abstract_reader import AbstractReader
 
 class PetastormReader(AbstractReader):
     def __init__(self, *args, cur_shard=None, shard_count=None,
-                 predicate=None, **kwargs):
+                 predicate=None, schema_fields=None, rowgroup_selector=None,
+                 ordered=False, **kwargs):
         """
         Reads data from the petastorm parquet stores. Note this won't
         work for any arbitary parquet store apart from one materialized
@@ -32,13 +33,22 @@ class PetastormReader(AbstractReader):
                                       applicable
             predicate (PredicateBase, optional): instance of predicate object
                 to filter rows to be returned by reader
+            schema_fields (List[UnischemaField], optional): fields to be
+                read and decoded, all the fields if None
+            rowgroup_selector (RowGroupSelectorBase, optional): instance of
+                selector object to skip row groups using the dataset indexes
+            ordered (bool, optional): read the row groups one after the
+                other in storage order instead of in parallel
 
         """
         self.cur_shard = cur_shard
         self.shard_count = shard_count
         self.predicate = predicate
+        self.schema_fields = schema_fields
+        self.rowgroup_selector = rowgroup_selector
+        self.ordered = ordered
         super().__init__(*args, **kwargs)
-        if self.cur_shard is not None and self.cur_shard <= 0:
+        if self.cur_shard is not None and self.cur_shard < 0:
             self.cur_shard = None
 
         if self.shard_count is not None and self.shard_count <= 0:
@@ -46,10 +56,16 @@ class PetastormReader(AbstractReader):
 
     def _read(self) -> Iterator[Dict]:
         # `Todo`: Generalize this reader
+        options = {}
+        if self.ordered:
+            options = {'workers_count': 1, 'shuffle_row_groups': False}
         with make_reader(self.file_url,
                          shard_count=self.shard_count,
                          cur_shard=self.cur_shard,
-                         predicate=self.predicate) \
+                         predicate=self.predicate,
+                         schema_fields=self.schema_fields,
+                         rowgroup_selector=self.rowgroup_selector,
+                         **options) \
                 as reader:
             for row in reader:
                 yield row._asdict()
@@ -92,13 +92,12 @@ class EvaClient(asyncio.Protocol):
 
     def data_received(self, data):
 
-        response_chunk = data.decode()
         LoggingManager().log("[ " + str(self.id) + " ]" +
                              " Response from server: --|" +
-                             str(response_chunk) + "|--"
+                             str(len(data)) + " bytes|--"
                              )
 
-        self._response_chunks.append(response_chunk)
+        self._response_chunks.append(data)
 
     def send_message(self, message):
 
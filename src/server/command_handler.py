@@ -13,28 +13,61 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import asyncio
+import threading
 import pandas as pd
 
 from typing import Iterator, Optional
 
+from src.catalog.catalog_manager import CatalogManager
+from src.configuration.configuration_manager import ConfigurationManager
 from src.parser.parser import Parser
 from src.optimizer.statement_to_opr_convertor import StatementToPlanConvertor
 from src.optimizer.plan_generator import PlanGenerator
+from src.optimizer.plan_cache import PlanCache
+from src.parser.types import StatementType
+from src.executor.execution_metrics import ExecutionMetrics
 from src.executor.plan_executor import PlanExecutor
 from src.models.server.response import ResponseStatus, Response
 from src.models.storage.batch import Batch
+from src.server.protocol import MessageType, serialize_message
+from src.server.query_pool import QueryPool
 
 from src.utils.logging_manager import LoggingManager, LoggingLevel
 
 
-def execute_query(query) -> Iterator[Batch]:
+def execute_query(query, metrics: ExecutionMetrics = None) \
+        -> Iterator[Batch]:
     """
     Execute the query and return a result generator.
+    The metrics of the operators are collected into `metrics` if given.
+
+    Cached plans may be executed by several queries at once, the executors
+    keep the state of an execution.
     """
+    p_plan = PlanCache().get(query)
+    if p_plan is not None:
+        return PlanExecutor(p_plan, metrics).execute_plan()
+
+    # the plan is built for the catalog as of now, it is cached under this
+    # version even if the catalog changes while it is optimized
+    version = CatalogManager().version
     stmt = Parser().parse(query)[0]
     l_plan = StatementToPlanConvertor().visit(stmt)
     p_plan = PlanGenerator().build(l_plan)
-    return PlanExecutor(p_plan).execute_plan()
+    output = PlanExecutor(p_plan, metrics).execute_plan()
+    if stmt.stmt_type in (StatementType.SELECT, StatementType.EXPLAIN):
+        PlanCache().put(query, p_plan, version)
+        return output
+    # statements like LOAD and INSERT change the tables the cached plans
+    # were optimized for, including the plans cached while they run
+    return _invalidate_plans_after(output)
+
+
+def _invalidate_plans_after(output: Iterator[Batch]) -> Iterator[Batch]:
+    try:
+        yield from output
+    finally:
+        PlanCache().invalidate()
 
 
 def execute_query_fetch_all(query) -> Optional[Batch]:
@@ -47,33 +80,93 @@ def execute_query_fetch_all(query) -> Optional[Batch]:
         return Batch.concat(batch_list, copy=False)
 
 
-@asyncio.coroutine
-def handle_request(transport, request_message):
+def execute_request(request_message, send, cancelled: threading.Event):
     """
-        Reads a request from a client and processes it
+    Executes the query and streams the result through `send`.
+    Runs on a worker thread of the QueryPool.
 
-        If user inputs 'quit' stops the event loop
-        otherwise just echoes user input
-    """
-    LoggingManager().log('Receive request: --|' + str(request_message) + '|--')
+    Arguments:
+        request_message (str): query to be executed
+        send (Callable[[bytes], None]): writes a message to the client
+        cancelled (threading.Event): set once the client disconnected
 
+    Returns:
+        Response: final response sent to the client, carrying the metrics
+            of the executed operators
+    """
+    metrics = ExecutionMetrics()
     try:
-        output_batch = execute_query_fetch_all(request_message)
+        output = execute_query(request_message, metrics)
+        try:
+            # stream the batches as they leave the executor instead of
+            # collecting the whole result
+            for batch in output:
+                if cancelled.is_set():
+                    break
+                send(serialize_message(MessageType.BATCH, batch.to_bytes()))
+        finally:
+            output.close()
     except Exception as e:
         LoggingManager().log(e, LoggingLevel.WARNING)
         output_batch = Batch(pd.DataFrame([{'error': str(e)}]))
-        response = Response(status=ResponseStatus.FAIL, batch=output_batch)
+        response = Response(status=ResponseStatus.FAIL, batch=output_batch,
+                            metrics=metrics.to_dict())
     else:
-        response = Response(status=ResponseStatus.SUCCESS, batch=output_batch)
+        response = Response(status=ResponseStatus.SUCCESS, batch=None,
+                            metrics=metrics.to_dict())
 
-    responseData = response.to_json()
-    # Send data length, because response can be very large
-    data = (str(len(responseData)) + '|' + responseData).encode('ascii')
+    if metrics.root is not None and \
+            ConfigurationManager().get_value('executor', 'log_metrics'):
+        LoggingManager().log('Metrics of query --|' + str(request_message) +
+                             '|--\n' + str(metrics), LoggingLevel.INFO)
+
+    if cancelled.is_set():
+        LoggingManager().log('Query cancelled: --|' + str(request_message) +
+                             '|--', LoggingLevel.WARNING)
+        return response
+
+    responseData = response.to_bytes()
+    send(serialize_message(MessageType.RESPONSE, responseData))
 
     LoggingManager().log('Response to client: --|' +
                          str(response) + '|--\n' +
                          'Length: ' + str(len(responseData)))
 
+    return response
+
+
+async def _write(transport, data):
     transport.write(data)
 
+
+@asyncio.coroutine
+def handle_request(transport, request_message, cancelled=None,
+                   writable=None):
+    """
+        Reads a request from a client and processes it
+
+        The query runs on the QueryPool so that the event loop keeps
+        serving the other connections, its result is streamed back
+        through the transport. Setting `cancelled` stops the execution.
+        The query waits while `writable` is cleared, i.e. while the
+        protocol is paused because the client does not read fast enough.
+    """
+    LoggingManager().log('Receive request: --|' + str(request_message) + '|--')
+
+    loop = asyncio.get_event_loop()
+    if cancelled is None:
+        cancelled = threading.Event()
+    if writable is None:
+        writable = threading.Event()
+        writable.set()
+
+    def send(data):
+        # the transport pauses the protocol during the write once its
+        # buffer is above the high-water mark, wait until it drained
+        asyncio.run_coroutine_threadsafe(_write(transport, data),
+                                         loop).result()
+        writable.wait()
+
+    response = yield from QueryPool().run(loop, execute_request,
+                                          request_message, send, cancelled)
     return response
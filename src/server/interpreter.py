@@ -15,6 +15,8 @@
 
 from cmd import Cmd
 from src.models.server.response import Response
+from src.models.storage.batch import Batch
+from src.server.protocol import MessageReader, MessageType
 
 
 class EvaCommandInterpreter(Cmd):
@@ -49,24 +51,25 @@ class EvaCommandInterpreter(Cmd):
 
         self._protocol._response_chunks = []
         self._protocol.send_message(query)
-        while len(self._protocol._response_chunks) == 0:
-            _ = 1
-        segs = self._protocol._response_chunks[0].split('|', 1)
-        result_length = int(segs[0])
-        self._server_result = segs[1]
-        next_chunk = 1
-        while len(self._server_result) < result_length:
-            # print('Total length: %d, Received: %d' %
-            #      (result_length, len(self._server_result)), end='\r')
+
+        # batches are printed as soon as they are received, the final
+        # response carries the status of the query
+        reader = MessageReader()
+        response = None
+        next_chunk = 0
+        while response is None:
             # next chunk is not avaiable yet
             while len(self._protocol._response_chunks) <= next_chunk:
                 _ = 1
-            self._server_result += self._protocol._response_chunks[next_chunk]
+            chunk = self._protocol._response_chunks[next_chunk]
             next_chunk += 1
+            for message_type, payload in reader.feed(chunk):
+                if message_type == MessageType.BATCH:
+                    print(Batch.from_bytes(payload))
+                else:
+                    response = Response.from_bytes(payload)
 
-        # print('Total length: %d, Received: %d' %
-        #      (result_length, len(self._server_result)))
-        response = Response.from_json(self._server_result)
+        self._server_result = response
         print(response)
         return False
 
@@ -0,0 +1,70 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import struct
+
+from enum import Enum
+from typing import List, Tuple
+
+
+class MessageType(int, Enum):
+    # one batch of the result, sent as soon as the executor yields it
+    BATCH = 1
+    # final message of a query carrying the status and metrics
+    RESPONSE = 2
+
+
+# message type (1 byte) followed by the payload length (8 bytes)
+_HEADER = struct.Struct('!BQ')
+
+
+def serialize_message(message_type: MessageType, payload: bytes) -> bytes:
+    """
+    Frames the payload with a binary header so that the receiver can
+    split the byte stream back into messages.
+    """
+    return _HEADER.pack(message_type, len(payload)) + payload
+
+
+class MessageReader(object):
+    """
+    Incrementally splits the received byte stream into messages.
+    Chunks can end anywhere, incomplete messages are buffered until the
+    rest of their payload arrives.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[Tuple[MessageType, bytes]]:
+        """
+        Arguments:
+            data (bytes): chunk received from the transport
+
+        Returns:
+            List[Tuple[MessageType, bytes]]: messages completed by the chunk
+        """
+        self._buffer.extend(data)
+        messages = []
+        offset = 0
+        while len(self._buffer) - offset >= _HEADER.size:
+            message_type, length = _HEADER.unpack_from(self._buffer, offset)
+            end = offset + _HEADER.size + length
+            if len(self._buffer) < end:
+                break
+            messages.append((MessageType(message_type),
+                             bytes(self._buffer[offset + _HEADER.size:end])))
+            offset = end
+        del self._buffer[:offset]
+        return messages
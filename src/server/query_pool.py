@@ -0,0 +1,89 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.configuration.configuration_manager import ConfigurationManager
+
+# fallbacks if server.max_workers / server.max_pending_queries are not
+# configured
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_MAX_PENDING_QUERIES = 32
+
+
+class QueryPool(object):
+    """
+    Bounded pool of worker threads running the queries off the event loop.
+
+    At most `server.max_workers` queries run concurrently. Admission control
+    rejects new queries once `server.max_pending_queries` queries are either
+    running or waiting for a worker.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(QueryPool, cls).__new__(cls)
+            cls._instance._executor = None
+            cls._instance._pending = 0
+            cls._instance._lock = threading.Lock()
+        return cls._instance
+
+    def __init__(self):
+        config = ConfigurationManager()
+        self._max_workers = config.get_value('server', 'max_workers') \
+            or DEFAULT_MAX_WORKERS
+        self._max_pending = config.get_value('server',
+                                             'max_pending_queries') \
+            or DEFAULT_MAX_PENDING_QUERIES
+
+    @property
+    def pending(self) -> int:
+        """number of admitted queries which have not finished yet"""
+        return self._pending
+
+    def admit(self) -> bool:
+        """
+        Reserves a slot for a new query.
+
+        Returns:
+            True if the query got admitted else False. Admitted queries
+            have to be released once they finish.
+        """
+        with self._lock:
+            if self._pending >= self._max_pending:
+                return False
+            self._pending += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self._pending -= 1
+
+    def run(self, loop, func, *args) -> asyncio.Future:
+        """
+        Runs func(*args) on one of the worker threads.
+
+        Returns:
+            asyncio.Future: future of the result of the function
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix='eva_query')
+        return loop.run_in_executor(self._executor, func, *args)
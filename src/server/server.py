@@ -16,6 +16,9 @@
 import asyncio
 import string
 import os
+import threading
+
+import pandas as pd
 
 from signal import signal
 from signal import SIGINT, SIGTERM, SIGHUP, SIGUSR1
@@ -26,6 +29,10 @@ from src.server.networking_utils import realtime_server_status,\
 from src.utils.logging_manager import LoggingManager, LoggingLevel
 
 from src.server.command_handler import handle_request
+from src.server.protocol import MessageType, serialize_message
+from src.server.query_pool import QueryPool
+from src.models.server.response import Response, ResponseStatus
+from src.models.storage.batch import Batch
 
 
 class EvaServer(asyncio.Protocol):
@@ -33,9 +40,11 @@ class EvaServer(asyncio.Protocol):
     """
     Receives messages and offloads them to another task for processing them.
 
-    - It never creates any asynchronous tasks itself
-    - It doesn't have to know anything about any event loops
     - It tracks its progress via the class-level counters
+    - Requests of a connection are executed one after another, in the
+      order they were received
+    - Pending requests are cancelled when the connection is lost
+    - Running requests wait while writing is paused by the transport
     """
 
     # These counters are used for realtime server monitoring
@@ -46,6 +55,11 @@ class EvaServer(asyncio.Protocol):
     def __init__(self, socket_timeout):
         self.transport = None
         self._socket_timeout = socket_timeout
+        # last request of this connection, the next one waits for it
+        self._last_request = None
+        self._cancelled = threading.Event()
+        self._writable = threading.Event()
+        self._writable.set()
 
     def connection_made(self, transport):
         self.transport = transport
@@ -63,6 +77,10 @@ class EvaServer(asyncio.Protocol):
         EvaServer.__connections__ += 1
 
     def connection_lost(self, exc):
+        # stop the running and the queued requests of this connection
+        self._cancelled.set()
+        self._writable.set()
+
         # free sockets early, free sockets often
         if exc:
             EvaServer.__errors__ += 1
@@ -71,6 +89,12 @@ class EvaServer(asyncio.Protocol):
             self.transport.close()
         EvaServer.__connections__ -= 1
 
+    def pause_writing(self):
+        self._writable.clear()
+
+    def resume_writing(self):
+        self._writable.set()
+
     def data_received(self, data):
         request_message = data.decode()
         LoggingManager().log('Request from client: --|' +
@@ -82,9 +106,28 @@ class EvaServer(asyncio.Protocol):
             return self.transport.close()
         else:
             LoggingManager().log('Handle request')
-            asyncio.create_task(
-                handle_request(self.transport, request_message)
-            )
+            loop = asyncio.get_running_loop()
+            if not QueryPool().admit():
+                LoggingManager().log('Reject request, too many pending '
+                                     'queries', LoggingLevel.WARNING)
+                response = Response(
+                    status=ResponseStatus.FAIL,
+                    batch=Batch(pd.DataFrame([{'error': 'Server is busy'}])))
+                self.transport.write(serialize_message(
+                    MessageType.RESPONSE, response.to_bytes()))
+                return
+            self._last_request = loop.create_task(
+                self._handle_request(request_message, self._last_request))
+
+    async def _handle_request(self, request_message, previous_request):
+        try:
+            if previous_request is not None:
+                await asyncio.wait([previous_request])
+            if not self._cancelled.is_set():
+                await handle_request(self.transport, request_message,
+                                     self._cancelled, self._writable)
+        finally:
+            QueryPool().release()
 
 
 def start_server(host: string,
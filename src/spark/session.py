@@ -13,10 +13,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-
-from pyspark.sql import SparkSession
-from pyspark.conf import SparkConf
-
 from src.configuration.configuration_manager import ConfigurationManager
 from src.utils.logging_manager import LoggingManager
 
@@ -24,6 +20,8 @@ from src.utils.logging_manager import LoggingManager
 class Session(object):
     """
     Wrapper around Spark Session
+
+    The spark session is started on demand, when it is first asked for.
     """
 
     _instance = None
@@ -36,8 +34,6 @@ class Session(object):
 
     def __init__(self):
         self._config = ConfigurationManager()
-        name = self._config.get_value('core', 'application')
-        self.init_spark_session(name)
 
     def init_spark_session(self, application_name, spark_master=None):
         """Setup a spark session.
@@ -49,6 +45,9 @@ class Session(object):
 
         :return: spark_session: A spark session
         """
+        # pyspark takes long to import, it is only loaded with the session
+        from pyspark.sql import SparkSession
+        from pyspark.conf import SparkConf
 
         eva_spark_conf = SparkConf()
         pyspark_config = self._config.get_value('pyspark', 'property') 
@@ -74,13 +73,18 @@ class Session(object):
         spark_context.setLogLevel(log4j_level)
 
     def get_session(self):
+        if self._session is None:
+            name = self._config.get_value('core', 'application')
+            self.init_spark_session(name)
         return self._session
 
     def get_context(self):
-        return self._session.sparkContext
+        return self.get_session().sparkContext
 
     def stop(self):
-        self._session.stop()
+        if self._session is not None:
+            self._session.stop()
+            self._session = None
 
     def __del__(self):
-        self._session.stop()
+        self.stop()
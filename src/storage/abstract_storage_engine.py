@@ -55,6 +55,19 @@ class AbstractStorageEngine(metaclass=ABCMeta):
             rows : rows data to be written
         """
 
+    def bulk_write(self, table, batches):
+        """Interface responsible for inserting a stream of batches into the
+        required table, e.g. while loading a video. Engines can override it
+        to write the whole stream in a single pass; by default every batch
+        is written separately.
+
+        Attributes:
+            table: storage unit to be written
+            batches: iterator of batches to be written
+        """
+        for batch in batches:
+            self.write(table, batch)
+
     @abstractmethod
     def _close(self, table):
         """Internal function responsible for closing table to free resouces.
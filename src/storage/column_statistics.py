@@ -0,0 +1,142 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Dict, List, Set, Tuple
+
+from petastorm.selectors import RowGroupSelectorBase
+from pyarrow.parquet import RowGroupMetaData
+
+# name of the row group index holding the column statistics of a dataset
+STATISTICS_INDEX = 'eva_column_statistics'
+
+
+class ColumnStatistics(object):
+    """
+    Min/max values of the scalar columns of every row group of a dataset.
+
+    It is stored as a petastorm row group index in the dataset metadata,
+    with the row groups numbered in the order petastorm loads them (files
+    sorted by path, then the row groups of each file). Petastorm only
+    unpickles builtin types from the metadata, hence the index itself is
+    a plain dict (see `to_index` and `from_index`).
+
+    Arguments:
+        columns (List[str]): names of the columns to keep statistics of
+    """
+
+    def __init__(self, columns: List[str]):
+        self._ranges = {column: [] for column in columns}
+        self._num_row_groups = 0
+
+    def to_index(self) -> Dict:
+        return {'num_row_groups': self._num_row_groups,
+                'ranges': self._ranges}
+
+    @classmethod
+    def from_index(cls, index: Dict) -> 'ColumnStatistics':
+        statistics = cls([])
+        statistics._num_row_groups = index['num_row_groups']
+        statistics._ranges = index['ranges']
+        return statistics
+
+    @property
+    def num_row_groups(self) -> int:
+        return self._num_row_groups
+
+    def ranges(self, column: str) -> List[Tuple]:
+        """
+        Returns:
+            List[Tuple]: (min, max) of the column for each row group, None
+                if the row group has no statistics for it
+        """
+        return self._ranges.get(column, [None] * self._num_row_groups)
+
+    def add_row_group(self, row_group: RowGroupMetaData):
+        """
+        Appends the statistics parquet wrote in the footer for a row group.
+
+        Arguments:
+            row_group (RowGroupMetaData): metadata of the next row group
+        """
+        found = {}
+        for index in range(row_group.num_columns):
+            column = row_group.column(index)
+            stats = column.statistics
+            if column.path_in_schema in self._ranges and \
+                    stats is not None and stats.has_min_max:
+                found[column.path_in_schema] = (stats.min, stats.max)
+        for column, ranges in self._ranges.items():
+            ranges.append(found.get(column))
+        self._num_row_groups += 1
+
+    def insert(self, position: int, other: 'ColumnStatistics'):
+        """
+        Inserts the row groups of another dataset part, e.g. a new file.
+
+        Arguments:
+            position (int): index of the first inserted row group
+            other (ColumnStatistics): statistics of the inserted row groups
+        """
+        for column, ranges in self._ranges.items():
+            ranges[position:position] = other.ranges(column)
+        self._num_row_groups += other.num_row_groups
+
+    def select(self, column_ranges: Dict[str, Tuple]) -> Set[int]:
+        """
+        Finds the row groups that may contain rows within the ranges.
+
+        Arguments:
+            column_ranges (Dict[str, Tuple]): inclusive (low, high) bounds
+                per column, None for an unbounded side
+
+        Returns:
+            Set[int]: indexes of the row groups that can not be skipped
+        """
+        selected = set(range(self._num_row_groups))
+        for column, (low, high) in column_ranges.items():
+            for index, stats in enumerate(self.ranges(column)):
+                if stats is not None and \
+                        not _overlaps(stats[0], stats[1], low, high):
+                    selected.discard(index)
+        return selected
+
+
+class ColumnRangeSelector(RowGroupSelectorBase):
+    """
+    Petastorm row group selector that skips the row groups whose column
+    statistics do not overlap with the given ranges.
+
+    Arguments:
+        column_ranges (Dict[str, Tuple]): inclusive (low, high) bounds per
+            column, None for an unbounded side
+    """
+
+    def __init__(self, column_ranges: Dict[str, Tuple]):
+        self._column_ranges = column_ranges
+
+    def get_index_names(self):
+        return [STATISTICS_INDEX]
+
+    def select_row_groups(self, index_dict):
+        statistics = ColumnStatistics.from_index(index_dict[STATISTICS_INDEX])
+        return statistics.select(self._column_ranges)
+
+
+def _overlaps(minimum, maximum, low, high) -> bool:
+    try:
+        return (low is None or maximum >= low) and \
+            (high is None or minimum <= high)
+    except TypeError:
+        # bound is not comparable with the column values, keep the row group
+        return True
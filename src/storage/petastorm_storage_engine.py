@@ -12,52 +12,50 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Iterator, List
+import json
+import os
+import pickle
+import shutil
+from typing import Dict, Iterator, List, Tuple
 from pathlib import Path
 
-from src.spark.session import Session
+import pyarrow.parquet as pq
+
 from src.catalog.models.df_metadata import DataFrameMetadata
-from petastorm.etl.dataset_metadata import materialize_dataset
 from src.storage.abstract_storage_engine import AbstractStorageEngine
+from src.storage.column_statistics import ColumnRangeSelector, \
+    STATISTICS_INDEX
+from src.storage.petastorm_writer import PetastormWriter
 from src.readers.petastorm_reader import PetastormReader
 from src.models.storage.batch import Batch
 
-from petastorm.unischema import dict_to_spark_row
-from petastorm.predicates import in_lambda
+from petastorm.etl.dataset_metadata import ROW_GROUPS_PER_FILE_KEY
+from petastorm.etl.rowgroup_indexing import ROWGROUPS_INDEX_KEY
+from petastorm.predicates import in_lambda, in_reduce
 
 
 class PetastormStorageEngine(AbstractStorageEngine):
 
-    def __init__(self):
-        """
-        Maintain a long live spark session and context.
-        """
-        self._spark = Session()
-        self.spark_session = self._spark.get_session()
-        self.spark_context = self._spark.get_context()
-
     def _spark_url(self, table: DataFrameMetadata) -> str:
         """
         Generate a spark/petastorm url given a table
         """
         return Path(table.file_url).resolve().as_uri()
 
-    def create(self, table: DataFrameMetadata):
+    def _path(self, table: DataFrameMetadata) -> str:
         """
-        Create an empty dataframe in petastorm.
+        Local directory of the petastorm dataset of a table
         """
-        empty_rdd = self.spark_context.emptyRDD()
-
-        with materialize_dataset(self.spark_session,
-                                 self._spark_url(table),
-                                 table.schema.petastorm_schema):
+        return str(Path(table.file_url).resolve())
 
-            self.spark_session.createDataFrame(empty_rdd,
-                                               table.schema.pyspark_schema) \
-                .coalesce(1) \
-                .write \
-                .mode('overwrite') \
-                .parquet(self._spark_url(table))
+    def create(self, table: DataFrameMetadata):
+        """
+        Create an empty dataframe in petastorm, only its metadata is
+        written.
+        """
+        shutil.rmtree(self._path(table), ignore_errors=True)
+        with self._open(table):
+            pass
 
     def write(self, table: DataFrameMetadata, rows: Batch):
         """
@@ -73,25 +71,27 @@ class PetastormStorageEngine(AbstractStorageEngine):
         # ToDo
         # Throw an error if the row schema doesn't match the table schema
 
-        with materialize_dataset(self.spark_session,
-                                 self._spark_url(table),
-                                 table.schema.petastorm_schema):
-
-            records = rows.frames
-            columns = records.keys()
-            rows_rdd = self.spark_context.parallelize(records.values) \
-                .map(lambda x: dict(zip(columns, x))) \
-                .map(lambda x: dict_to_spark_row(table.schema.petastorm_schema,
-                                                 x))
-            self.spark_session.createDataFrame(rows_rdd,
-                                               table.schema.pyspark_schema) \
-                .coalesce(1) \
-                .write \
-                .mode('append') \
-                .parquet(self._spark_url(table))
+        self.bulk_write(table, [rows])
+
+    def bulk_write(self, table: DataFrameMetadata, batches: Iterator[Batch]):
+        """
+        Stream the batches into a single parquet file and commit the
+        petastorm metadata once all of them are written.
+
+        Arguments:
+            table: table metadata object to write into
+            batches: iterator of batches to be persisted in the storage.
+        """
+        with self._open(table) as writer:
+            for batch in batches:
+                writer.write(batch)
 
     def read(self, table: DataFrameMetadata, columns: List[
-            str] = None, predicate_func=None) -> Iterator[Batch]:
+            str] = None, predicate_func=None,
+            skip_frames: int = 0, limit: int = None,
+            schema_fields: List[str] = None,
+            column_ranges: Dict[str, Tuple] = None,
+            total_shards: int = 0, curr_shard: int = 0) -> Iterator[Batch]:
         """
         Reads the table and return a batch iterator for the
         tuples that passes the predicate func.
@@ -101,6 +101,19 @@ class PetastormStorageEngine(AbstractStorageEngine):
             columns List[str]: A list of column names to be
                 considered in predicate_func
             predicate_func: customized predicate function returns bool
+            skip_frames (int): only every skip_frames-th row (by position)
+                is returned, the table is then read in storage order and
+                neither sharded nor skipped by column_ranges
+            limit (int): maximum number of rows returned
+            schema_fields List[str]: names of the columns to be decoded,
+                all the columns if None
+            column_ranges Dict[str, Tuple]: inclusive (low, high) bounds
+                per column, row groups whose min/max statistics fall outside
+                of them are skipped. Rows are not filtered individually.
+            total_shards (int): number of shards the table is split into,
+                the table is not sharded if it is not greater than 1
+            curr_shard (int): shard to be read, its row groups are read in
+                storage order
 
         Return:
             Iterator of Batch read.
@@ -109,18 +122,103 @@ class PetastormStorageEngine(AbstractStorageEngine):
         if predicate_func and columns:
             predicate = in_lambda(columns, predicate_func)
 
-        # ToDo: Handle the sharding logic. We might have to maintain a
-        # context for deciding which shard to read
+        sampled = skip_frames > 1
+        if sampled:
+            # the rows are sampled by their position in the table, which is
+            # only known if all the row groups are read one after the other
+            column_ranges = None
+            if total_shards > 1:
+                if curr_shard > 0:
+                    return
+                total_shards = 0
+
+        if sampled and table.identifier_column in \
+                table.schema.petastorm_schema.fields:
+            # sampling in a predicate lets petastorm evaluate it on the id
+            # column alone and skip decoding the other columns of dropped
+            # rows
+            sample = in_lambda([table.identifier_column],
+                               _Sampler(skip_frames))
+            predicate = sample if predicate is None else \
+                in_reduce([predicate, sample], all)
+            skip_frames = 0
+
+        fields = None
+        if schema_fields:
+            # petastorm reads the predicate columns before the others, so
+            # they have to be part of the requested fields
+            if predicate is not None:
+                schema_fields = list(schema_fields) + sorted(
+                    predicate.get_fields() - set(schema_fields))
+            petastorm_schema = table.schema.petastorm_schema
+            fields = [petastorm_schema.fields[name]
+                      for name in schema_fields
+                      if name in petastorm_schema.fields] or None
+
+        metadata = self._metadata(table)
+        row_groups = json.loads(metadata.get(ROW_GROUPS_PER_FILE_KEY, 'null'))
+        if row_groups is not None and not any(row_groups.values()):
+            # nothing was written into the table yet
+            return
+
+        selector = None
+        if column_ranges and ROWGROUPS_INDEX_KEY in metadata and \
+                STATISTICS_INDEX in pickle.loads(
+                    metadata[ROWGROUPS_INDEX_KEY]):
+            selector = ColumnRangeSelector(column_ranges)
+
+        shard_count = None
+        if total_shards > 1:
+            # petastorm shards by row group, there can not be more shards
+            # than row groups
+            shard_count = min(total_shards,
+                              sum((row_groups or {}).values()))
+            if curr_shard >= shard_count:
+                return
+
         petastorm_reader = PetastormReader(
-            self._spark_url(table), predicate=predicate)
-        for batch in petastorm_reader.read():
-            yield batch
+            self._spark_url(table), predicate=predicate,
+            skip_frames=skip_frames, limit=limit, schema_fields=fields,
+            rowgroup_selector=selector, shard_count=shard_count,
+            cur_shard=curr_shard if shard_count else None,
+            ordered=shard_count is not None or sampled)
+        # closing this generator shuts down the petastorm worker pool
+        yield from petastorm_reader.read()
+
+    def _metadata(self, table: DataFrameMetadata) -> Dict[bytes, bytes]:
+        """
+        Petastorm metadata committed with the dataset of a table. The column
+        statistics are missing in datasets written by older versions.
+        """
+        path = os.path.join(self._path(table), '_common_metadata')
+        try:
+            return pq.read_metadata(path).metadata or {}
+        except (OSError, IOError):
+            return {}
 
-    def _open(self, table):
-        pass
+    def _open(self, table: DataFrameMetadata) -> PetastormWriter:
+        return PetastormWriter(self._path(table),
+                               table.schema.petastorm_schema)
 
     def _close(self, table):
         pass
 
     def _read_init(self, table):
         pass
+
+
+class _Sampler(object):
+    """
+    Picklable predicate keeping every skip_frames-th row it is evaluated on,
+    so that it also works with process based reader pools. Petastorm
+    evaluates it on every row of a row group in order, the row groups have
+    to be read in storage order for the count to be the row position.
+    """
+
+    def __init__(self, skip_frames: int):
+        self._skip_frames = skip_frames
+        self._position = -1
+
+    def __call__(self, identifier) -> bool:
+        self._position += 1
+        return self._position % self._skip_frames == 0
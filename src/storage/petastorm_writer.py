@@ -0,0 +1,234 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import os
+import pickle
+import uuid
+from typing import Dict, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from petastorm.etl.dataset_metadata import ROW_GROUPS_PER_FILE_KEY
+from petastorm.etl.dataset_metadata import UNISCHEMA_KEY
+from petastorm.etl.rowgroup_indexing import ROWGROUPS_INDEX_KEY
+from petastorm.unischema import Unischema
+
+from src.configuration.configuration_manager import ConfigurationManager
+from src.models.storage.batch import Batch
+from src.storage.column_statistics import ColumnStatistics, \
+    STATISTICS_INDEX
+
+# fallback row group size (in MB) if storage.row_group_size is not configured
+DEFAULT_ROW_GROUP_SIZE = 64
+
+# arrow types of the columns spark would have written for each codec type
+_ARROW_TYPES = {
+    'BinaryType': pa.binary(),
+    'BooleanType': pa.bool_(),
+    'ByteType': pa.int8(),
+    'ShortType': pa.int16(),
+    'IntegerType': pa.int32(),
+    'LongType': pa.int64(),
+    'FloatType': pa.float32(),
+    'DoubleType': pa.float64(),
+    'StringType': pa.string()
+}
+
+
+class PetastormWriter(object):
+    """
+    Streams batches into a petastorm dataset without going through spark.
+
+    Rows are encoded with the codecs of the unischema, buffered until they
+    fill a row group of `storage.row_group_size` MB and appended to a single
+    parquet file, which is only created once the first row group is written.
+    The petastorm metadata (unischema and row groups per file) is committed
+    once when the writer is closed, which makes the new file visible to the
+    readers. The min/max statistics parquet keeps for the scalar columns of
+    every row group are committed along with it, so that readers can skip
+    row groups without decoding them. The metadata of the files committed
+    before is kept, only the footer of the new file is read.
+
+    Arguments:
+        dataset_path (str): local directory of the dataset
+        schema (Unischema): petastorm schema of the dataset
+        row_group_size (int): row group size in MB
+    """
+
+    def __init__(self, dataset_path: str, schema: Unischema,
+                 row_group_size: int = None):
+        if row_group_size is None:
+            row_group_size = ConfigurationManager().get_value(
+                'storage', 'row_group_size') or DEFAULT_ROW_GROUP_SIZE
+        self._path = dataset_path
+        self._schema = schema
+        self._row_group_size = row_group_size * 1024 * 1024
+        self._arrow_schema = pa.schema(
+            [pa.field(field.name,
+                      _ARROW_TYPES[type(field.codec.spark_dtype()).__name__],
+                      field.nullable)
+             for field in schema.fields.values()])
+        self._file_path = os.path.join(
+            dataset_path, 'part-{}.parquet'.format(uuid.uuid4().hex))
+        self._writer = None
+        self._buffer = []
+        self._buffered_bytes = 0
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def open(self):
+        os.makedirs(self._path, exist_ok=True)
+
+    def write(self, batch: Batch):
+        """
+        Buffers the rows of the batch, writing out a row group once
+        the buffer is full.
+
+        Arguments:
+            batch (Batch): rows to be persisted
+        """
+        if batch.empty():
+            return
+        table = self._encode(batch)
+        self._buffer.append(table)
+        self._buffered_bytes += table.nbytes
+        if self._buffered_bytes >= self._row_group_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered rows as a single row group.
+        """
+        if not self._buffer:
+            return
+        table = pa.concat_tables(self._buffer)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self._file_path,
+                                            self._arrow_schema)
+        self._writer.write_table(table, row_group_size=table.num_rows)
+        self._buffer = []
+        self._buffered_bytes = 0
+
+    def close(self):
+        """
+        Flushes the remaining rows and commits the dataset metadata.
+        """
+        self.flush()
+        written = self._writer is not None
+        if written:
+            self._writer.close()
+            self._writer = None
+        if written or not os.path.exists(self._metadata_path()):
+            self._commit_metadata(written)
+
+    def abort(self):
+        """
+        Drops the buffered rows and the partially written file.
+        """
+        self._buffer = []
+        self._buffered_bytes = 0
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if os.path.exists(self._file_path):
+            os.remove(self._file_path)
+
+    def _encode(self, batch: Batch) -> pa.Table:
+        frames = batch.frames
+        columns = []
+        for field in self._schema.fields.values():
+            if field.name in frames:
+                values = frames[field.name]
+            else:
+                values = [None] * len(frames)
+            columns.append(pa.array(
+                [None if value is None else field.codec.encode(field, value)
+                 for value in values],
+                type=self._arrow_schema.field(field.name).type))
+        return pa.Table.from_arrays(columns, schema=self._arrow_schema)
+
+    def _metadata_path(self) -> str:
+        return os.path.join(self._path, '_common_metadata')
+
+    def _new_statistics(self) -> ColumnStatistics:
+        return ColumnStatistics([field.name for field in self._arrow_schema
+                                 if field.type != pa.binary()])
+
+    def _file_statistics(self, file_metadata: pq.FileMetaData) \
+            -> ColumnStatistics:
+        statistics = self._new_statistics()
+        for index in range(file_metadata.num_row_groups):
+            statistics.add_row_group(file_metadata.row_group(index))
+        return statistics
+
+    def _committed_metadata(self) -> Tuple[Dict[str, int],
+                                           ColumnStatistics]:
+        """
+        Row groups per file and column statistics of the committed files.
+        They are rebuilt from the file footers for datasets written without
+        column statistics.
+        """
+        try:
+            metadata = pq.read_metadata(self._metadata_path()).metadata or {}
+        except (OSError, IOError):
+            metadata = {}
+        if ROW_GROUPS_PER_FILE_KEY in metadata and \
+                ROWGROUPS_INDEX_KEY in metadata:
+            index = pickle.loads(metadata[ROWGROUPS_INDEX_KEY])
+            if STATISTICS_INDEX in index:
+                return (json.loads(metadata[ROW_GROUPS_PER_FILE_KEY]),
+                        ColumnStatistics.from_index(index[STATISTICS_INDEX]))
+
+        row_groups = {}
+        statistics = self._new_statistics()
+        for file_name in sorted(os.listdir(self._path)):
+            file_path = os.path.join(self._path, file_name)
+            if file_name.endswith('.parquet') and \
+                    file_path != self._file_path:
+                file_statistics = self._file_statistics(
+                    pq.read_metadata(file_path))
+                row_groups[file_name] = file_statistics.num_row_groups
+                statistics.insert(statistics.num_row_groups,
+                                  file_statistics)
+        return row_groups, statistics
+
+    def _commit_metadata(self, written: bool):
+        row_groups, statistics = self._committed_metadata()
+        if written:
+            file_name = os.path.basename(self._file_path)
+            file_statistics = self._file_statistics(
+                pq.read_metadata(self._file_path))
+            # the row groups are numbered in the order of the file names
+            position = sum(count for name, count in row_groups.items()
+                           if name < file_name)
+            statistics.insert(position, file_statistics)
+            row_groups[file_name] = file_statistics.num_row_groups
+
+        metadata = {
+            UNISCHEMA_KEY: pickle.dumps(self._schema),
+            ROW_GROUPS_PER_FILE_KEY: json.dumps(row_groups),
+            ROWGROUPS_INDEX_KEY: pickle.dumps(
+                {STATISTICS_INDEX: statistics.to_index()})
+        }
+        pq.write_metadata(self._arrow_schema.with_metadata(metadata),
+                          self._metadata_path())
@@ -1,6 +1,29 @@
 from src.configuration.configuration_manager import ConfigurationManager
+from src.utils.fork_utils import ForkSafeLock
 from src.utils.generic_utils import str_to_class
 
-StorageEngine = str_to_class(
-    ConfigurationManager().get_value(
-        "storage", "engine"))()
+
+class _LazyStorageEngine(object):
+    """
+    Proxy of the configured storage engine. The engine, and with it the
+    storage libraries (e.g. petastorm), is only imported and created once
+    it is used.
+    """
+
+    def __init__(self):
+        self._engine = None
+        self._lock = ForkSafeLock()
+
+    def _get_engine(self):
+        with self._lock:
+            if self._engine is None:
+                self._engine = str_to_class(
+                    ConfigurationManager().get_value(
+                        "storage", "engine"))()
+        return self._engine
+
+    def __getattr__(self, name):
+        return getattr(self._get_engine(), name)
+
+
+StorageEngine = _LazyStorageEngine()
@@ -14,6 +14,7 @@
 # limitations under the License.
 from typing import List
 
+import numpy as np
 import pandas as pd
 import torchvision
 
@@ -88,7 +89,7 @@ class FastRCNNObjectDetector(PytorchAbstractUDF):
 
         """
         predictions = self.model(frames)
-        outcome = pd.DataFrame()
+        outcome = []
         for prediction in predictions:
             pred_class = [str(self.labels[i]) for i in
                           list(self.as_numpy(prediction['labels']))]
@@ -96,18 +97,15 @@ class FastRCNNObjectDetector(PytorchAbstractUDF):
                            [i[2], i[3]]]
                           for i in
                           list(self.as_numpy(prediction['boxes']))]
-            pred_score = list(self.as_numpy(prediction['scores']))
-            pred_t = \
-                [pred_score.index(x) for x in pred_score if
-                 x > self.threshold][-1]
-            pred_boxes = list(pred_boxes[:pred_t + 1])
-            pred_class = list(pred_class[:pred_t + 1])
-            pred_score = list(pred_score[:pred_t + 1])
-            outcome = outcome.append(
+            scores = self.as_numpy(prediction['scores'])
+            # the scores are sorted, keep the detections up to the last
+            # one above the threshold
+            above = np.flatnonzero(scores > self.threshold)
+            pred_t = above[-1] + 1 if len(above) else 0
+            outcome.append(
                 {
-                    "label": pred_class,
-                    "pred_score": pred_score,
-                    "pred_boxes": pred_boxes
-                },
-                ignore_index=True)
-        return outcome
+                    "label": pred_class[:pred_t],
+                    "pred_score": list(scores[:pred_t]),
+                    "pred_boxes": pred_boxes[:pred_t]
+                })
+        return pd.DataFrame(outcome)
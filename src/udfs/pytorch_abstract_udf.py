@@ -13,12 +13,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import inspect
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Tuple
 
 import numpy as np
 import pandas as pd
 import torch
+import torch.nn.functional as F
 from PIL import Image
 from torch import nn, Tensor
 from torchvision.transforms import Compose, transforms
@@ -27,6 +29,9 @@ from src.udfs.abstract_udfs import AbstractClassifierUDF
 from src.udfs.gpu_compatible import GPUCompatible
 from src.configuration.configuration_manager import ConfigurationManager
 
+# torch < 1.11 can not antialias bilinear interpolation
+_ANTIALIAS = 'antialias' in inspect.signature(F.interpolate).parameters
+
 
 class PytorchAbstractUDF(AbstractClassifierUDF, nn.Module, GPUCompatible, ABC):
     """
@@ -41,19 +46,57 @@ class PytorchAbstractUDF(AbstractClassifierUDF, nn.Module, GPUCompatible, ABC):
     def get_device(self):
         return next(self.parameters()).device
 
+    @property
+    def input_size(self) -> Tuple[int, int]:
+        """
+        (height, width) the frames are resized to before the prediction,
+        None to keep the size of the frames
+        """
+        return None
+
     @property
     def transforms(self) -> Compose:
-        return Compose([transforms.ToTensor()])
+        """
+        Transformations applied to each frame. Subclasses overriding them
+        are preprocessed frame by frame instead of in a single batch.
+        """
+        steps = [transforms.ToTensor()]
+        if self.input_size is not None:
+            steps.insert(0, transforms.Resize(list(self.input_size)))
+        return Compose(steps)
 
     def transform(self, images: np.ndarray):
         # reverse the channels from opencv
         return self.transforms(Image.fromarray(images[:, :, ::-1]))\
             .unsqueeze(0)
 
+    def preprocess(self, frames: List[np.ndarray]) -> Tensor:
+        """
+        Converts the uint8 BGR frames of opencv into a float RGB tensor of
+        shape (N, C, H, W) with values in [0, 1], like `transforms` does for
+        a single frame. Frames of the same shape are converted by a few
+        tensor operations on the whole batch, after moving the compact uint8
+        data to the device.
+        Arguments:
+            frames (List[np.ndarray]): (H, W, C) frames
+        Returns:
+            Tensor: the preprocessed frames on the device of the model
+        """
+        device = self.get_device()
+        if type(self).transforms is not PytorchAbstractUDF.transforms or \
+                len({frame.shape for frame in frames}) != 1:
+            return torch.cat([self.transform(x) for x in frames]) \
+                .to(device)
+
+        tensor = torch.from_numpy(np.stack(frames)).to(device)
+        # NHWC to NCHW and BGR to RGB
+        tensor = tensor.permute(0, 3, 1, 2).flip(1).float().div_(255)
+        if self.input_size is not None:
+            tensor = _resize(tensor, self.input_size)
+        return tensor.contiguous()
+
     def forward(self, frames: List[np.ndarray]):
-        tens_batch = torch.cat([self.transform(x) for x in frames])\
-            .to(self.get_device())
-        return self.classify(tens_batch)
+        return self.classify(self.preprocess(frames))
 
     @abstractmethod 
     def _get_predictions(self, frames: Tensor) -> pd.DataFrame:
@@ -79,12 +122,11 @@ class PytorchAbstractUDF(AbstractClassifierUDF, nn.Module, GPUCompatible, ABC):
             .get_value('executor', 'gpu_batch_size')
 
         if gpu_batch_size:
-            chunks = torch.split(frames, gpu_batch_size)
-            outcome = pd.DataFrame()
-            for tensor in chunks:
-                outcome = outcome.append(self._get_predictions(tensor),
-                                         ignore_index=True)
-            return outcome
+            outcomes = [self._get_predictions(tensor)
+                        for tensor in torch.split(frames, gpu_batch_size)]
+            if not outcomes:
+                return pd.DataFrame()
+            return pd.concat(outcomes, ignore_index=True)
         else:
             return self._get_predictions(frames)
 
@@ -113,3 +155,19 @@ class PytorchAbstractUDF(AbstractClassifierUDF, nn.Module, GPUCompatible, ABC):
         if isinstance(frames, pd.DataFrame):
             frames = frames.transpose().values.tolist()[0]
         return nn.Module.__call__(self, frames, **kwargs)
+
+
+def _resize(tensor: Tensor, size: Tuple[int, int]) -> Tensor:
+    """
+    Bilinear resize of a (N, C, H, W) tensor, antialiased like the PIL
+    resize of `transforms.Resize` so that downscaled frames do not alias.
+    Without antialiasing support in torch, frames shrunk in both dimensions
+    are averaged over the area each output pixel covers instead.
+    """
+    if _ANTIALIAS:
+        return F.interpolate(tensor, size=list(size), mode='bilinear',
+                             align_corners=False, antialias=True)
+    if size[0] <= tensor.shape[2] and size[1] <= tensor.shape[3]:
+        return F.interpolate(tensor, size=list(size), mode='area')
+    return F.interpolate(tensor, size=list(size), mode='bilinear',
+                         align_corners=False)
@@ -2,13 +2,12 @@ import itertools
 import numpy as np
 import pandas as pd
 
-from typing import List
+from typing import List, Tuple
 from math import sqrt
 
 import torch
 import torch.nn.functional as F
 from torch import Tensor
-from torchvision.transforms import Compose, transforms
 
 from src.models.catalog.frame_info import FrameInfo
 from src.models.catalog.properties import ColorSpace
@@ -69,11 +68,8 @@ class SSDObjectDetector(PytorchAbstractUDF):
         return FrameInfo(-1, -1, 3, ColorSpace.RGB)
 
     @property
-    def transforms(self) -> Compose:
-        return Compose([
-            transforms.Resize([300, 300]),
-            transforms.ToTensor(),
-        ])
+    def input_size(self) -> Tuple[int, int]:
+        return 300, 300
 
     def _get_predictions(self, frames: Tensor) -> pd.DataFrame:
         assert frames.size()[-1] == frames.size()[-2] == 300
@@ -85,7 +81,7 @@ class SSDObjectDetector(PytorchAbstractUDF):
         ploc, plabel = [val.float() for val in prediction]
         encoded = encoder.decode_batch(ploc, plabel, criteria=0.5)
 
-        res = pd.DataFrame()
+        res = []
 
         for batch in encoded:
             bboxes, classes, confidences = [
@@ -94,11 +90,11 @@ class SSDObjectDetector(PytorchAbstractUDF):
 
             # deal with empty detection
             if len(best.shape) == 0:
-                res = res.append({
+                res.append({
                     "label": [],
                     "pred_score": [],
                     "pred_boxes": []
-                }, ignore_index=True)
+                })
                 continue
 
             label, bbox, conf = [], [], []
@@ -110,13 +106,13 @@ class SSDObjectDetector(PytorchAbstractUDF):
                 bbox.append([x, y, w, h])
                 conf.append(confidences[idx])
 
-            res = res.append({
+            res.append({
                 "label": label,
                 "pred_score": conf,
                 "pred_boxes": bbox
-            }, ignore_index=True)
+            })
 
-        return res
+        return pd.DataFrame(res)
 
     def classify(self, frames: Tensor) -> pd.DataFrame:
         return self._get_predictions(frames)
@@ -0,0 +1,165 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import sys
+from collections import OrderedDict
+from pathlib import Path
+
+from src.configuration.configuration_manager import ConfigurationManager
+from src.utils.fork_utils import ForkSafeLock
+from src.utils.generic_utils import path_to_class
+from src.utils.logging_manager import LoggingManager, LoggingLevel
+
+# fallback budget (in MB) if executor.udf_registry_size is not configured
+DEFAULT_REGISTRY_SIZE = 4096
+
+
+class UdfRegistry(object):
+    """
+    Process wide registry of instantiated UDFs.
+
+    Creating a UDF object usually means importing its implementation file
+    and loading the model weights, which dominates the latency of short
+    queries. The registry keeps the instances alive across queries and hands
+    out the same object as long as the implementation file is unchanged.
+
+    Entries are keyed by (udf name, impl path, file mtime, constructor args)
+    and evicted in LRU order once the estimated memory footprint exceeds
+    `executor.udf_registry_size` (in MB).
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(UdfRegistry, cls).__new__(cls)
+            cls._instance._udfs = OrderedDict()
+            cls._instance._footprints = {}
+            cls._instance._lock = ForkSafeLock(reentrant=True)
+        return cls._instance
+
+    def __init__(self):
+        size = ConfigurationManager().get_value('executor',
+                                                'udf_registry_size')
+        if size is None:
+            size = DEFAULT_REGISTRY_SIZE
+        self._max_footprint = size * 1024 * 1024
+
+    @property
+    def footprint(self) -> int:
+        """estimated memory (in bytes) held by the registered UDFs"""
+        return sum(self._footprints.values())
+
+    def __len__(self):
+        return len(self._udfs)
+
+    def get(self, name: str, impl_path: str, *args, **kwargs):
+        """
+        Returns the UDF instance for the given implementation, creating it
+        on a miss.
+
+        Arguments:
+            name (str): name of the UDF class in the implementation file
+            impl_path (str): path of the implementation file
+            args, kwargs: passed to the UDF constructor
+
+        Returns:
+            the UDF instance
+        """
+        key = self._key(name, impl_path, *args, **kwargs)
+        with self._lock:
+            if key in self._udfs:
+                self._udfs.move_to_end(key)
+                return self._udfs[key]
+
+            # implementation file was modified, drop the stale instances
+            self._remove(lambda k: k[:2] == key[:2] and k[2] != key[2])
+
+            udf = path_to_class(impl_path, name)(*args, **kwargs)
+            self._udfs[key] = udf
+            self._footprints[key] = self._estimate_footprint(udf)
+            self._evict()
+            return udf
+
+    def warm_up(self, name: str, impl_path: str, *args, **kwargs) -> bool:
+        """
+        Loads the UDF into the registry ahead of the first query.
+        Failures are logged and reported instead of being raised.
+
+        Returns:
+            True if the UDF got loaded else False
+        """
+        try:
+            self.get(name, impl_path, *args, **kwargs)
+        except Exception as e:
+            LoggingManager().log(
+                'Failed to warm up UDF {} from {}: {}'.format(
+                    name, impl_path, e), LoggingLevel.WARNING)
+            return False
+        return True
+
+    def invalidate(self, name: str):
+        """
+        Removes all the instances of the UDF from the registry.
+
+        Arguments:
+            name (str): name of the UDF to be removed
+        """
+        with self._lock:
+            self._remove(lambda k: k[0] == name)
+
+    def reset(self):
+        """
+        Removes all the UDF instances from the registry.
+        """
+        with self._lock:
+            self._udfs.clear()
+            self._footprints.clear()
+
+    def _key(self, name: str, impl_path: str, *args, **kwargs):
+        abs_path = str(Path(impl_path).resolve())
+        try:
+            mtime = os.path.getmtime(abs_path)
+        except OSError:
+            mtime = None
+        return (name, abs_path, mtime, args, tuple(sorted(kwargs.items())))
+
+    def _remove(self, condition):
+        for key in [k for k in self._udfs if condition(k)]:
+            del self._udfs[key]
+            del self._footprints[key]
+
+    def _evict(self):
+        # the most recently used entry always stays, even if it alone does
+        # not fit into the budget
+        while self.footprint > self._max_footprint and len(self._udfs) > 1:
+            key, _ = self._udfs.popitem(last=False)
+            del self._footprints[key]
+            LoggingManager().log('Evicted UDF {} from registry'.format(
+                key[0]), LoggingLevel.INFO)
+
+    @staticmethod
+    def _estimate_footprint(udf) -> int:
+        """
+        Size of the model tensors for pytorch based UDFs, shallow object
+        size otherwise.
+        """
+        footprint = sys.getsizeof(udf)
+        for attr in ['parameters', 'buffers']:
+            tensors = getattr(udf, attr, None)
+            if callable(tensors):
+                footprint += sum(t.numel() * t.element_size()
+                                 for t in tensors())
+        return footprint
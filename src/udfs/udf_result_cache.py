@@ -0,0 +1,175 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import hashlib
+import os
+import pickle
+import shutil
+import uuid
+from typing import Dict, List
+
+from src.udfs.udf_result_memo import UdfResultMemo
+from src.utils.fork_utils import ForkSafeLock
+from src.utils.logging_manager import LoggingManager, LoggingLevel
+
+# directory of the result files inside the directory of a table, the
+# leading underscore keeps parquet from treating it as data
+CACHE_DIRECTORY = '_udf_cache'
+
+
+class UdfResultCache(UdfResultMemo):
+    """
+    Persistent per-frame results of a UDF applied to the columns of a table.
+
+    The results are keyed by frame id and stored next to the data of the
+    table, so that later queries (also from other processes) only send the
+    frames the UDF has not processed yet to the model. The result file is
+    named after the UDF, a hash of its implementation file and its
+    arguments, hence redefining the UDF with a different implementation
+    starts a new file. Reloading the table recreates its directory and
+    inserting rows drops the result files, which drops the results along
+    with the old frames.
+
+    The file is a sequence of pickled chunks, a random token followed by one
+    dict {frame id: output row} per evaluation. Appending a chunk is a single
+    write, and readers only pick up the complete chunks, which allows
+    concurrent writers. Only the offsets of the chunks holding each frame
+    are kept in memory, a lookup reads the chunks of the requested frames.
+    The cache is attached to cached plans, hence it may be used by several
+    queries at once.
+
+    Arguments:
+        table_path (str): directory of the table
+        id_column (str): column holding the frame ids
+        udf_name (str): name of the UDF
+        impl_path (str): implementation file of the UDF
+        arguments (List[str]): names of the columns passed to the UDF
+    """
+
+    def __init__(self, table_path: str, id_column: str, udf_name: str,
+                 impl_path: str, arguments: List[str]):
+        with open(impl_path, 'rb') as impl_file:
+            impl_hash = hashlib.sha1(impl_file.read()).hexdigest()
+        key = hashlib.sha1('{}:{}:{}'.format(
+            udf_name, impl_hash, ','.join(arguments)).encode()).hexdigest()
+        self._path = os.path.join(table_path, CACHE_DIRECTORY,
+                                  '{}-{}.chunks'.format(udf_name, key[:16]))
+        super().__init__(id_column)
+        self._lock = ForkSafeLock()
+        # frame id -> offset of the chunk holding its results
+        self._index = {}
+        self._token = None
+        self._offset = 0
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def __len__(self):
+        with self._lock:
+            self._load()
+            return len(self._index)
+
+    def clear(self):
+        # the stored results are indexed again on the next lookup
+        with self._lock:
+            self._reset(None)
+
+    def _lookup(self, keys: List[int]) -> Dict[int, Dict]:
+        with self._lock:
+            self._load()
+            chunks = {}
+            for key in keys:
+                if key in self._index:
+                    chunks.setdefault(self._index[key], set()).add(key)
+        results = {}
+        if not chunks:
+            return results
+        try:
+            with open(self._path, 'rb') as cache_file:
+                for offset in sorted(chunks):
+                    cache_file.seek(offset)
+                    chunk = pickle.load(cache_file)
+                    results.update((key, chunk[key])
+                                   for key in chunks[offset])
+        except (OSError, EOFError, pickle.UnpicklingError, KeyError) as e:
+            # the file was dropped or recreated since it was indexed
+            LoggingManager().log(
+                'Failed to read UDF results from {}: {}'.format(
+                    self._path, e), LoggingLevel.WARNING)
+            return {}
+        return results
+
+    def _load(self):
+        """
+        Indexes the chunks appended since the last call, starting over if
+        the file was removed or recreated.
+        """
+        try:
+            cache_file = open(self._path, 'rb')
+        except FileNotFoundError:
+            self._reset(None)
+            return
+        with cache_file:
+            try:
+                token = pickle.load(cache_file)
+            except (EOFError, pickle.UnpicklingError):
+                # the token is still being written
+                return
+            if token != self._token:
+                self._reset(token)
+                self._offset = cache_file.tell()
+            cache_file.seek(self._offset)
+            while True:
+                try:
+                    chunk = pickle.load(cache_file)
+                except (EOFError, pickle.UnpicklingError, ValueError):
+                    # end of the file or a chunk that is still being written
+                    break
+                self._index.update(dict.fromkeys(chunk, self._offset))
+                self._offset = cache_file.tell()
+
+    def _reset(self, token: str):
+        self._index = {}
+        self._token = token
+        self._offset = 0
+
+    def _store(self, results: Dict[int, Dict]):
+        # the chunk is indexed along with the chunks of other writers on
+        # the next lookup
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            try:
+                with open(self._path, 'xb') as cache_file:
+                    cache_file.write(pickle.dumps(uuid.uuid4().hex))
+            except FileExistsError:
+                pass
+            with open(self._path, 'ab') as cache_file:
+                cache_file.write(pickle.dumps(results))
+        except OSError as e:
+            LoggingManager().log(
+                'Failed to store UDF results in {}: {}'.format(
+                    self._path, e), LoggingLevel.WARNING)
+
+
+def drop_udf_results(table_path: str):
+    """
+    Removes the stored UDF results of a table, e.g. after rows were added
+    whose frame ids may have results of the old frames.
+
+    Arguments:
+        table_path (str): directory of the table
+    """
+    shutil.rmtree(os.path.join(table_path, CACHE_DIRECTORY),
+                  ignore_errors=True)
@@ -0,0 +1,90 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+
+class UdfResultMemo(object):
+    """
+    Per-frame results of a UDF call kept in memory and keyed by frame id.
+
+    Equal UDF calls in the predicate and the projection of a scan share a
+    memo, so that the UDF runs once per frame although each call is
+    evaluated on its own. The scan creates the memos for every batch.
+
+    Arguments:
+        id_column (str): column holding the frame ids
+    """
+
+    def __init__(self, id_column: str):
+        self._id_column = id_column
+        self._results = {}
+
+    @property
+    def id_column(self) -> str:
+        return self._id_column
+
+    def __len__(self):
+        return len(self._results)
+
+    def clear(self):
+        self._results = {}
+
+    def evaluate(self, ids: pd.Series, frames: pd.DataFrame,
+                 func: Callable) -> pd.DataFrame:
+        """
+        Returns the UDF outputs for the frames, only calling the UDF on the
+        frames without stored results.
+
+        Arguments:
+            ids (pd.Series): frame ids of the rows
+            frames (pd.DataFrame): arguments of the UDF for each row
+            func (Callable): the UDF
+
+        Returns:
+            pd.DataFrame: one output row per input row
+        """
+        keys = [int(key) for key in ids]
+        results = self._lookup(keys)
+        missing = [index for index, key in enumerate(keys)
+                   if key not in results]
+        if missing:
+            outcomes = pd.DataFrame(
+                func(frames.iloc[missing].reset_index(drop=True)))
+            if len(outcomes) != len(missing):
+                # not a per frame UDF, nothing can be stored
+                if len(missing) == len(keys):
+                    return outcomes
+                return pd.DataFrame(func(frames))
+            new_results = {keys[index]: row for index, row in
+                           zip(missing, outcomes.to_dict('records'))}
+            results.update(new_results)
+            self._store(new_results)
+        return pd.DataFrame([results[key] for key in keys])
+
+    def _lookup(self, keys: List[int]) -> Dict[int, Dict]:
+        """
+        Returns the stored results of the frames, frames without results
+        are left out.
+        """
+        return {key: self._results[key] for key in keys
+                if key in self._results}
+
+    def _store(self, results: Dict[int, Dict]):
+        """
+        Stores the results of a UDF call.
+        """
+        self._results.update(results)
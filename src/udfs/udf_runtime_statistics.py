@@ -0,0 +1,66 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from src.utils.fork_utils import ForkSafeLock
+
+# weight of the latest observation in the running average of the runtimes
+SMOOTHING = 0.2
+
+
+class UdfRuntimeStatistics(object):
+    """
+    Process wide running averages of the time the UDFs spend per row.
+
+    The function expressions report the runtime of every UDF call, the
+    optimizer uses the averages to estimate the cost of the predicates.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(UdfRuntimeStatistics, cls).__new__(cls)
+            cls._instance._costs = {}
+            cls._instance._lock = ForkSafeLock()
+        return cls._instance
+
+    def record(self, name: str, num_rows: int, seconds: float):
+        """
+        Adds the runtime of a UDF call to the average of the UDF.
+
+        Arguments:
+            name (str): name of the UDF
+            num_rows (int): number of rows passed to the UDF
+            seconds (float): runtime of the call
+        """
+        if num_rows <= 0:
+            return
+        cost = seconds / num_rows
+        with self._lock:
+            average = self._costs.get(name)
+            if average is not None:
+                cost = average + SMOOTHING * (cost - average)
+            self._costs[name] = cost
+
+    def cost(self, name: str) -> float:
+        """
+        Returns:
+            float: average seconds per row of the UDF, None if the UDF has
+                not been called yet
+        """
+        return self._costs.get(name)
+
+    def reset(self):
+        with self._lock:
+            self._costs.clear()
@@ -0,0 +1,65 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import threading
+import weakref
+
+# locks to be replaced in forked child processes
+_locks = weakref.WeakSet()
+
+
+class ForkSafeLock(object):
+    """
+    Lock of process wide state that can be used in forked child processes.
+
+    A child process forked while another thread of the parent held a
+    plain lock inherits it locked, with no thread left to release it, and
+    blocks forever once it needs the lock (e.g. the parallel scan workers
+    recording UDF runtimes). The lock is replaced by a new one in the
+    children instead.
+
+    Arguments:
+        reentrant (bool): whether the lock is a threading.RLock
+    """
+
+    def __init__(self, reentrant: bool = False):
+        self._factory = threading.RLock if reentrant else threading.Lock
+        self._lock = self._factory()
+        _locks.add(self)
+
+    def acquire(self, *args, **kwargs) -> bool:
+        return self._lock.acquire(*args, **kwargs)
+
+    def release(self):
+        self._lock.release()
+
+    def __enter__(self):
+        self._lock.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self._lock.release()
+
+    def _reinit(self):
+        self._lock = self._factory()
+
+
+def _reinit_locks():
+    for lock in list(_locks):
+        lock._reinit()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reinit_locks)
@@ -13,7 +13,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import importlib
-import torch
 import uuid
 import hashlib
 from pathlib import Path
@@ -76,6 +75,8 @@ def is_gpu_available() -> bool:
     Returns:
         [bool] True if system has GPUs, else False
     """
+    # torch takes long to import, it is only loaded once GPUs are asked for
+    import torch
     return torch.cuda.is_available()
 
 
@@ -101,3 +102,31 @@ def generate_file_path(name: str = '') -> Path:
     file_name = hashlib.md5(salt.encode() + name.encode()).hexdigest()
     path = dataset_location / file_name
     return path.resolve()
+
+
+def structural_hash(value) -> int:
+    """
+    Hash of a value that is consistent with structural equality. Objects
+    providing a `fingerprint` method (expressions, operators) contribute
+    their fingerprint and containers the hashes of their elements. Other
+    unhashable values only contribute their type, which keeps equal values
+    on equal hashes.
+
+    Arguments:
+        value: value to be hashed
+
+    Returns:
+        int: the hash
+    """
+    if callable(getattr(type(value), 'fingerprint', None)):
+        return value.fingerprint()
+    if isinstance(value, (list, tuple)):
+        return hash((type(value).__name__,) +
+                    tuple(structural_hash(item) for item in value))
+    if isinstance(value, dict):
+        return hash(frozenset((structural_hash(key), structural_hash(item))
+                              for key, item in value.items()))
+    try:
+        return hash(value)
+    except TypeError:
+        return hash(type(value).__name__)
@@ -87,6 +87,10 @@ class CatalogModelsTest(unittest.TestCase):
         self.assertEqual(df_metadata.identifier_column, 'id')
         self.assertEqual(df_metadata.schema, schema)
 
+        # a prebuilt schema is kept as it is
+        df_metadata.schema = schema
+        self.assertIs(df_metadata.schema, schema)
+
     def test_df_metadata_equality(self):
         df_metadata = DataFrameMetadata('name', 'eva_dataset')
         column_1 = DataFrameColumn("frame_id", ColumnType.INTEGER, False)
@@ -0,0 +1,62 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+
+from mock import MagicMock
+
+from src.catalog.catalog_cache import CatalogCache
+
+
+class CatalogCacheTest(unittest.TestCase):
+
+    def test_should_load_only_on_miss(self):
+        cache = CatalogCache()
+        loader = MagicMock(return_value='metadata')
+        self.assertEqual(cache.get(0, 'key', loader), 'metadata')
+        self.assertEqual(cache.get(0, 'key', loader), 'metadata')
+        loader.assert_called_once_with()
+        self.assertEqual(len(cache), 1)
+
+    def test_should_drop_entries_of_older_versions(self):
+        cache = CatalogCache()
+        cache.get(0, 'key', lambda: 'old')
+        cache.get(0, 'other', lambda: 'other')
+        self.assertEqual(cache.get(1, 'key', lambda: 'new'), 'new')
+        self.assertEqual(len(cache), 1)
+
+    def test_should_not_cache_misses(self):
+        cache = CatalogCache()
+        loader = MagicMock(return_value=None)
+        self.assertIsNone(cache.get(0, 'key', loader))
+        self.assertIsNone(cache.get(0, 'key', loader))
+        self.assertEqual(loader.call_count, 2)
+        self.assertEqual(len(cache), 0)
+
+    def test_should_not_cache_entries_loaded_during_a_change(self):
+        cache = CatalogCache()
+
+        def loader():
+            # the catalog changes while the entry is being loaded
+            cache.get(1, 'other', lambda: 'other')
+            return 'stale'
+
+        self.assertEqual(cache.get(0, 'key', loader), 'stale')
+        self.assertEqual(cache.get(1, 'key', lambda: 'new'), 'new')
+
+    def test_clear(self):
+        cache = CatalogCache()
+        cache.get(0, 'key', lambda: 'metadata')
+        cache.clear()
+        self.assertEqual(len(cache), 0)
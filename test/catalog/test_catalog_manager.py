@@ -16,9 +16,13 @@ import unittest
 
 import mock
 from mock import MagicMock
+from sqlalchemy import inspect
+
 from src.catalog.catalog_manager import CatalogManager
 from src.catalog.column_type import ColumnType, NdArrayType
 from src.catalog.models.df_column import DataFrameColumn
+from src.catalog.models.df_metadata import DataFrameMetadata
+from src.catalog.models.udf import UdfMetadata
 
 
 class CatalogManagerTests(unittest.TestCase):
@@ -26,6 +30,10 @@ class CatalogManagerTests(unittest.TestCase):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+    def setUp(self):
+        # lookups have to reach the mocked services
+        CatalogManager()._cache.clear()
+
     def test_catalog_manager_singleton_pattern(self):
         x = CatalogManager()
         y = CatalogManager()
@@ -220,10 +228,155 @@ class CatalogManagerTests(unittest.TestCase):
         self.assertEqual(actual,
                          udf_mock.return_value.udf_by_name.return_value)
 
+    @mock.patch('src.catalog.catalog_manager.UdfRegistry')
     @mock.patch('src.catalog.catalog_manager.UdfService')
-    def test_delete_udf(self, udf_mock):
+    def test_delete_udf(self, udf_mock, registry_mock):
         actual = CatalogManager().delete_udf('name')
         udf_mock.return_value.delete_udf_by_name.assert_called_with('name')
+        registry_mock.return_value.invalidate.assert_called_with('name')
         self.assertEqual(
             udf_mock.return_value.delete_udf_by_name.return_value,
             actual)
+
+    @mock.patch('src.catalog.catalog_manager.init_db')
+    @mock.patch('src.catalog.catalog_manager.UdfRegistry')
+    @mock.patch('src.catalog.catalog_manager.UdfService')
+    @mock.patch('src.catalog.catalog_manager.UdfIOService')
+    @mock.patch('src.catalog.catalog_manager.DatasetService')
+    @mock.patch('src.catalog.catalog_manager.DatasetColumnService')
+    def test_catalog_changes_should_bump_version(self, *mocks):
+        catalog = CatalogManager()
+        version = catalog.version
+        catalog.create_metadata('name', 'file1', [])
+        catalog.create_udf('udf', 'sample.py', 'classification', [])
+        catalog.delete_metadata('name')
+        catalog.delete_udf('udf')
+        self.assertEqual(catalog.version, version + 4)
+
+        catalog.get_udf_by_name('udf')
+        self.assertEqual(catalog.version, version + 4)
+
+    @mock.patch('src.catalog.catalog_manager.init_db')
+    @mock.patch('src.catalog.catalog_manager.UdfRegistry')
+    @mock.patch('src.catalog.catalog_manager.UdfService')
+    @mock.patch('src.catalog.catalog_manager.DatasetService')
+    @mock.patch('src.catalog.catalog_manager.DatasetColumnService')
+    def test_deletes_should_bump_version_after_deleting(self, dcs_mock,
+                                                        ds_mock, udf_mock,
+                                                        *mocks):
+        catalog = CatalogManager()
+        version = catalog.version
+        versions = []
+
+        def delete(*args):
+            versions.append(catalog.version)
+            return True
+
+        ds_mock.return_value.delete_dataset_by_id.side_effect = delete
+        udf_mock.return_value.delete_udf_by_name.side_effect = delete
+
+        self.assertTrue(catalog.delete_metadata('name'))
+        self.assertEqual(catalog.version, version + 1)
+        self.assertTrue(catalog.delete_udf('udf'))
+        self.assertEqual(catalog.version, version + 2)
+        # lookups during the delete still see the old version
+        self.assertEqual(versions, [version, version + 1])
+
+    @mock.patch('src.catalog.catalog_manager.init_db')
+    @mock.patch('src.catalog.catalog_manager.DatasetService')
+    @mock.patch('src.catalog.catalog_manager.DatasetColumnService')
+    def test_should_cache_dataset_metadata_until_catalog_changes(
+            self, dcs_mock, ds_mock, initdb_mock):
+        catalog = CatalogManager()
+        metadata_obj = MagicMock(id=1, schema=None)
+        ds_mock.return_value.dataset_object_by_name.return_value = metadata_obj
+        dcs_mock.return_value. \
+            columns_by_id_and_dataset_id.return_value = [1, 2, 3]
+
+        for _ in range(3):
+            actual = catalog.get_dataset_metadata('database', 'name')
+            self.assertEqual(actual, metadata_obj)
+            self.assertEqual(actual.schema, [1, 2, 3])
+        ds_mock.return_value.dataset_object_by_name.assert_called_once()
+        dcs_mock.return_value.columns_by_id_and_dataset_id.assert_called_once()
+
+        catalog.create_metadata('other', 'file1', [])
+        catalog.get_dataset_metadata('database', 'name')
+        self.assertEqual(
+            ds_mock.return_value.dataset_object_by_name.call_count, 2)
+
+    @mock.patch('src.catalog.catalog_manager.init_db')
+    @mock.patch('src.catalog.catalog_manager.DatasetService')
+    @mock.patch('src.catalog.catalog_manager.DatasetColumnService')
+    def test_should_cache_detached_metadata_per_schema(self, dcs_mock,
+                                                       ds_mock, initdb_mock):
+        catalog = CatalogManager()
+        metadata_obj = DataFrameMetadata('MyVideo', 'file_url')
+        metadata_obj._id = 1
+        columns = [DataFrameColumn('id', ColumnType.INTEGER),
+                   DataFrameColumn('data', ColumnType.NDARRAY,
+                                   array_type=NdArrayType.UINT8,
+                                   array_dimensions=[2, 2])]
+        ds_mock.return_value.dataset_by_id.return_value = metadata_obj
+        dcs_mock.return_value.columns_by_id_and_dataset_id.side_effect = \
+            lambda metadata_id, col_id_list: columns[:len(col_id_list or
+                                                          columns)]
+
+        metadata = catalog.get_metadata(1)
+        self.assertIsNot(metadata, metadata_obj)
+        self.assertTrue(inspect(metadata).transient)
+        self.assertEqual((metadata.id, metadata.name, metadata.file_url,
+                          metadata.identifier_column),
+                         (1, 'MyVideo', 'file_url', 'id'))
+        self.assertEqual([column.name for column in
+                          metadata.schema.column_list], ['id', 'data'])
+        self.assertTrue(all(inspect(column).transient
+                            for column in metadata.schema.column_list))
+
+        # every column list has its own metadata object
+        subset = catalog.get_metadata(1, [2])
+        self.assertIsNot(subset, metadata)
+        self.assertEqual(len(subset.schema.column_list), 1)
+        self.assertIs(catalog.get_metadata(1), metadata)
+        self.assertEqual(len(metadata.schema.column_list), 2)
+        self.assertEqual(
+            dcs_mock.return_value.columns_by_id_and_dataset_id.call_count, 2)
+
+    @mock.patch('src.catalog.catalog_manager.UdfRegistry')
+    @mock.patch('src.catalog.catalog_manager.UdfService')
+    @mock.patch('src.catalog.catalog_manager.UdfIOService')
+    def test_should_cache_udf_lookups(self, udfio_mock, udf_mock,
+                                      registry_mock):
+        catalog = CatalogManager()
+        for _ in range(2):
+            self.assertEqual(catalog.get_udf_by_name('udf'),
+                             udf_mock.return_value.udf_by_name.return_value)
+            self.assertEqual(
+                catalog.get_udf_io_by_name('label'),
+                udfio_mock.return_value.udf_io_by_name.return_value)
+        udf_mock.return_value.udf_by_name.assert_called_once_with('udf')
+        udfio_mock.return_value.udf_io_by_name.assert_called_once_with(
+            'label')
+
+        catalog.delete_udf('udf')
+        catalog.get_udf_by_name('udf')
+        self.assertEqual(udf_mock.return_value.udf_by_name.call_count, 2)
+
+    @mock.patch('src.catalog.catalog_manager.UdfService')
+    def test_should_cache_detached_udf(self, udf_mock):
+        udf_obj = UdfMetadata('udf', 'test/util.py', 'Classification')
+        udf_obj._id = 3
+        udf_mock.return_value.udf_by_name.return_value = udf_obj
+        udf = CatalogManager().get_udf_by_name('udf')
+        self.assertIsNot(udf, udf_obj)
+        self.assertEqual(udf, udf_obj)
+        self.assertTrue(inspect(udf).transient)
+        self.assertIs(CatalogManager().get_udf_by_name('udf'), udf)
+
+    @mock.patch('src.catalog.catalog_manager.UdfService')
+    def test_should_not_cache_missing_udf(self, udf_mock):
+        catalog = CatalogManager()
+        udf_mock.return_value.udf_by_name.return_value = None
+        self.assertIsNone(catalog.get_udf_by_name('udf'))
+        self.assertIsNone(catalog.get_udf_by_name('udf'))
+        self.assertEqual(udf_mock.return_value.udf_by_name.call_count, 2)
@@ -73,7 +73,7 @@ class SchemaTests(unittest.TestCase):
                               ColumnType.TEXT, [10, 10])
         self.assertRaises(ValueError, SchemaUtils.get_petastorm_column, col)
 
-    @patch('src.catalog.schema_utils.Unischema')
+    @patch('petastorm.unischema.Unischema')
     @patch('src.catalog.schema_utils.SchemaUtils.get_petastorm_column')
     def test_get_petastorm_schema(self, mock_get_pc, mock_uni):
         cols = [MagicMock() for i in range(2)]
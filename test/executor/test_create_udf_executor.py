@@ -19,8 +19,9 @@ from src.executor.create_udf_executor import CreateUDFExecutor
 
 
 class CreateUdfExecutorTest(unittest.TestCase):
+    @patch('src.executor.create_udf_executor.UdfRegistry')
     @patch('src.executor.create_udf_executor.CatalogManager')
-    def test_should_create_udf(self, mock):
+    def test_should_create_udf(self, mock, mock_registry):
         catalog_instance = mock.return_value
         catalog_instance.create_udf.return_value = 'udf'
         impl_path = MagicMock()
@@ -39,3 +40,5 @@ class CreateUdfExecutorTest(unittest.TestCase):
         create_udf_executor.exec()
         catalog_instance.create_udf.assert_called_with(
             'udf', 'test.py', 'classification', ['inp', 'out'])
+        mock_registry.return_value.warm_up.assert_called_with(
+            'udf', 'test.py')
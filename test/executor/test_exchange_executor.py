@@ -0,0 +1,124 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import multiprocessing
+import threading
+import unittest
+
+import pandas as pd
+from mock import MagicMock
+
+from src.executor.abstract_executor import AbstractExecutor
+from src.executor.exchange_executor import ExchangeExecutor
+from src.models.storage.batch import Batch
+from src.planner.exchange_plan import ExchangePlan
+from src.planner.storage_plan import StoragePlan
+from src.udfs.udf_runtime_statistics import UdfRuntimeStatistics
+
+NUM_ROWS = 20
+
+
+class ShardExecutor(AbstractExecutor):
+    """
+    Produces the ids of the shard of its storage plan in batches of 3,
+    all of them if the plan is not sharded.
+    """
+
+    def __init__(self, fail: bool = False, record: bool = False):
+        super().__init__(StoragePlan(MagicMock()))
+        self.fail = fail
+        self.record = record
+
+    def validate(self):
+        pass
+
+    def exec(self):
+        if self.fail:
+            raise ValueError('failed')
+        if self.record:
+            # takes the lock of the statistics, like the UDF calls
+            UdfRuntimeStatistics().record('udf', 1, 0.0)
+        step = max(self.node.total_shards, 1)
+        ids = list(range(self.node.curr_shard, NUM_ROWS, step))
+        for i in range(0, len(ids), 3):
+            yield Batch(pd.DataFrame({'id': ids[i:i + 3]}))
+
+
+class ExchangeExecutorTest(unittest.TestCase):
+
+    def _exec(self, plan, child):
+        executor = ExchangeExecutor(plan)
+        executor.append_child(child)
+        return list(executor.exec())
+
+    def _ids(self, batches):
+        return [id for batch in batches for id in batch.frames['id']]
+
+    def test_should_merge_shards_in_order(self):
+        child = ShardExecutor()
+        batches = self._exec(ExchangePlan(3, 'id'), child)
+        self.assertEqual(self._ids(batches), list(range(NUM_ROWS)))
+        # the shards are only assigned in the worker processes
+        self.assertEqual(child.node.total_shards, 0)
+
+    def test_should_gather_shards_without_order(self):
+        batches = self._exec(ExchangePlan(3), ShardExecutor())
+        self.assertEqual(sorted(self._ids(batches)), list(range(NUM_ROWS)))
+
+    def test_should_run_child_without_workers(self):
+        batches = self._exec(ExchangePlan(1, 'id'), ShardExecutor())
+        self.assertEqual(self._ids(batches), list(range(NUM_ROWS)))
+        self.assertEqual(len(batches), 7)
+
+    def test_should_raise_worker_errors(self):
+        with self.assertRaises(RuntimeError) as context:
+            self._exec(ExchangePlan(2, 'id'), ShardExecutor(fail=True))
+        self.assertIn('ValueError: failed', str(context.exception))
+
+    def test_should_stop_workers_on_early_close(self):
+        executor = ExchangeExecutor(ExchangePlan(2))
+        executor.append_child(ShardExecutor())
+        output = executor.exec()
+        next(output)
+        output.close()
+        self.assertEqual(multiprocessing.active_children(), [])
+
+    def test_should_run_workers_while_other_thread_holds_lock(self):
+        held = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            # e.g. a concurrent query recording the runtime of a UDF
+            with UdfRuntimeStatistics()._lock:
+                held.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        held.wait()
+        batches = []
+        exchange = threading.Thread(target=lambda: batches.extend(
+            self._exec(ExchangePlan(2, 'id'), ShardExecutor(record=True))))
+        try:
+            exchange.start()
+            exchange.join(timeout=30)
+            self.assertFalse(exchange.is_alive())
+        finally:
+            release.set()
+            thread.join()
+            # workers blocked on the inherited lock never finish
+            for process in multiprocessing.active_children():
+                process.terminate()
+            exchange.join()
+        self.assertEqual(self._ids(batches), list(range(NUM_ROWS)))
@@ -53,9 +53,9 @@ class ExecutionContextTest(unittest.TestCase):
         cfm.return_value.get_value.return_value = {'address3': ['0', '1', '2']}
         os.environ.get.return_value = "0,1,2"
         context = Context()
-        os.environ.get.assert_called_with('GPU_DEVICES', '')
 
         self.assertEqual(context.gpus, ['0', '1', '2'])
+        os.environ.get.assert_called_with('GPU_DEVICES', '')
 
     @patch('src.executor.execution_context.ConfigurationManager')
     @patch('src.executor.execution_context.os')
@@ -72,9 +72,9 @@ class ExecutionContextTest(unittest.TestCase):
         cfm.return_value.get_value.return_value = {'address3': ['0', '1', '2']}
         os.environ.get.return_value = ''
         context = Context()
-        os.environ.get.assert_called_with('GPU_DEVICES', '')
 
         self.assertEqual(context.gpus, [])
+        os.environ.get.assert_called_with('GPU_DEVICES', '')
 
     @patch('src.executor.execution_context.ConfigurationManager')
     @patch('src.executor.execution_context.os')
@@ -110,9 +110,9 @@ class ExecutionContextTest(unittest.TestCase):
         cfm.return_value.get_value.return_value = None
         os.environ.get.return_value = ''
         context = Context()
-        os.environ.get.assert_called_with('GPU_DEVICES', '')
 
         self.assertEqual(context.gpu_device(), NO_GPU)
+        os.environ.get.assert_called_with('GPU_DEVICES', '')
 
     @patch('src.executor.execution_context.ConfigurationManager')
     @patch('src.executor.execution_context.socket')
@@ -135,3 +135,13 @@ class ExecutionContextTest(unittest.TestCase):
 
         random.choice.assert_called_with(context.gpus)
         self.assertEqual(selected_device, '2')
+
+    @patch('src.executor.execution_context.is_gpu_available')
+    def test_should_probe_gpus_only_when_asked_for(self, gpu_check):
+        gpu_check.return_value = False
+        context = Context()
+        gpu_check.assert_not_called()
+
+        self.assertEqual(context.gpus, [])
+        self.assertEqual(context.gpus, [])
+        gpu_check.assert_called_once_with()
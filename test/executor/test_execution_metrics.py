@@ -0,0 +1,146 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+
+import numpy as np
+import pandas as pd
+from mock import MagicMock
+
+from src.executor.execution_metrics import ExecutionMetrics, \
+    InstrumentedExecutor, OperatorMetrics, instrument, record_udf_call
+from src.models.storage.batch import Batch
+from src.planner.seq_scan_plan import SeqScanPlan
+from src.planner.storage_plan import StoragePlan
+
+
+class ExecutionMetricsTest(unittest.TestCase):
+
+    def _executor(self, node, batches=None):
+        executor = MagicMock(node=node)
+        executor.children = []
+        executor.append_child.side_effect = executor.children.append
+        executor.exec.return_value = batches
+        return InstrumentedExecutor(executor)
+
+    def test_should_count_rows_batches_and_bytes(self):
+        data = np.zeros((2, 4, 4, 3), dtype=np.uint8)
+        batches = [Batch.from_columns({'id': np.arange(2), 'data': data}),
+                   Batch.from_columns({'id': np.arange(2, 3),
+                                       'data': data[:1]})]
+        storage = self._executor(StoragePlan(MagicMock()), iter(batches))
+        scan = self._executor(SeqScanPlan(None, []),
+                              (batch[:1] for batch in storage.exec()))
+        scan.append_child(storage)
+
+        self.assertEqual(list(scan.exec()), [batches[0][:1],
+                                             batches[1][:1]])
+        self.assertEqual(scan.children, [storage])
+        self.assertEqual(scan.metrics.children, [storage.metrics])
+
+        self.assertEqual(storage.metrics.name, 'STORAGE_PLAN')
+        self.assertEqual(storage.metrics.batches, 2)
+        self.assertEqual(storage.metrics.output_rows, 3)
+        self.assertEqual(storage.metrics.bytes,
+                         batches[0].nbytes + batches[1].nbytes)
+        self.assertEqual(scan.metrics.input_rows, 3)
+        self.assertEqual(scan.metrics.output_rows, 2)
+        # the scan pulls the batches of the storage while it is running
+        self.assertGreaterEqual(scan.metrics.wall_time,
+                                storage.metrics.wall_time)
+        self.assertGreater(storage.metrics.wall_time, 0)
+
+    def test_should_measure_executors_without_output(self):
+        executor = self._executor(SeqScanPlan(None, []))
+        self.assertIsNone(executor.exec())
+        executor.executor.exec.assert_called_once_with()
+        self.assertGreater(executor.metrics.wall_time, 0)
+        self.assertEqual(executor.metrics.batches, 0)
+
+    def test_should_close_wrapped_output(self):
+        closed = []
+
+        def batches():
+            try:
+                while True:
+                    yield Batch(pd.DataFrame([1]))
+            finally:
+                closed.append(True)
+
+        output = self._executor(SeqScanPlan(None, []), batches()).exec()
+        next(output)
+        output.close()
+        self.assertEqual(closed, [True])
+
+    def test_should_attribute_udf_calls_to_running_operator(self):
+        def scan_batches():
+            record_udf_call('udf')
+            yield Batch(pd.DataFrame([1]))
+
+        def storage_batches():
+            record_udf_call('decode')
+            yield Batch(pd.DataFrame([1]))
+
+        storage = self._executor(StoragePlan(MagicMock()),
+                                 storage_batches())
+        scan = self._executor(SeqScanPlan(None, []),
+                              (batch for batch in storage.exec()
+                               for _ in scan_batches()))
+        scan.append_child(storage)
+        list(scan.exec())
+
+        self.assertEqual(storage.metrics.udf_calls, {'decode': 1})
+        self.assertEqual(scan.metrics.udf_calls, {'udf': 1})
+        # calls outside of an instrumented query are ignored
+        record_udf_call('udf')
+        self.assertEqual(scan.metrics.udf_calls, {'udf': 1})
+
+    def test_should_instrument_execution_tree(self):
+        scan = MagicMock(node=SeqScanPlan(None, []))
+        storage = MagicMock(node=StoragePlan(MagicMock()))
+        storage.children = []
+        scan.children = [storage]
+        scan.append_child.side_effect = scan.children.append
+
+        root = instrument(scan)
+        self.assertEqual(root.executor, scan)
+        self.assertEqual(len(root.children), 1)
+        self.assertIsInstance(root.children[0], InstrumentedExecutor)
+        self.assertEqual(root.children[0].executor, storage)
+        self.assertEqual(root.metrics.children, [root.children[0].metrics])
+        # instrumented trees are kept as they are
+        self.assertIs(instrument(root), root)
+
+    def test_should_export_metrics_tree(self):
+        self.assertIsNone(ExecutionMetrics().to_dict())
+
+        root = OperatorMetrics('SEQUENTIAL_SCAN')
+        child = OperatorMetrics('STORAGE_PLAN')
+        root.children.append(child)
+        root.wall_time, child.wall_time = 3.0, 2.0
+        child.add_batch(Batch(pd.DataFrame({'id': [1, 2]})))
+        root.add_udf_call('udf')
+        metrics = ExecutionMetrics()
+        metrics.root = root
+
+        actual = metrics.to_dict()
+        self.assertEqual(actual['operator'], 'SEQUENTIAL_SCAN')
+        self.assertEqual(actual['self_time'], 1.0)
+        self.assertEqual(actual['input_rows'], 2)
+        self.assertEqual(actual['udf_calls'], {'udf': 1})
+        self.assertEqual(actual['children'][0]['output_rows'], 2)
+        self.assertEqual(actual['children'][0]['bytes'], 16)
+        lines = str(metrics).split('\n')
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith('  STORAGE_PLAN'))
@@ -0,0 +1,101 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import threading
+import time
+import unittest
+
+from mock import patch
+
+from src.executor.executor_utils import prefetch
+
+
+class PrefetchTest(unittest.TestCase):
+
+    def test_should_return_items_in_order(self):
+        self.assertEqual(list(prefetch(range(10), 3)), list(range(10)))
+
+    def test_should_not_prefetch_if_disabled(self):
+        def generator():
+            yield threading.current_thread()
+
+        thread = next(prefetch(generator(), 0))
+        self.assertEqual(thread, threading.current_thread())
+
+    @patch('src.executor.executor_utils.ConfigurationManager')
+    def test_should_read_depth_from_config(self, mock_config):
+        mock_config.return_value.get_value.return_value = 0
+        list(prefetch(range(2)))
+        mock_config.return_value.get_value.assert_called_once_with(
+            'executor', 'prefetch_depth')
+
+    def test_should_bound_prefetched_items(self):
+        produced = []
+
+        def generator():
+            for i in range(10):
+                produced.append(i)
+                yield i
+
+        items = prefetch(generator(), 2)
+        self.assertEqual(next(items), 0)
+        time.sleep(0.3)
+        # one item consumed, two queued and one waiting to be queued
+        self.assertLessEqual(len(produced), 4)
+        items.close()
+
+    def test_should_close_source_on_early_stop(self):
+        closed = threading.Event()
+
+        def generator():
+            try:
+                i = 0
+                while True:
+                    yield i
+                    i += 1
+            finally:
+                closed.set()
+
+        items = prefetch(generator(), 2)
+        self.assertEqual([next(items) for _ in range(3)], [0, 1, 2])
+        items.close()
+        self.assertTrue(closed.is_set())
+
+    def test_should_raise_source_errors(self):
+        def generator():
+            yield 1
+            raise KeyError('failed')
+
+        items = prefetch(generator(), 2)
+        self.assertEqual(next(items), 1)
+        with self.assertRaises(KeyError):
+            next(items)
+
+    def test_should_raise_source_base_exceptions(self):
+        def generator():
+            yield 1
+            raise KeyboardInterrupt()
+
+        items = prefetch(generator(), 2)
+        self.assertEqual(next(items), 1)
+        with self.assertRaises(KeyboardInterrupt):
+            next(items)
+
+    def test_should_raise_errors_of_iter(self):
+        class Source(object):
+            def __iter__(self):
+                raise SystemExit()
+
+        with self.assertRaises(SystemExit):
+            list(prefetch(Source(), 2))
@@ -0,0 +1,65 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+
+import pandas as pd
+from mock import MagicMock
+
+from src.executor.explain_executor import ExplainExecutor
+from src.executor.plan_executor import PlanExecutor
+from src.models.storage.batch import Batch
+from src.planner.explain_plan import ExplainPlan
+from src.planner.limit_plan import LimitPlan
+from src.planner.union_plan import UnionPlan
+from src.expression.constant_value_expression import ConstantValueExpression
+
+
+class ExplainExecutorTest(unittest.TestCase):
+
+    def _plan(self, analyze):
+        plan = ExplainPlan(analyze)
+        limit_plan = LimitPlan(ConstantValueExpression(2))
+        limit_plan.append_child(UnionPlan(True))
+        plan.append_child(limit_plan)
+        return plan
+
+    def _executor(self, plan):
+        executor = PlanExecutor(plan)._build_execution_tree(plan)
+        self.assertIsInstance(executor, ExplainExecutor)
+        union_executor = MagicMock(node=plan.children[0].children[0])
+        union_executor.children = []
+        union_executor.exec.return_value = iter(
+            [Batch(pd.DataFrame({'id': [0, 1, 2]}))])
+        executor.children[0].children[0] = union_executor
+        return executor, union_executor
+
+    def test_should_return_plan_tree(self):
+        executor, union_executor = self._executor(self._plan(False))
+        batches = list(executor.exec())
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(list(batches[0].frames['plan']),
+                         ['LIMIT(limit=2)', '  UNION(all=True)'])
+        # the plan is not executed
+        union_executor.exec.assert_not_called()
+
+    def test_should_annotate_plan_with_actual_metrics(self):
+        executor, union_executor = self._executor(self._plan(True))
+        lines = list(list(executor.exec())[0].frames['plan'])
+        union_executor.exec.assert_called_once_with()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith('LIMIT(limit=2) (actual wall='))
+        self.assertIn('rows=3->2 batches=1 bytes=16', lines[0])
+        self.assertTrue(lines[1].startswith('  UNION(all=True) (actual'))
+        self.assertIn('rows=0->3 batches=1 bytes=24', lines[1])
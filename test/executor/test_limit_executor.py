@@ -121,3 +121,22 @@ class LimitExecutorTest(unittest.TestCase):
         expected_batches = [Batch(frames=df) for df in [expected_df1]]
 
         self.assertEqual(expected_batches[0], aggregated_batch)
+
+    def test_should_close_child_on_early_stop(self):
+        closed = []
+
+        class ClosingExecutor:
+            def exec(self):
+                try:
+                    while True:
+                        yield Batch(frames=pd.DataFrame({'A': [1, 2]}))
+                finally:
+                    closed.append(True)
+
+        plan = LimitPlan(ConstantValueExpression(3))
+        limit_executor = LimitExecutor(plan)
+        limit_executor.append_child(ClosingExecutor())
+        batches = limit_executor.exec()
+        self.assertEqual(len(next(batches)), 2)
+        self.assertEqual(len(next(batches)), 1)
+        self.assertEqual(closed, [True])
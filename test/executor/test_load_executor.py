@@ -14,14 +14,14 @@
 # limitations under the License.
 import unittest
 
-from mock import patch, MagicMock, call
+from mock import patch, MagicMock
 from src.executor.load_executor import LoadDataExecutor
 
 
 class LoadExecutorTest(unittest.TestCase):
     @patch('src.executor.load_executor.OpenCVReader')
     @patch('src.executor.load_executor.StorageEngine.create')
-    @patch('src.executor.load_executor.StorageEngine.write')
+    @patch('src.executor.load_executor.StorageEngine.bulk_write')
     def test_should_call_opencv_reader_and_storage_engine(
             self, write_mock, create_mock, cv_mock):
         batch_frames = [list(range(5))] * 2
@@ -37,5 +37,4 @@ class LoadExecutorTest(unittest.TestCase):
         load_executor.exec()
         cv_mock.assert_called_once_with(file_path)
         create_mock.assert_called_once_with(table_metainfo)
-        write_mock.has_calls(call(table_metainfo, batch_frames[0]), call(
-            table_metainfo, batch_frames[1]))
+        write_mock.assert_called_once_with(table_metainfo, batch_frames)
@@ -1,7 +1,11 @@
+import os
+import tempfile
 import unittest
 import pandas as pd
 import numpy as np
 
+from mock import patch
+
 from src.executor.orderby_executor import OrderByExecutor
 from src.expression.tuple_value_expression import TupleValueExpression
 from src.models.storage.batch import Batch
@@ -70,3 +74,96 @@ class OrderByExecutorTest(unittest.TestCase):
         self.assertEqual(expected_batches[0], sorted_batches[0])
         self.assertEqual(expected_batches[1], sorted_batches[1])
         self.assertEqual(expected_batches[2], sorted_batches[2])
+
+    def test_should_spill_and_merge_sorted_runs(self):
+        df1 = pd.DataFrame(
+            np.array([[1, 1, 1]]), columns=['A', 'B', 'C'])
+        df2 = pd.DataFrame(
+            np.array([[1, 5, 6], [4, 7, 10]]), columns=['A', 'B', 'C'])
+        df3 = pd.DataFrame(
+            np.array([[2, 9, 7], [4, 1, 2],
+                      [4, 2, 4]]), columns=['A', 'B', 'C'])
+
+        batches = [Batch(frames=df) for df in [df1, df2, df3]]
+
+        "query: .... ORDER BY A ASC, B DESC "
+
+        plan = OrderByPlan(
+            [(TupleValueExpression('A'), ParserOrderBySortType.ASC),
+             (TupleValueExpression('B'), ParserOrderBySortType.DESC)])
+
+        orderby_executor = OrderByExecutor(plan)
+        orderby_executor.append_child(DummyExecutor(batches))
+        # every batch exceeds the budget and becomes a run of its own
+        orderby_executor._buffer_size = 1
+
+        run_files = []
+        create_run_file = tempfile.mkstemp
+
+        def mkstemp(*args, **kwargs):
+            run_files.append(create_run_file(*args, **kwargs))
+            return run_files[-1]
+
+        with patch('src.executor.orderby_executor.tempfile.mkstemp',
+                   side_effect=mkstemp):
+            sorted_batches = list(orderby_executor.exec())
+
+        self.assertEqual(len(run_files), 3)
+        for _, run_file in run_files:
+            self.assertFalse(os.path.exists(run_file))
+
+        expected_df1 = pd.DataFrame(
+            np.array([[1, 5, 6]]), columns=['A', 'B', 'C'])
+        expected_df2 = pd.DataFrame(
+            np.array([[1, 1, 1], [2, 9, 7]]), columns=['A', 'B', 'C'])
+        expected_df3 = pd.DataFrame(
+            np.array([[4, 7, 10], [4, 2, 4],
+                      [4, 1, 2]]), columns=['A', 'B', 'C'])
+
+        expected_batches = [Batch(frames=df) for df in [
+            expected_df1, expected_df2, expected_df3]]
+
+        self.assertEqual(len(sorted_batches), 3)
+        self.assertEqual(expected_batches[0], sorted_batches[0])
+        self.assertEqual(expected_batches[1], sorted_batches[1])
+        self.assertEqual(expected_batches[2], sorted_batches[2])
+
+    def test_should_merge_runs_like_in_memory_sort(self):
+        random = np.random.RandomState(0)
+        values = random.randint(0, 5, size=(60, 2)).astype(float)
+        values[random.rand(60) < 0.2, 0] = np.nan
+        df = pd.DataFrame(values, columns=['A', 'B'])
+        df['C'] = [None if value == 0 else str(value) for value in
+                   random.randint(0, 4, size=60)]
+        df['id'] = np.arange(60)
+        batches = [Batch(frames=df.iloc[start:start + 7],
+                         identifier_column='C')
+                   for start in range(0, 60, 7)]
+
+        "query: .... ORDER BY A DESC, C ASC, B DESC "
+        plan = OrderByPlan(
+            [(TupleValueExpression('A'), ParserOrderBySortType.DESC),
+             (TupleValueExpression('C'), ParserOrderBySortType.ASC),
+             (TupleValueExpression('B'), ParserOrderBySortType.DESC)])
+
+        orderby_executor = OrderByExecutor(plan)
+        orderby_executor.append_child(DummyExecutor(batches))
+        expected = list(orderby_executor.exec())
+
+        orderby_executor._buffer_size = 1
+        sorted_batches = list(orderby_executor.exec())
+
+        self.assertEqual([batch.batch_size for batch in sorted_batches],
+                         [batch.batch_size for batch in batches])
+        for batch in sorted_batches:
+            self.assertEqual(batch.identifier_column, 'C')
+        columns = ['A', 'C', 'B']
+        self.assertTrue(
+            Batch.concat(sorted_batches).frames[columns].equals(
+                Batch.concat(expected).frames[columns]))
+
+    def test_should_estimate_size_of_frame_arrays(self):
+        frames = np.zeros((4, 8, 8, 3), dtype=np.uint8)
+        batch = Batch.from_frame_array(frames)
+        self.assertGreaterEqual(OrderByExecutor._estimate_size(batch),
+                                frames.nbytes)
@@ -18,6 +18,8 @@ import pandas as pd
 from unittest.mock import patch, MagicMock
 
 from src.catalog.models.df_metadata import DataFrameMetadata
+from src.executor.execution_metrics import ExecutionMetrics, \
+    InstrumentedExecutor
 from src.executor.plan_executor import PlanExecutor
 from src.models.storage.batch import Batch
 from src.planner.seq_scan_plan import SeqScanPlan
@@ -27,12 +29,18 @@ from src.planner.insert_plan import InsertPlan
 from src.planner.create_plan import CreatePlan
 from src.planner.create_udf_plan import CreateUDFPlan
 from src.planner.load_data_plan import LoadDataPlan
+from src.planner.topk_plan import TopKPlan
+from src.planner.exchange_plan import ExchangePlan
+from src.planner.explain_plan import ExplainPlan
 from src.executor.load_executor import LoadDataExecutor
 from src.executor.seq_scan_executor import SequentialScanExecutor
 from src.executor.create_executor import CreateExecutor
 from src.executor.create_udf_executor import CreateUDFExecutor
 from src.executor.insert_executor import InsertExecutor
 from src.executor.pp_executor import PPExecutor
+from src.executor.topk_executor import TopKExecutor
+from src.executor.exchange_executor import ExchangeExecutor
+from src.executor.explain_executor import ExplainExecutor
 
 
 class PlanExecutorTest(unittest.TestCase):
@@ -110,6 +118,21 @@ class PlanExecutorTest(unittest.TestCase):
         executor = PlanExecutor(plan)._build_execution_tree(plan)
         self.assertIsInstance(executor, LoadDataExecutor)
 
+        # TopKExecutor
+        plan = TopKPlan([], MagicMock())
+        executor = PlanExecutor(plan)._build_execution_tree(plan)
+        self.assertIsInstance(executor, TopKExecutor)
+
+        # ExchangeExecutor
+        plan = ExchangePlan(2)
+        executor = PlanExecutor(plan)._build_execution_tree(plan)
+        self.assertIsInstance(executor, ExchangeExecutor)
+
+        # ExplainExecutor
+        plan = ExplainPlan(True)
+        executor = PlanExecutor(plan)._build_execution_tree(plan)
+        self.assertIsInstance(executor, ExplainExecutor)
+
     @patch('src.executor.plan_executor.PlanExecutor._build_execution_tree')
     @patch('src.executor.plan_executor.PlanExecutor._clean_execution_tree')
     def test_execute_plan_for_seq_scan_plan(
@@ -200,6 +223,53 @@ class PlanExecutorTest(unittest.TestCase):
         mock_clean.assert_called_once()
         self.assertEqual(actual, [])
 
+    @patch('src.executor.plan_executor.PlanExecutor._build_execution_tree')
+    def test_execute_plan_should_close_and_clean_tree_on_early_stop(
+            self, mock_build):
+        closed = []
+
+        def batches():
+            try:
+                for i in range(3):
+                    yield Batch(pd.DataFrame([i]))
+            finally:
+                closed.append(True)
+
+        child = MagicMock()
+        tree = MagicMock(node=SeqScanPlan(None, []))
+        tree.children = [child]
+        child.children = []
+        tree.exec.return_value = batches()
+        mock_build.return_value = tree
+
+        output = PlanExecutor(None).execute_plan()
+        self.assertEqual(next(output), Batch(pd.DataFrame([0])))
+        output.close()
+        self.assertEqual(closed, [True])
+        self.assertEqual(tree.children, [])
+
+    @patch('src.executor.storage_executor.StorageEngine')
+    def test_execute_plan_should_collect_metrics(self, mock_engine):
+        batches = [Batch(pd.DataFrame({'id': [0, 1]})),
+                   Batch(pd.DataFrame({'id': [2]}))]
+        mock_engine.read.return_value = iter(batches)
+        plan = SeqScanPlan(predicate=None, column_ids=None)
+        plan.append_child(StoragePlan(MagicMock()))
+        metrics = ExecutionMetrics()
+
+        executor = PlanExecutor(plan, metrics)
+        self.assertIsInstance(executor._build_execution_tree(plan),
+                              InstrumentedExecutor)
+        actual = list(executor.execute_plan())
+
+        self.assertEqual(actual, batches)
+        actual = metrics.to_dict()
+        self.assertEqual(actual['operator'], 'SEQUENTIAL_SCAN')
+        self.assertEqual(actual['input_rows'], 3)
+        self.assertEqual(actual['output_rows'], 3)
+        self.assertEqual(actual['batches'], 2)
+        self.assertEqual(actual['children'][0]['operator'], 'STORAGE_PLAN')
+
     @unittest.skip("disk_based_storage_depricated")
     @patch('src.executor.disk_based_storage_executor.Loader')
     def test_should_return_the_new_path_after_execution(self, mock_class):
@@ -14,8 +14,13 @@
 # limitations under the License.
 import unittest
 import pandas as pd
+from mock import MagicMock, patch
 
 from src.executor.seq_scan_executor import SequentialScanExecutor
+from src.expression.abstract_expression import ExpressionType
+from src.expression.comparison_expression import ComparisonExpression
+from src.expression.constant_value_expression import ConstantValueExpression
+from src.expression.tuple_value_expression import TupleValueExpression
 from src.models.storage.batch import Batch
 from test.util import create_dataframe
 from test.executor.utils import DummyExecutor
@@ -31,7 +36,9 @@ class SeqScanExecutorTest(unittest.TestCase):
                               pd.DataFrame([False, False, True]))})
 
         plan = type("ScanPlan", (), {"predicate": expression,
-                                     "columns": None})
+                                     "columns": None,
+                                     "shared_udf_calls": 0,
+                                     "id_column": 'id'})
         predicate_executor = SequentialScanExecutor(plan)
         predicate_executor.append_child(DummyExecutor([batch]))
 
@@ -39,13 +46,54 @@ class SeqScanExecutorTest(unittest.TestCase):
         filtered = list(predicate_executor.exec())[0]
         self.assertEqual(expected, filtered)
 
+    def test_should_filter_with_compiled_predicate(self):
+        batch = Batch(frames=create_dataframe(3))
+        expression = ComparisonExpression(ExpressionType.COMPARE_GREATER,
+                                          TupleValueExpression('id'),
+                                          ConstantValueExpression(1))
+
+        plan = type("ScanPlan", (), {"predicate": expression,
+                                     "columns": None,
+                                     "shared_udf_calls": 0,
+                                     "id_column": 'id'})
+        predicate_executor = SequentialScanExecutor(plan)
+        predicate_executor.append_child(DummyExecutor([batch]))
+
+        expected = Batch(batch[[1, 2]].frames.reset_index(drop=True))
+        filtered = list(predicate_executor.exec())[0]
+        self.assertEqual(expected, filtered)
+
+    @patch('src.executor.seq_scan_executor.reorder_predicate')
+    def test_should_reorder_predicate_on_execution(self, mock_reorder):
+        batch = Batch(frames=create_dataframe(3))
+        expression = ComparisonExpression(ExpressionType.COMPARE_GREATER,
+                                          TupleValueExpression('id'),
+                                          ConstantValueExpression(1))
+        mock_reorder.return_value = ComparisonExpression(
+            ExpressionType.COMPARE_LESSER, TupleValueExpression('id'),
+            ConstantValueExpression(2))
+
+        plan = type("ScanPlan", (), {"predicate": expression,
+                                     "columns": None,
+                                     "shared_udf_calls": 0,
+                                     "id_column": 'id'})
+        predicate_executor = SequentialScanExecutor(plan)
+        predicate_executor.append_child(DummyExecutor([batch]))
+        mock_reorder.assert_not_called()
+
+        filtered = list(predicate_executor.exec())[0]
+        mock_reorder.assert_called_once_with(expression)
+        self.assertEqual(Batch(batch[[0]].frames), filtered)
+
     def test_should_return_all_frames_when_no_predicate_is_applied(self):
         dataframe = create_dataframe(3)
 
         batch = Batch(frames=dataframe)
 
         plan = type("ScanPlan", (), {"predicate": None,
-                                     "columns": None})
+                                     "columns": None,
+                                     "shared_udf_calls": 0,
+                                     "id_column": 'id'})
         predicate_executor = SequentialScanExecutor(plan)
         predicate_executor.append_child(DummyExecutor([batch]))
 
@@ -65,9 +113,37 @@ class SeqScanExecutorTest(unittest.TestCase):
                             x.frames['data']))})]
 
         plan = type("ScanPlan", (), {"predicate": None,
-                                     "columns": expression})
+                                     "columns": expression,
+                                     "shared_udf_calls": 0,
+                                     "id_column": 'id'})
         proj_executor = SequentialScanExecutor(plan)
         proj_executor.append_child(DummyExecutor([batch]))
 
         actual = list(proj_executor.exec())[0]
         self.assertEqual(proj_batch, actual)
+
+    def test_should_share_new_results_for_every_batch(self):
+        batches = [Batch(frames=create_dataframe(3)),
+                   Batch(frames=create_dataframe(2))]
+        expression = MagicMock()
+        expression.evaluate.side_effect = lambda batch, **kwargs: batch
+        plan = type("ScanPlan", (), {"predicate": None,
+                                     "columns": [expression, expression],
+                                     "shared_udf_calls": 2,
+                                     "id_column": 'id'})
+        scan_executor = SequentialScanExecutor(plan)
+        scan_executor.append_child(DummyExecutor(batches))
+        list(scan_executor.exec())
+        list(scan_executor.exec())
+
+        shared_results = [call[1]['shared_results']
+                          for call in expression.evaluate.call_args_list]
+        self.assertEqual(len(shared_results), 8)
+        for memos in shared_results:
+            self.assertEqual(len(memos), 2)
+            self.assertEqual(memos[0].id_column, 'id')
+        # the expressions of a batch share the memos, every batch and every
+        # execution gets new ones
+        for index in range(0, 8, 2):
+            self.assertIs(shared_results[index], shared_results[index + 1])
+        self.assertEqual(len({id(memos) for memos in shared_results}), 4)
@@ -0,0 +1,113 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+import pandas as pd
+import numpy as np
+
+from src.executor.topk_executor import TopKExecutor
+from src.expression.constant_value_expression import ConstantValueExpression
+from src.expression.tuple_value_expression import TupleValueExpression
+from src.models.storage.batch import Batch
+from src.parser.types import ParserOrderBySortType
+from src.planner.topk_plan import TopKPlan
+from test.executor.utils import DummyExecutor
+
+
+class TopKExecutorTest(unittest.TestCase):
+
+    def _batches(self):
+        df1 = pd.DataFrame(
+            np.array([[1, 1, 1]]), columns=['A', 'B', 'C'])
+        df2 = pd.DataFrame(
+            np.array([[1, 5, 6], [4, 7, 10]]), columns=['A', 'B', 'C'])
+        df3 = pd.DataFrame(
+            np.array([[2, 9, 7], [4, 1, 2],
+                      [4, 2, 4]]), columns=['A', 'B', 'C'])
+        return [Batch(frames=df) for df in [df1, df2, df3]]
+
+    def _plan(self, limit):
+        "query: .... ORDER BY A ASC, B DESC LIMIT limit"
+        return TopKPlan(
+            [(TupleValueExpression('A'), ParserOrderBySortType.ASC),
+             (TupleValueExpression('B'), ParserOrderBySortType.DESC)],
+            ConstantValueExpression(limit))
+
+    def test_should_return_top_k_frames(self):
+        topk_executor = TopKExecutor(self._plan(4))
+        topk_executor.append_child(DummyExecutor(self._batches()))
+
+        top_batches = list(topk_executor.exec())
+
+        expected_df = pd.DataFrame(
+            np.array([[1, 5, 6], [1, 1, 1], [2, 9, 7], [4, 7, 10]]),
+            columns=['A', 'B', 'C'])
+        self.assertEqual(len(top_batches), 1)
+        self.assertEqual(top_batches[0], Batch(frames=expected_df))
+
+    def test_should_return_all_frames_if_limit_is_larger(self):
+        topk_executor = TopKExecutor(self._plan(10))
+        topk_executor.append_child(DummyExecutor(self._batches()))
+
+        top_batches = list(topk_executor.exec())
+
+        expected_df = pd.DataFrame(
+            np.array([[1, 5, 6], [1, 1, 1], [2, 9, 7], [4, 7, 10],
+                      [4, 2, 4], [4, 1, 2]]),
+            columns=['A', 'B', 'C'])
+        self.assertEqual(top_batches[0], Batch(frames=expected_df))
+
+    def test_should_return_nothing_for_zero_limit(self):
+        topk_executor = TopKExecutor(self._plan(0))
+        topk_executor.append_child(DummyExecutor(self._batches()))
+
+        self.assertEqual(list(topk_executor.exec()), [])
+
+    def test_should_return_nothing_for_empty_input(self):
+        topk_executor = TopKExecutor(self._plan(2))
+        topk_executor.append_child(DummyExecutor([Batch()]))
+
+        self.assertEqual(list(topk_executor.exec()), [])
+
+    def test_should_not_modify_input_batches(self):
+        batches = self._batches()
+        expected = [Batch(frames=batch.frames.copy()) for batch in batches]
+        topk_executor = TopKExecutor(self._plan(1))
+        topk_executor.append_child(DummyExecutor(batches))
+
+        list(topk_executor.exec())
+
+        self.assertEqual(batches, expected)
+
+    def test_should_keep_ties_for_secondary_column(self):
+        batches = [Batch(frames=pd.DataFrame(
+            np.array([[4, i, i] for i in range(10)] + [[5, 20, 20]]),
+            columns=['A', 'B', 'C']))]
+        topk_executor = TopKExecutor(self._plan(2))
+        topk_executor.append_child(DummyExecutor(batches))
+
+        top_batches = list(topk_executor.exec())
+
+        expected_df = pd.DataFrame(
+            np.array([[4, 9, 9], [4, 8, 8]]), columns=['A', 'B', 'C'])
+        self.assertEqual(top_batches[0], Batch(frames=expected_df))
+
+    def test_should_raise_for_non_projected_column(self):
+        batches = [Batch(frames=pd.DataFrame(
+            np.array([[1, 2]]), columns=['A', 'C']))]
+        topk_executor = TopKExecutor(self._plan(2))
+        topk_executor.append_child(DummyExecutor(batches))
+
+        with self.assertRaises(KeyError):
+            list(topk_executor.exec())
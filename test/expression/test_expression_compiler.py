@@ -0,0 +1,123 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+
+import numpy as np
+import pandas as pd
+from mock import MagicMock
+
+from src.expression.abstract_expression import ExpressionType
+from src.expression.arithmetic_expression import ArithmeticExpression
+from src.expression.comparison_expression import ComparisonExpression
+from src.expression.constant_value_expression import ConstantValueExpression
+from src.expression.expression_compiler import compile_predicate
+from src.expression.function_expression import FunctionExpression
+from src.expression.logical_expression import LogicalExpression
+from src.expression.tuple_value_expression import TupleValueExpression
+from src.models.storage.batch import Batch
+
+
+class ExpressionCompilerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.batch = Batch(pd.DataFrame({'id': [1, 2, 3, 4, 5, 6],
+                                         'label': ['a', 'b', 'a', 'b',
+                                                   'a', 'b']}))
+
+    def _compare(self, etype, col, value):
+        return ComparisonExpression(etype, TupleValueExpression(col),
+                                    ConstantValueExpression(value))
+
+    def _assert_same_as_evaluate(self, predicate):
+        expected = predicate.evaluate(self.batch).frames[0].to_numpy()
+        actual = compile_predicate(predicate)(self.batch)
+        self.assertEqual(actual.dtype, np.bool_)
+        self.assertEqual(list(expected), list(actual))
+
+    def test_should_compile_comparisons(self):
+        for etype in [ExpressionType.COMPARE_EQUAL,
+                      ExpressionType.COMPARE_NEQ,
+                      ExpressionType.COMPARE_GREATER,
+                      ExpressionType.COMPARE_LESSER,
+                      ExpressionType.COMPARE_GEQ,
+                      ExpressionType.COMPARE_LEQ]:
+            self._assert_same_as_evaluate(self._compare(etype, 'id', 3))
+        self._assert_same_as_evaluate(
+            self._compare(ExpressionType.COMPARE_EQUAL, 'label', 'a'))
+
+    def test_should_compile_arithmetic(self):
+        double_id = ArithmeticExpression(ExpressionType.ARITHMETIC_MULTIPLY,
+                                         TupleValueExpression('id'),
+                                         ConstantValueExpression(2))
+        predicate = ComparisonExpression(ExpressionType.COMPARE_GREATER,
+                                         double_id,
+                                         ConstantValueExpression(7))
+        self.assertEqual([False, False, False, True, True, True],
+                         list(compile_predicate(predicate)(self.batch)))
+
+    def test_should_compile_logical_operators(self):
+        lower = self._compare(ExpressionType.COMPARE_GREATER, 'id', 2)
+        upper = self._compare(ExpressionType.COMPARE_LESSER, 'id', 5)
+        label = self._compare(ExpressionType.COMPARE_EQUAL, 'label', 'a')
+        self._assert_same_as_evaluate(
+            LogicalExpression(ExpressionType.LOGICAL_AND, lower, upper))
+        self._assert_same_as_evaluate(
+            LogicalExpression(ExpressionType.LOGICAL_OR, upper, label))
+        self._assert_same_as_evaluate(
+            LogicalExpression(ExpressionType.LOGICAL_NOT, lower, None))
+
+    def test_should_broadcast_constant_predicate(self):
+        predicate = ComparisonExpression(ExpressionType.COMPARE_EQUAL,
+                                         ConstantValueExpression(1),
+                                         ConstantValueExpression(1))
+        self.assertEqual([True] * 6,
+                         list(compile_predicate(predicate)(self.batch)))
+
+    def test_should_fall_back_to_evaluate_for_arrays(self):
+        predicate = ComparisonExpression(
+            ExpressionType.COMPARE_CONTAINS,
+            ConstantValueExpression([1, 2]),
+            ConstantValueExpression([1]))
+        self.assertEqual([True] * 6,
+                         list(compile_predicate(predicate)(self.batch)))
+
+    def test_should_evaluate_udf_only_on_undecided_rows(self):
+        func = MagicMock(side_effect=lambda frames: pd.DataFrame(
+            frames['id'] % 2 == 0))
+        udf = FunctionExpression(func, children=[TupleValueExpression('id')])
+        lower = self._compare(ExpressionType.COMPARE_GREATER, 'id', 3)
+
+        predicate = LogicalExpression(ExpressionType.LOGICAL_AND, lower, udf)
+        self.assertEqual([False, False, False, True, False, True],
+                         list(compile_predicate(predicate)(self.batch)))
+        self.assertEqual([4, 5, 6],
+                         list(func.call_args[0][0]['id']))
+
+        func.reset_mock()
+        predicate = LogicalExpression(ExpressionType.LOGICAL_OR, lower, udf)
+        self.assertEqual([False, True, False, True, True, True],
+                         list(compile_predicate(predicate)(self.batch)))
+        self.assertEqual([1, 2, 3],
+                         list(func.call_args[0][0]['id']))
+
+    def test_should_skip_udf_if_left_side_decides_all_rows(self):
+        func = MagicMock()
+        udf = FunctionExpression(func, children=[TupleValueExpression('id')])
+        predicate = LogicalExpression(
+            ExpressionType.LOGICAL_AND,
+            self._compare(ExpressionType.COMPARE_GREATER, 'id', 10), udf)
+        self.assertEqual([False] * 6,
+                         list(compile_predicate(predicate)(self.batch)))
+        func.assert_not_called()
@@ -81,3 +81,36 @@ class ExpressionEvaluationTest(unittest.TestCase):
         self.assertNotEqual(aggr_expr, tuple_expr)
         self.assertNotEqual(tuple_expr, cmpr_exp)
         self.assertNotEqual(logical_expr, cmpr_exp)
+
+    def test_equal_expr_trees_should_have_equal_fingerprints(self):
+        def tree(value, column='DATA'):
+            return LogicalExpression(
+                ExpressionType.LOGICAL_AND,
+                ComparisonExpression(ExpressionType.COMPARE_GREATER,
+                                     TupleValueExpression(col_name=column),
+                                     ConstantValueExpression(value)),
+                ComparisonExpression(ExpressionType.COMPARE_EQUAL,
+                                     TupleValueExpression(col_name='ID'),
+                                     ConstantValueExpression([1, 2])))
+
+        self.assertEqual(tree(0), tree(0))
+        self.assertEqual(tree(0).fingerprint(), tree(0).fingerprint())
+        self.assertNotEqual(tree(0).fingerprint(), tree(1).fingerprint())
+        self.assertNotEqual(tree(0).fingerprint(),
+                            tree(0, 'ID').fingerprint())
+
+    def test_should_print_expr_tree(self):
+        cmpr_exp = ComparisonExpression(
+            ExpressionType.COMPARE_GEQ,
+            FunctionExpression(lambda x: x, name='Yolo', output='label',
+                               children=[TupleValueExpression('data')]),
+            ConstantValueExpression('car'))
+        logical_expr = LogicalExpression(
+            ExpressionType.LOGICAL_NOT, cmpr_exp, None)
+        aggr_expr = AggregationExpression(
+            ExpressionType.AGGREGATION_COUNT, TupleValueExpression('id'),
+            None)
+        self.assertEqual(str(cmpr_exp), "(Yolo(data).label >= 'car')")
+        self.assertEqual(str(logical_expr),
+                         "NOT (Yolo(data).label >= 'car')")
+        self.assertEqual(str(aggr_expr), 'COUNT(id)')
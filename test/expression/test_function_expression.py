@@ -20,8 +20,11 @@ from mock import MagicMock, Mock, patch
 from src.constants import NO_GPU
 from src.expression.function_expression import FunctionExpression, \
     ExecutionMode
+from src.expression.tuple_value_expression import TupleValueExpression
 from src.models.storage.batch import Batch
 from src.udfs.gpu_compatible import GPUCompatible
+from src.udfs.udf_result_memo import UdfResultMemo
+from src.udfs.udf_runtime_statistics import UdfRuntimeStatistics
 
 
 class FunctionExpressionTest(unittest.TestCase):
@@ -100,3 +103,68 @@ class FunctionExpressionTest(unittest.TestCase):
         input_batch = Batch(frames=pd.DataFrame())
         expression.evaluate(input_batch)
         mock_function.assert_called()
+
+    def test_should_use_result_cache_if_ids_are_available(self):
+        func = MagicMock()
+        cache = MagicMock()
+        cache.id_column = 'id'
+        cache.evaluate.return_value = pd.DataFrame({'label': [1, 2]})
+        expression = FunctionExpression(func)
+        expression.result_cache = cache
+        expression.append_child(TupleValueExpression('data'))
+        values = pd.DataFrame({'id': [4, 5], 'data': [1, 2]})
+
+        actual = expression.evaluate(Batch(values))
+        self.assertEqual(actual, Batch(pd.DataFrame({'label': [1, 2]})))
+        ids, frames, _ = cache.evaluate.call_args[0]
+        self.assertEqual(list(ids), [4, 5])
+        self.assertEqual(list(frames.columns), ['data'])
+        func.assert_not_called()
+
+        # without ids the function is called on all the rows
+        func.return_value = pd.DataFrame({'label': [3, 4]})
+        actual = expression.evaluate(Batch(values[['data']]))
+        self.assertEqual(actual, Batch(pd.DataFrame({'label': [3, 4]})))
+        self.assertEqual(cache.evaluate.call_count, 1)
+
+    def test_should_share_results_with_equal_calls(self):
+        func = MagicMock(side_effect=lambda frames: pd.DataFrame(
+            {'label': frames['data'] * 10, 'score': frames['data']}))
+        shared_results = [UdfResultMemo('id')]
+        label = FunctionExpression(func, output='label')
+        score = FunctionExpression(func, output='score')
+        for expression in [label, score]:
+            expression.shared_results_key = 0
+            expression.append_child(TupleValueExpression('data'))
+        values = pd.DataFrame({'id': [4, 5], 'data': [1, 2]})
+
+        actual = label.evaluate(Batch(values), shared_results=shared_results)
+        self.assertEqual(actual, Batch(pd.DataFrame({'label': [10, 20]})))
+        actual = score.evaluate(Batch(values.iloc[[1]]),
+                                shared_results=shared_results)
+        self.assertEqual(actual, Batch(pd.DataFrame({'score': [2]})))
+        func.assert_called_once()
+
+        # without the results of the scan every call runs the function
+        score.evaluate(Batch(values))
+        self.assertEqual(func.call_count, 2)
+
+    def test_should_record_runtime_of_named_functions(self):
+        statistics = UdfRuntimeStatistics()
+        statistics.reset()
+        expression = FunctionExpression(lambda x: pd.DataFrame(x),
+                                        name='udf')
+        expression.evaluate(Batch(pd.DataFrame([1, 2, 3])))
+        self.assertIsNotNone(statistics.cost('udf'))
+
+        FunctionExpression(lambda x: pd.DataFrame(x)).evaluate(
+            Batch(pd.DataFrame([1])))
+        self.assertIsNone(statistics.cost(None))
+        statistics.reset()
+
+    @patch('src.expression.function_expression.record_udf_call')
+    def test_should_count_udf_calls(self, mock_record):
+        expression = FunctionExpression(lambda x: pd.DataFrame(x),
+                                        name='udf')
+        expression.evaluate(Batch(pd.DataFrame([1, 2, 3])))
+        mock_record.assert_called_once_with('udf')
@@ -0,0 +1,62 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import unittest
+
+from src.catalog.catalog_manager import CatalogManager
+from src.server.command_handler import execute_query_fetch_all
+
+from test.util import create_sample_video
+
+NUM_FRAMES = 10
+
+
+class ExplainExecutorTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        CatalogManager().reset()
+        create_sample_video(NUM_FRAMES)
+        load_query = """LOAD DATA INFILE 'dummy.avi' INTO MyVideo;"""
+        execute_query_fetch_all(load_query)
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove('dummy.avi')
+
+    def test_should_explain_pushed_down_plan(self):
+        select_query = """EXPLAIN SELECT id FROM MyVideo WHERE id > 7
+            ORDER BY id LIMIT 2;"""
+        actual_batch = execute_query_fetch_all(select_query)
+        lines = list(actual_batch.frames['plan'])
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].startswith('TOP_K(orderby=id ASC, limit=2'))
+        self.assertTrue(lines[1].startswith(
+            '  SEQUENTIAL_SCAN(predicate=(id > 7), columns=[id]'))
+        self.assertTrue(lines[2].startswith('    STORAGE_PLAN(table=MyVideo'))
+        self.assertIn('columns=[\'id\']', lines[2])
+        self.assertIn('column_ranges={\'id\': (7, None)}', lines[2])
+        self.assertIn('batch_size=', lines[2])
+        self.assertNotIn('actual', lines[0])
+
+    def test_should_explain_analyze_plan(self):
+        select_query = """EXPLAIN ANALYZE SELECT id FROM MyVideo
+            WHERE id > 7;"""
+        actual_batch = execute_query_fetch_all(select_query)
+        lines = list(actual_batch.frames['plan'])
+        self.assertEqual(len(lines), 2)
+        self.assertIn('(actual ', lines[0])
+        self.assertIn('rows={}->2'.format(NUM_FRAMES), lines[0])
+        self.assertIn('rows=0->{}'.format(NUM_FRAMES), lines[1])
@@ -0,0 +1,70 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+# dependencies which are only imported once they are used
+DEFERRED_MODULES = ['torch', 'torchvision', 'pyspark', 'petastorm', 'cv2']
+
+# upper bound (in seconds) for importing an entry point in a fresh
+# interpreter. Wall-clock time depends on the machine, it is only reported
+# unless a budget is set, e.g. EVA_IMPORT_TIME_BUDGET=5 on a dedicated
+# benchmark host.
+IMPORT_TIME_BUDGET = os.environ.get('EVA_IMPORT_TIME_BUDGET')
+
+_PROBE = """
+import sys
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+print(','.join(name for name in {deferred} if name in sys.modules))
+"""
+
+
+class ImportTimeTest(unittest.TestCase):
+    """
+    Benchmarks the startup of the server and the client, which
+    restart often, e.g. when workers are autoscaled.
+    """
+
+    def _import(self, module: str):
+        root = Path(__file__).resolve().parents[2]
+        output = subprocess.run(
+            [sys.executable, '-c',
+             _PROBE.format(module=module, deferred=DEFERRED_MODULES)],
+            cwd=str(root), check=True, stdout=subprocess.PIPE,
+            universal_newlines=True).stdout.splitlines()
+        seconds = float(output[-2])
+        imported = [name for name in output[-1].split(',') if name]
+        print('import {}: {:.3f}s'.format(module, seconds))
+        return seconds, imported
+
+    def _check_time(self, seconds: float):
+        if IMPORT_TIME_BUDGET is not None:
+            self.assertLess(seconds, float(IMPORT_TIME_BUDGET))
+
+    def test_server_startup(self):
+        seconds, imported = self._import('eva')
+        self.assertEqual(imported, [])
+        self._check_time(seconds)
+
+    def test_client_startup(self):
+        seconds, imported = self._import('eva_client')
+        self.assertEqual(imported, [])
+        self._check_time(seconds)
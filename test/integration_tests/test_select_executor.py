@@ -17,6 +17,7 @@ import unittest
 
 import numpy as np
 import pandas as pd
+from mock import patch
 
 from src.catalog.catalog_manager import CatalogManager
 from src.models.storage.batch import Batch
@@ -166,6 +167,17 @@ class SelectExecutorTest(unittest.TestCase):
         self.assertEqual(actual_batch.batch_size, expected_batch[0].batch_size)
         self.assertEqual(actual_batch, expected_batch[0])
 
+    def test_select_and_orderby_with_limit(self):
+        select_query = "SELECT data, id FROM MyVideo ORDER BY id DESC LIMIT 3;"
+        actual_batch = execute_query_fetch_all(select_query)
+        expected_rows = [{'data': np.array(np.ones((2, 2, 3)) *
+                                           float(i + 1) * 25, dtype=np.uint8),
+                          'id': i
+                          } for i in reversed(range(NUM_FRAMES - 3,
+                                                    NUM_FRAMES))]
+        expected_batch = Batch(frames=pd.DataFrame(expected_rows))
+        self.assertEqual(actual_batch, expected_batch)
+
     def test_select_and_sample(self):
         select_query = "SELECT id,data FROM MyVideo SAMPLE 7;"
         actual_batch = execute_query_fetch_all(select_query)
@@ -176,3 +188,22 @@ class SelectExecutorTest(unittest.TestCase):
 
         self.assertEqual(actual_batch.batch_size, expected_batch[0].batch_size)
         self.assertEqual(actual_batch, expected_batch[0])
+
+    def test_select_and_sample_with_predicate(self):
+        select_query = "SELECT id,data FROM MyVideo SAMPLE 2 WHERE id > 4;"
+        actual_batch = execute_query_fetch_all(select_query)
+        actual_batch.sort()
+
+        expected_batch = list(create_dummy_batches(
+            filters=range(6, NUM_FRAMES, 2)))
+
+        self.assertEqual(actual_batch, expected_batch[0])
+
+    @patch('src.optimizer.rules.rules._parallel_scan_workers',
+           return_value=2)
+    def test_select_with_parallel_scan(self, mock_workers):
+        select_query = "SELECT id,data FROM MyVideo WHERE id > 1 AND id < 8;"
+        actual_batch = execute_query_fetch_all(select_query)
+        # the shards are merged in id order
+        expected_batch = list(create_dummy_batches(filters=range(2, 8)))
+        self.assertEqual(actual_batch, expected_batch[0])
@@ -15,10 +15,14 @@
 import unittest
 import os
 import pandas as pd
+from mock import patch
 
 from src.catalog.catalog_manager import CatalogManager
+from src.configuration.configuration_manager import ConfigurationManager
 from src.models.storage.batch import Batch
 from src.server.command_handler import execute_query_fetch_all
+from src.udfs.udf_registry import UdfRegistry
+from src.udfs.udf_result_cache import CACHE_DIRECTORY
 
 from test.util import create_sample_video, create_dummy_batches, \
     DummyObjectDetector
@@ -102,3 +106,81 @@ class UDFExecutorTest(unittest.TestCase):
                          for i in range(2, NUM_FRAMES)
                          if i % 2 == 0]))[0]
         self.assertEqual(actual_batch, expected_batch)
+
+    @patch('src.optimizer.rules.rules.bind_udf_result_cache',
+           return_value=False)
+    def test_should_evaluate_shared_udf_once_per_frame(self, mock_bind):
+        select_query = "SELECT id,DummyObjectDetector(data) FROM MyVideo \
+            WHERE DummyObjectDetector(data).label = ['person'] ORDER BY id;"
+        udf = UdfRegistry().get('DummyObjectDetector',
+                                os.path.abspath('test/util.py'))
+        with patch.object(udf, 'classify', wraps=udf.classify) as classify:
+            actual_batch = execute_query_fetch_all(select_query)
+            frames = sum(len(call[0][0]) for call in classify.call_args_list)
+        expected = [{'id': i * 2, 'label': ['person']}
+                    for i in range(NUM_FRAMES // 2)]
+        self.assertEqual(actual_batch, Batch(frames=pd.DataFrame(expected)))
+        # the projection reuses the labels computed by the predicate
+        self.assertEqual(frames, NUM_FRAMES)
+
+    @patch('src.optimizer.rules.rules.bind_udf_result_cache',
+           return_value=False)
+    def test_should_run_udf_after_cheap_predicates(self, mock_bind):
+        select_query = "SELECT id FROM MyVideo \
+            WHERE DummyObjectDetector(data).label = ['person'] AND id < 4 \
+            ORDER BY id;"
+        udf = UdfRegistry().get('DummyObjectDetector',
+                                os.path.abspath('test/util.py'))
+        with patch.object(udf, 'classify', wraps=udf.classify) as classify:
+            actual_batch = execute_query_fetch_all(select_query)
+            frames = sum(len(call[0][0]) for call in classify.call_args_list)
+        self.assertEqual(actual_batch,
+                         Batch(frames=pd.DataFrame({'id': [0, 2]})))
+        # the detector only sees the frames with small ids
+        self.assertEqual(frames, 4)
+
+    def test_should_reuse_udf_results_across_queries(self):
+        config = ConfigurationManager()._cfg['executor']
+        with patch.dict(config, {'udf_result_cache': True}):
+            self._reuse_udf_results_across_queries()
+
+    def _reuse_udf_results_across_queries(self):
+        select_query = "SELECT id,DummyObjectDetector(data) FROM MyVideo \
+            WHERE id < 4 ORDER BY id;"
+        expected_batch = execute_query_fetch_all(select_query)
+
+        udf = UdfRegistry().get('DummyObjectDetector',
+                                os.path.abspath('test/util.py'))
+        with patch.object(udf, 'classify', wraps=udf.classify) as classify:
+            actual_batch = execute_query_fetch_all(select_query)
+            self.assertEqual(actual_batch, expected_batch)
+            classify.assert_not_called()
+
+            # only the new frames are sent to the model
+            select_query = "SELECT id,DummyObjectDetector(data) FROM MyVideo \
+                ORDER BY id;"
+            actual_batch = execute_query_fetch_all(select_query)
+            labels = DummyObjectDetector().labels
+            expected = [{'id': i, 'label': [labels[1 + i % 2]]}
+                        for i in range(NUM_FRAMES)]
+            self.assertEqual(actual_batch,
+                             Batch(frames=pd.DataFrame(expected)))
+            frames = sum(len(call[0][0]) for call in classify.call_args_list)
+            self.assertEqual(frames, NUM_FRAMES - 4)
+
+        # reloading the table drops the stored results
+        table_path = CatalogManager().get_dataset_metadata(
+            None, 'MyVideo').file_url
+        self.assertTrue(os.listdir(os.path.join(table_path, CACHE_DIRECTORY)))
+        execute_query_fetch_all("LOAD DATA INFILE 'dummy.avi' INTO MyVideo;")
+        self.assertFalse(os.path.exists(
+            os.path.join(table_path, CACHE_DIRECTORY)))
+
+        # and so does inserting frames
+        execute_query_fetch_all(select_query)
+        self.assertTrue(os.listdir(os.path.join(table_path, CACHE_DIRECTORY)))
+        execute_query_fetch_all("""INSERT INTO MyVideo (id, data) VALUES
+            (0, [[[40, 40, 40], [40, 40, 40]], [[40, 40, 40], [40, 40, 40]]]);
+            """)
+        self.assertFalse(os.path.exists(
+            os.path.join(table_path, CACHE_DIRECTORY)))
@@ -28,6 +28,11 @@ class ResponseTest(unittest.TestCase):
         response2 = Response.from_json(response.to_json())
         self.assertEqual(response, response2)
 
+    def test_server_reponse_from_bytes(self):
+        batch = Batch(frames=create_dataframe())
+        response = Response(status=ResponseStatus.SUCCESS,
+                            batch=batch, metrics={'time': 1})
+        self.assertEqual(response, Response.from_bytes(response.to_bytes()))
 
-
-
+        response = Response(status=ResponseStatus.FAIL, batch=None)
+        self.assertEqual(response, Response.from_bytes(response.to_bytes()))
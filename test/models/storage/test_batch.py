@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import pandas as pd
+import pickle
 import unittest
 
 import numpy as np
@@ -29,6 +30,29 @@ class BatchTest(unittest.TestCase):
         batch2 = Batch.from_json(batch.to_json())
         self.assertEqual(batch, batch2)
 
+    def test_batch_from_bytes(self):
+        batch = Batch(frames=create_dataframe(2),
+                      identifier_column='id')
+        batch2 = Batch.from_bytes(batch.to_bytes())
+        self.assertEqual(batch, batch2)
+        self.assertEqual(batch2.identifier_column, 'id')
+
+    def test_batch_from_bytes_should_keep_arrays_of_any_shape(self):
+        frames = pd.DataFrame({'id': [1, 2],
+                               'boxes': [np.zeros((2, 4)), np.ones((1, 4))],
+                               'label': ['car', None]})
+        batch = Batch.from_bytes(Batch(frames).to_bytes())
+        self.assertEqual(batch, Batch(frames))
+
+    def test_batch_from_bytes_should_not_unpickle(self):
+        class Payload(object):
+            def __reduce__(self):
+                return (exec, ('raise AssertionError("executed")',))
+
+        with self.assertRaises(Exception) as context:
+            Batch.from_bytes(pickle.dumps(Payload()))
+        self.assertNotIsInstance(context.exception, AssertionError)
+
     def test_frames_as_numpy_array_should_frames_as_numpy_array(self):
         batch = Batch(frames=create_dataframe_same(2))
         expected = list(np.ones((2, 1, 1)))
@@ -127,3 +151,139 @@ class BatchTest(unittest.TestCase):
     def test_should_return_empty_dataframe(self):
         batch = Batch()
         self.assertEqual(batch, Batch(create_dataframe(0)))
+
+    def test_from_frame_array_should_wrap_array_without_copy(self):
+        data = np.arange(2 * 2 * 2 * 3, dtype=np.uint8).reshape(2, 2, 2, 3)
+        batch = Batch.from_frame_array(data, start_id=5)
+        self.assertEqual(list(batch.frames['id']), [5, 6])
+        self.assertIs(batch.column_as_numpy_array(), data)
+        for frame in batch.frames['data']:
+            self.assertTrue(np.shares_memory(frame, data))
+        self.assertIs(batch.project(['data']).column_as_numpy_array(), data)
+        self.assertNotIn('data', batch.project(['id'])._columns)
+
+    def test_from_frame_array_should_step_ids(self):
+        data = np.zeros((3, 2, 2, 3), dtype=np.uint8)
+        batch = Batch.from_frame_array(data, start_id=7, id_step=7)
+        self.assertEqual(list(batch.frames['id']), [7, 14, 21])
+
+    def test_from_frame_array_should_drop_array_on_reorder(self):
+        data = np.arange(2 * 2 * 2 * 3, dtype=np.uint8).reshape(2, 2, 2, 3)
+        batch = Batch.from_frame_array(data)
+        batch.reverse()
+        actual = batch.column_as_numpy_array()
+        self.assertIsNot(actual, data)
+        self.assertTrue(np.array_equal(actual[0], data[1]))
+
+    def test_columnar_batch_should_share_arrays(self):
+        ids = np.arange(4)
+        data = np.zeros((4, 2, 2, 3), dtype=np.uint8)
+        batch = Batch.from_columns({'id': ids, 'data': data})
+        self.assertEqual(batch.columns, ['id', 'data'])
+        self.assertEqual(len(batch), 4)
+
+        projected = batch.project(['data'])
+        self.assertIs(projected.column_as_numpy_array('data'), data)
+        merged = Batch.merge_column_wise([batch.project(['id']), projected])
+        self.assertIs(merged.column_as_numpy_array('id'), ids)
+        self.assertIs(merged.column_as_numpy_array('data'), data)
+        # no dataframe got built on the way
+        self.assertIsNone(merged._frames)
+
+    def test_columnar_batch_should_slice_views(self):
+        data = np.arange(4 * 2 * 2 * 3, dtype=np.uint8).reshape(4, 2, 2, 3)
+        batch = Batch.from_frame_array(data)
+
+        sliced = batch[1:3]
+        self.assertEqual(list(sliced.column_as_numpy_array('id')), [1, 2])
+        self.assertTrue(np.shares_memory(sliced.column_as_numpy_array(),
+                                         data))
+        self.assertEqual(sliced, Batch.from_frame_array(data[1:3], 1))
+
+        masked = batch[np.array([True, False, False, True])]
+        self.assertEqual(list(masked.frames['id']), [0, 3])
+        self.assertTrue(np.array_equal(masked.column_as_numpy_array(),
+                                       data[[0, 3]]))
+
+    def test_should_select_rows_of_frames_by_mask(self):
+        batch = Batch(frames=create_dataframe(3))
+        expected = Batch(frames=create_dataframe(3).iloc[[2], :]
+                         .reset_index(drop=True))
+        self.assertEqual(expected, batch[np.array([False, False, True])])
+        self.assertEqual(expected, batch[np.array([2])])
+
+    def test_should_compare_batches_regardless_of_column_order(self):
+        frames = pd.DataFrame({'id': [0, 1], 'label': ['a', 'b']})
+        batch = Batch(frames[['label', 'id']])
+        self.assertEqual(batch.columns, ['label', 'id'])
+        self.assertEqual(batch, Batch(frames))
+        self.assertEqual(batch, Batch.from_columns(
+            {'id': np.array([0, 1]), 'label': np.array(['a', 'b'],
+                                                       dtype=object)}))
+
+    def test_sort_should_not_modify_given_frames(self):
+        frames = pd.DataFrame({'id': [2, 1, 0]})
+        batch = Batch(frames)
+        batch.sort()
+        self.assertEqual(list(batch.frames['id']), [0, 1, 2])
+        self.assertEqual(list(frames['id']), [2, 1, 0])
+
+    def test_columnar_batch_from_bytes(self):
+        data = np.arange(2 * 2 * 2 * 3, dtype=np.uint8).reshape(2, 2, 2, 3)
+        batch = Batch.from_frame_array(data)
+        batch2 = Batch.from_bytes(batch.to_bytes())
+        self.assertIsNone(batch2._frames)
+        self.assertTrue(np.array_equal(batch2.column_as_numpy_array(), data))
+        self.assertEqual(batch, batch2)
+
+    def test_concat_columnar_batches(self):
+        data = np.arange(3 * 2 * 2 * 3, dtype=np.uint8).reshape(3, 2, 2, 3)
+        batch = Batch.concat([Batch.from_frame_array(data[:1]),
+                              Batch.from_frame_array(data[1:], 1)])
+        self.assertTrue(np.array_equal(batch.column_as_numpy_array(), data))
+        self.assertEqual(batch, Batch.from_frame_array(data))
+
+    def test_concat_and_merge_should_keep_identifier_column(self):
+        data = np.zeros((2, 2, 2, 3), dtype=np.uint8)
+        columnar = Batch.from_columns({'key': np.arange(2), 'data': data},
+                                      'key')
+        other = Batch.from_columns({'label': np.arange(2)}, 'key')
+        frames = Batch(create_dataframe(2), 'key')
+        for batch in [Batch.concat([columnar, columnar]),
+                      Batch.concat([frames, frames]),
+                      Batch.merge_column_wise([columnar, other]),
+                      Batch.merge_column_wise([frames, other])]:
+            self.assertEqual(batch.identifier_column, 'key')
+
+    def test_column_as_numpy_array_should_not_copy_frames(self):
+        batch = Batch(create_dataframe(3))
+        array = batch.column_as_numpy_array('id')
+        self.assertTrue(np.shares_memory(array, batch.frames['id'].values))
+
+    def test_from_columns_should_fail_for_different_lengths(self):
+        with self.assertRaises(ValueError):
+            Batch.from_columns({'id': np.arange(2), 'data': np.arange(3)})
+
+    def test_nbytes_should_count_frame_arrays(self):
+        data = np.zeros((3, 2, 2, 3), dtype=np.uint8)
+        batch = Batch.from_frame_array(data)
+        self.assertEqual(batch.nbytes, data.nbytes + 3 * 8)
+        # the object column of the frames holds a pointer per row
+        frames = batch.frames
+        self.assertEqual(batch.nbytes, data.nbytes + 2 * 3 * 8)
+        self.assertEqual(Batch(frames.copy()).nbytes, batch.nbytes)
+
+    def test_nbytes_should_sample_object_columns(self):
+        class CountedArray(np.ndarray):
+            measured = 0
+
+            @property
+            def nbytes(self):
+                CountedArray.measured += 1
+                return super().nbytes
+
+        frames = pd.DataFrame({'data': [
+            np.zeros(10, dtype=np.uint8).view(CountedArray)
+            for _ in range(1000)]})
+        self.assertEqual(Batch(frames).nbytes, 1000 * 8 + 1000 * 10)
+        self.assertLess(CountedArray.measured, 100)
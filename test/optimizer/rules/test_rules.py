@@ -1,26 +1,43 @@
 import unittest
 
-from mock import MagicMock
+from mock import MagicMock, patch
 
 from src.optimizer.operators import (LogicalGet, LogicalProject, LogicalFilter,
                                      LogicalQueryDerivedGet, LogicalSample,
-                                     Dummy)
+                                     LogicalOrderBy, LogicalLimit,
+                                     LogicalExplain, Dummy)
 from src.optimizer.rules.rules import (EmbedProjectIntoGet, EmbedFilterIntoGet,
                                        EmbedFilterIntoDerivedGet,
                                        EmbedProjectIntoDerivedGet,
                                        PushdownFilterThroughSample,
                                        PushdownProjectThroughSample,
+                                       EmbedLimitIntoOrderBy,
+                                       EmbedSampleIntoGet,
+                                       EmbedLimitIntoGet,
                                        LogicalCreateToPhysical,
                                        LogicalCreateUDFToPhysical,
                                        LogicalInsertToPhysical,
                                        LogicalLoadToPhysical,
                                        LogicalSampleToUniformSample,
                                        LogicalGetToSeqScan,
+                                       LogicalGetToParallelSeqScan,
                                        LogicalDerivedGetToPhysical,
                                        LogicalUnionToPhysical,
                                        LogicalOrderByToPhysical,
-                                       LogicalLimitToPhysical)
+                                       LogicalOrderByToTopK,
+                                       LogicalLimitToPhysical,
+                                       LogicalExplainToPhysical)
 from src.optimizer.rules.rules import Promise, RulesManager
+from src.expression.constant_value_expression import ConstantValueExpression
+from src.expression.comparison_expression import ComparisonExpression
+from src.expression.tuple_value_expression import TupleValueExpression
+from src.expression.abstract_expression import ExpressionType
+from src.expression.logical_expression import LogicalExpression
+from src.expression.function_expression import FunctionExpression
+from src.planner.topk_plan import TopKPlan
+from src.planner.exchange_plan import ExchangePlan
+from src.planner.seq_scan_plan import SeqScanPlan
+from src.planner.explain_plan import ExplainPlan
 
 
 class TestRules(unittest.TestCase):
@@ -39,6 +56,12 @@ class TestRules(unittest.TestCase):
                         Promise.IMPLEMENTATION_DELIMETER)
         self.assertTrue(Promise.EMBED_PROJECT_INTO_GET >
                         Promise.IMPLEMENTATION_DELIMETER)
+        self.assertTrue(Promise.EMBED_LIMIT_INTO_ORDERBY >
+                        Promise.IMPLEMENTATION_DELIMETER)
+        self.assertTrue(Promise.EMBED_SAMPLE_INTO_GET >
+                        Promise.IMPLEMENTATION_DELIMETER)
+        self.assertTrue(Promise.EMBED_LIMIT_INTO_GET >
+                        Promise.IMPLEMENTATION_DELIMETER)
 
         # Promise of implementation rules should be lesser than rewrite rules
         self.assertTrue(Promise.LOGICAL_CREATE_TO_PHYSICAL <
@@ -49,18 +72,24 @@ class TestRules(unittest.TestCase):
                         Promise.IMPLEMENTATION_DELIMETER)
         self.assertTrue(Promise.LOGICAL_GET_TO_SEQSCAN <
                         Promise.IMPLEMENTATION_DELIMETER)
+        self.assertTrue(Promise.LOGICAL_GET_TO_PARALLEL_SEQSCAN <
+                        Promise.IMPLEMENTATION_DELIMETER)
         self.assertTrue(Promise.LOGICAL_INSERT_TO_PHYSICAL <
                         Promise.IMPLEMENTATION_DELIMETER)
         self.assertTrue(Promise.LOGICAL_LIMIT_TO_PHYSICAL <
                         Promise.IMPLEMENTATION_DELIMETER)
         self.assertTrue(Promise.LOGICAL_ORDERBY_TO_PHYSICAL <
                         Promise.IMPLEMENTATION_DELIMETER)
+        self.assertTrue(Promise.LOGICAL_ORDERBY_TO_TOPK <
+                        Promise.IMPLEMENTATION_DELIMETER)
         self.assertTrue(Promise.LOGICAL_SAMPLE_TO_UNIFORMSAMPLE <
                         Promise.IMPLEMENTATION_DELIMETER)
         self.assertTrue(Promise.LOGICAL_LOAD_TO_PHYSICAL <
                         Promise.IMPLEMENTATION_DELIMETER)
         self.assertTrue(Promise.LOGICAL_UNION_TO_PHYSICAL <
                         Promise.IMPLEMENTATION_DELIMETER)
+        self.assertTrue(Promise.LOGICAL_EXPLAIN_TO_PHYSICAL <
+                        Promise.IMPLEMENTATION_DELIMETER)
 
     def test_supported_rules(self):
         # adding/removing rules should update this test
@@ -69,7 +98,10 @@ class TestRules(unittest.TestCase):
                                    EmbedFilterIntoDerivedGet(),
                                    EmbedProjectIntoDerivedGet(),
                                    PushdownFilterThroughSample(),
-                                   PushdownProjectThroughSample()]
+                                   PushdownProjectThroughSample(),
+                                   EmbedLimitIntoOrderBy(),
+                                   EmbedSampleIntoGet(),
+                                   EmbedLimitIntoGet()]
         self.assertEqual(len(supported_rewrite_rules),
                          len(RulesManager().rewrite_rules))
         # check all the rule instance exists
@@ -84,10 +116,13 @@ class TestRules(unittest.TestCase):
             LogicalLoadToPhysical(),
             LogicalSampleToUniformSample(),
             LogicalGetToSeqScan(),
+            LogicalGetToParallelSeqScan(),
             LogicalDerivedGetToPhysical(),
             LogicalUnionToPhysical(),
             LogicalOrderByToPhysical(),
-            LogicalLimitToPhysical()]
+            LogicalOrderByToTopK(),
+            LogicalLimitToPhysical(),
+            LogicalExplainToPhysical()]
         self.assertEqual(len(supported_implementation_rules),
                          len(RulesManager().implementation_rules))
 
@@ -106,8 +141,11 @@ class TestRules(unittest.TestCase):
         logi_project = LogicalProject([expr1, expr2, expr3], [logi_get])
 
         rewrite_opr = rule.apply(logi_project, MagicMock())
-        self.assertEqual(rewrite_opr, logi_get)
+        self.assertIsInstance(rewrite_opr, LogicalGet)
+        self.assertEqual(rewrite_opr.video, logi_get.video)
         self.assertEqual(rewrite_opr.target_list, [expr1, expr2, expr3])
+        # the matched operator may be shared within the memo
+        self.assertIsNone(logi_get.target_list)
 
     # EmbedFilterIntoGet
     def test_simple_filter_into_get(self):
@@ -118,8 +156,10 @@ class TestRules(unittest.TestCase):
         logi_filter = LogicalFilter(predicate, [logi_get])
 
         rewrite_opr = rule.apply(logi_filter, MagicMock())
-        self.assertEqual(rewrite_opr, logi_get)
+        self.assertIsInstance(rewrite_opr, LogicalGet)
+        self.assertEqual(rewrite_opr.video, logi_get.video)
         self.assertEqual(rewrite_opr.predicate, predicate)
+        self.assertIsNone(logi_get.predicate)
 
     # EmbedFilterIntoDerivedGet
     def test_simple_filter_into_derived_get(self):
@@ -130,8 +170,10 @@ class TestRules(unittest.TestCase):
         logi_filter = LogicalFilter(predicate, [logi_derived_get])
 
         rewrite_opr = rule.apply(logi_filter, MagicMock())
-        self.assertEqual(rewrite_opr, logi_derived_get)
+        self.assertIsInstance(rewrite_opr, LogicalQueryDerivedGet)
+        self.assertEqual(rewrite_opr.children, logi_derived_get.children)
         self.assertEqual(rewrite_opr.predicate, predicate)
+        self.assertIsNone(logi_derived_get.predicate)
 
     # EmbedProjectIntoDerivedGet
 
@@ -143,8 +185,10 @@ class TestRules(unittest.TestCase):
         logi_project = LogicalProject(target_list, [logi_derived_get])
 
         rewrite_opr = rule.apply(logi_project, MagicMock())
-        self.assertEqual(rewrite_opr, logi_derived_get)
+        self.assertIsInstance(rewrite_opr, LogicalQueryDerivedGet)
+        self.assertEqual(rewrite_opr.children, logi_derived_get.children)
         self.assertEqual(rewrite_opr.target_list, target_list)
+        self.assertIsNone(logi_derived_get.target_list)
 
     # PushdownFilterThroughSample
     def test_pushdown_filter_thru_sample(self):
@@ -156,8 +200,11 @@ class TestRules(unittest.TestCase):
         logi_filter = LogicalFilter(predicate, [sample])
 
         rewrite_opr = rule.apply(logi_filter, MagicMock())
-        self.assertEqual(rewrite_opr, sample)
+        self.assertIsInstance(rewrite_opr, LogicalSample)
+        self.assertEqual(rewrite_opr.sample_freq, constexpr)
         self.assertEqual(rewrite_opr.children[0].predicate, predicate)
+        self.assertIsNone(logi_get.predicate)
+        self.assertEqual(sample.children, [logi_get])
 
     # PushdownProjectThroughSample
     def test_pushdown_project_thru_sample(self):
@@ -169,5 +216,196 @@ class TestRules(unittest.TestCase):
         logi_project = LogicalProject(target_list, [sample])
 
         rewrite_opr = rule.apply(logi_project, MagicMock())
-        self.assertEqual(rewrite_opr, sample)
+        self.assertIsInstance(rewrite_opr, LogicalSample)
+        self.assertEqual(rewrite_opr.sample_freq, constexpr)
         self.assertEqual(rewrite_opr.children[0].target_list, target_list)
+        self.assertIsNone(logi_get.target_list)
+        self.assertEqual(sample.children, [logi_get])
+
+    # EmbedLimitIntoOrderBy
+    def test_embed_limit_into_orderby(self):
+        rule = EmbedLimitIntoOrderBy()
+        orderby_list = MagicMock()
+        limit_count = MagicMock()
+        logi_orderby = LogicalOrderBy(orderby_list, [Dummy()])
+        logi_limit = LogicalLimit(limit_count, [logi_orderby])
+
+        rewrite_opr = rule.apply(logi_limit, MagicMock())
+        self.assertIsInstance(rewrite_opr, LogicalOrderBy)
+        self.assertEqual(rewrite_opr.limit_count, limit_count)
+        self.assertIsNone(logi_orderby.limit_count)
+        self.assertEqual(rewrite_opr.orderby_list, orderby_list)
+
+    # LogicalOrderByToPhysical, LogicalOrderByToTopK
+    def test_orderby_with_limit_should_use_topk(self):
+        orderby_rule = LogicalOrderByToPhysical()
+        topk_rule = LogicalOrderByToTopK()
+        logi_orderby = LogicalOrderBy(MagicMock(), [Dummy()])
+        self.assertTrue(orderby_rule.check(logi_orderby, MagicMock()))
+        self.assertFalse(topk_rule.check(logi_orderby, MagicMock()))
+
+        logi_orderby.limit_count = MagicMock()
+        self.assertFalse(orderby_rule.check(logi_orderby, MagicMock()))
+        self.assertTrue(topk_rule.check(logi_orderby, MagicMock()))
+
+        plan = topk_rule.apply(logi_orderby, MagicMock())
+        self.assertIsInstance(plan, TopKPlan)
+        self.assertEqual(plan.orderby_list, logi_orderby.orderby_list)
+        self.assertEqual(plan.limit_expression, logi_orderby.limit_count)
+
+    # LogicalExplainToPhysical
+    def test_logical_explain_to_physical(self):
+        rule = LogicalExplainToPhysical()
+        logi_explain = LogicalExplain(True, [Dummy()])
+        self.assertTrue(rule.check(logi_explain, MagicMock()))
+        plan = rule.apply(logi_explain, MagicMock())
+        self.assertIsInstance(plan, ExplainPlan)
+        self.assertTrue(plan.analyze)
+
+    # EmbedSampleIntoGet
+    def test_embed_sample_into_get(self):
+        rule = EmbedSampleIntoGet()
+        sample_freq = ConstantValueExpression(7)
+        logi_get = LogicalGet(MagicMock(), MagicMock())
+        sample = LogicalSample(sample_freq, [logi_get])
+
+        rewrite_opr = rule.apply(sample, MagicMock())
+        self.assertIsInstance(rewrite_opr, LogicalGet)
+        self.assertEqual(rewrite_opr.sample_freq, sample_freq)
+        self.assertIsNone(logi_get.sample_freq)
+
+        plan = LogicalGetToSeqScan().apply(rewrite_opr, MagicMock())
+        self.assertEqual(plan.children[0].skip_frames, 7)
+
+    # EmbedLimitIntoGet
+    def test_embed_limit_into_get(self):
+        rule = EmbedLimitIntoGet()
+        limit_count = ConstantValueExpression(5)
+        logi_get = LogicalGet(MagicMock(), MagicMock())
+        logi_limit = LogicalLimit(limit_count, [logi_get])
+
+        self.assertTrue(rule.check(logi_limit, MagicMock()))
+        rewrite_opr = rule.apply(logi_limit, MagicMock())
+        # the limit stays on top of the scan
+        self.assertIsInstance(rewrite_opr, LogicalLimit)
+        self.assertEqual(rewrite_opr.limit_count, limit_count)
+        self.assertEqual(rewrite_opr.children[0].limit_count, limit_count)
+        self.assertFalse(rule.check(rewrite_opr, MagicMock()))
+        self.assertIsNone(logi_get.limit_count)
+
+        plan = LogicalGetToSeqScan().apply(rewrite_opr.children[0],
+                                           MagicMock())
+        self.assertEqual(plan.children[0].limit, 5)
+
+    def test_should_not_embed_limit_into_get_with_predicate(self):
+        rule = EmbedLimitIntoGet()
+        logi_get = LogicalGet(MagicMock(), MagicMock())
+        logi_get.predicate = MagicMock()
+        logi_limit = LogicalLimit(ConstantValueExpression(5), [logi_get])
+        self.assertFalse(rule.check(logi_limit, MagicMock()))
+
+    # LogicalGetToSeqScan
+    def test_get_to_seqscan_should_only_read_referenced_columns(self):
+        logi_get = LogicalGet(MagicMock(), MagicMock())
+        plan = LogicalGetToSeqScan().apply(logi_get, MagicMock())
+        self.assertIsNone(plan.children[0].columns)
+
+        logi_get.target_list = [TupleValueExpression('id')]
+        logi_get.predicate = ComparisonExpression(
+            ExpressionType.COMPARE_GREATER, TupleValueExpression('label'),
+            ConstantValueExpression(2))
+        plan = LogicalGetToSeqScan().apply(logi_get, MagicMock())
+        self.assertEqual(plan.children[0].columns, ['id', 'label'])
+
+    @patch('src.optimizer.rules.rules.bind_udf_result_cache')
+    def test_get_to_seqscan_should_read_ids_for_cached_udfs(self, mock_bind):
+        logi_get = LogicalGet(MagicMock(), MagicMock())
+        logi_get.dataset_metadata.identifier_column = 'id'
+        logi_get.target_list = [TupleValueExpression('data')]
+        mock_bind.return_value = False
+        plan = LogicalGetToSeqScan().apply(logi_get, MagicMock())
+        self.assertEqual(plan.children[0].columns, ['data'])
+
+        mock_bind.return_value = True
+        plan = LogicalGetToSeqScan().apply(logi_get, MagicMock())
+        self.assertEqual(plan.children[0].columns, ['data', 'id'])
+        mock_bind.assert_called_with(logi_get.target_list + [None],
+                                     logi_get.dataset_metadata)
+
+    @patch('src.optimizer.rules.rules.bind_shared_udf_results')
+    def test_get_to_seqscan_should_share_udf_results(self, mock_bind):
+        logi_get = LogicalGet(MagicMock(), MagicMock())
+        logi_get.dataset_metadata.identifier_column = 'id'
+        logi_get.target_list = [TupleValueExpression('data')]
+        mock_bind.return_value = 0
+        plan = LogicalGetToSeqScan().apply(logi_get, MagicMock())
+        self.assertEqual(plan.shared_udf_calls, 0)
+        self.assertEqual(plan.children[0].columns, ['data'])
+
+        mock_bind.return_value = 2
+        plan = LogicalGetToSeqScan().apply(logi_get, MagicMock())
+        self.assertEqual(plan.shared_udf_calls, 2)
+        self.assertEqual(plan.id_column, 'id')
+        self.assertEqual(plan.children[0].columns, ['data', 'id'])
+        mock_bind.assert_called_with(logi_get.target_list + [None])
+
+    def test_get_to_seqscan_should_skip_row_groups_out_of_range(self):
+        logi_get = LogicalGet(MagicMock(), MagicMock())
+        plan = LogicalGetToSeqScan().apply(logi_get, MagicMock())
+        self.assertIsNone(plan.children[0].column_ranges)
+
+        logi_get.predicate = LogicalExpression(
+            ExpressionType.LOGICAL_AND,
+            ComparisonExpression(ExpressionType.COMPARE_GREATER,
+                                 TupleValueExpression('id'),
+                                 ConstantValueExpression(1000)),
+            ComparisonExpression(ExpressionType.COMPARE_LESSER,
+                                 TupleValueExpression('id'),
+                                 ConstantValueExpression(2000)))
+        plan = LogicalGetToSeqScan().apply(logi_get, MagicMock())
+        self.assertEqual(plan.children[0].column_ranges,
+                         {'id': (1000, 2000)})
+        # the scan still filters the rows of the remaining row groups
+        self.assertEqual(plan.predicate, logi_get.predicate)
+
+    def test_get_to_seqscan_should_reorder_predicate(self):
+        logi_get = LogicalGet(MagicMock(), MagicMock())
+        udf_term = ComparisonExpression(
+            ExpressionType.COMPARE_EQUAL,
+            FunctionExpression(MagicMock(), name='udf', output='label'),
+            ConstantValueExpression('car'))
+        id_term = ComparisonExpression(ExpressionType.COMPARE_LESSER,
+                                       TupleValueExpression('id'),
+                                       ConstantValueExpression(100))
+        logi_get.predicate = LogicalExpression(ExpressionType.LOGICAL_AND,
+                                               udf_term, id_term)
+        plan = LogicalGetToSeqScan().apply(logi_get, MagicMock())
+        self.assertEqual(plan.predicate, LogicalExpression(
+            ExpressionType.LOGICAL_AND, id_term, udf_term))
+        self.assertEqual(plan.children[0].column_ranges, {'id': (None, 100)})
+
+    # LogicalGetToParallelSeqScan
+    @patch('src.optimizer.rules.rules.ConfigurationManager')
+    def test_get_to_parallel_seqscan(self, mock_config):
+        mock_config.return_value.get_value.return_value = 1
+        logi_get = LogicalGet(MagicMock(), MagicMock())
+        logi_get.dataset_metadata.identifier_column = 'id'
+        self.assertTrue(LogicalGetToSeqScan().check(logi_get, MagicMock()))
+        self.assertFalse(
+            LogicalGetToParallelSeqScan().check(logi_get, MagicMock()))
+
+        mock_config.return_value.get_value.return_value = 4
+        rule = LogicalGetToParallelSeqScan()
+        self.assertFalse(LogicalGetToSeqScan().check(logi_get, MagicMock()))
+        self.assertTrue(rule.check(logi_get, MagicMock()))
+
+        plan = rule.apply(logi_get, MagicMock())
+        self.assertIsInstance(plan, ExchangePlan)
+        self.assertEqual(plan.workers, 4)
+        self.assertEqual(plan.order_column, 'id')
+        self.assertIsInstance(plan.children[0], SeqScanPlan)
+
+        # the order can not be kept if the ids are not projected
+        logi_get.target_list = [TupleValueExpression('data')]
+        plan = rule.apply(logi_get, MagicMock())
+        self.assertIsNone(plan.order_column)
@@ -2,8 +2,15 @@ import unittest
 
 from mock import MagicMock
 
+from src.expression.abstract_expression import ExpressionType
+from src.expression.comparison_expression import ComparisonExpression
+from src.expression.constant_value_expression import ConstantValueExpression
+from src.expression.tuple_value_expression import TupleValueExpression
+from src.optimizer.group_expression import GroupExpression
 from src.optimizer.memo import Memo
 from src.optimizer.group import INVALID_GROUP_ID
+from src.optimizer.operators import LogicalFilter, LogicalGet
+from src.planner.seq_scan_plan import SeqScanPlan
 
 
 class MemoTest(unittest.TestCase):
@@ -42,3 +49,56 @@ class MemoTest(unittest.TestCase):
         self.assertEqual(ret_expr.group_id, 0)
         self.assertEqual(len(memo.groups), 1)
         self.assertEqual(len(memo.group_exprs), 1)
+
+    def _filter_expr(self, value, children=[0]):
+        predicate = ComparisonExpression(ExpressionType.COMPARE_EQUAL,
+                                         TupleValueExpression('id'),
+                                         ConstantValueExpression(value))
+        return GroupExpression(LogicalFilter(predicate), INVALID_GROUP_ID,
+                               list(children))
+
+    def test_memo_should_find_structurally_equal_expr(self):
+        memo = Memo()
+        memo.add_group_expr(GroupExpression(LogicalGet(None, None)))
+        group_expr = memo.add_group_expr(self._filter_expr(1))
+        self.assertIs(memo.add_group_expr(self._filter_expr(1)), group_expr)
+        self.assertEqual(memo.get_group_id(self._filter_expr(1)), 1)
+        self.assertEqual(len(memo.groups), 2)
+
+        # other predicates or children are different expressions
+        memo.add_group_expr(self._filter_expr(2))
+        memo.add_group_expr(self._filter_expr(1, children=[1]))
+        self.assertEqual(len(memo.groups), 4)
+
+    def test_memo_should_keep_expr_mutated_in_place(self):
+        memo = Memo()
+        group_expr = memo.add_group_expr(self._filter_expr(1))
+        group_expr.opr.append_child(LogicalGet(None, None))
+        self.assertEqual(memo.get_group_id(group_expr), 0)
+
+        rewrite = GroupExpression(LogicalGet(None, None), 0, [])
+        memo.add_group_expr(rewrite)
+        self.assertEqual(group_expr.group_id, INVALID_GROUP_ID)
+        self.assertEqual(memo.groups[0].logical_exprs, [rewrite])
+        self.assertEqual(len(memo.group_exprs), 1)
+
+    def test_memo_should_keep_physical_alternatives(self):
+        memo = Memo()
+        logical_expr = memo.add_group_expr(
+            GroupExpression(LogicalGet(None, None)))
+        plans = [SeqScanPlan(None, []), SeqScanPlan(None, [])]
+        for plan in plans:
+            memo.add_group_expr(GroupExpression(plan, 0, []))
+        # the same alternative is only added once
+        memo.add_group_expr(memo.groups[0].physical_exprs[0])
+
+        group = memo.groups[0]
+        self.assertEqual(group.logical_exprs, [logical_expr])
+        self.assertEqual([expr.opr for expr in group.physical_exprs], plans)
+
+        # rewriting the logical expression drops the alternatives
+        memo.add_group_expr(GroupExpression(LogicalGet(None, MagicMock()),
+                                            0, []))
+        self.assertEqual(len(group.logical_exprs), 1)
+        self.assertEqual(group.physical_exprs, [])
+        self.assertEqual(len(memo.group_exprs), 1)
@@ -1,12 +1,14 @@
 import unittest
 
-from mock import MagicMock
+from mock import MagicMock, patch
 
 from src.optimizer.optimizer_tasks import (
-    TopDownRewrite, BottomUpRewrite, OptimizeGroup)
+    TopDownRewrite, BottomUpRewrite, OptimizeGroup, OptimizeExpression)
 from src.optimizer.optimizer_context import OptimizerContext
 from src.optimizer.operators import (
-    LogicalGet, LogicalFilter, LogicalProject, LogicalQueryDerivedGet)
+    LogicalGet, LogicalFilter, LogicalProject, LogicalQueryDerivedGet,
+    LogicalUnion)
+from src.optimizer.plan_generator import PlanGenerator
 from src.optimizer.property import PropertyType
 from src.planner.seq_scan_plan import SeqScanPlan
 
@@ -156,3 +158,45 @@ class TestOptimizerTask(unittest.TestCase):
         child_opr = best_child_grp_expr.opr
         self.assertEqual(type(child_opr), SeqScanPlan)
         self.assertEqual(child_opr.predicate, child_predicate)
+
+    def test_should_implement_each_expression_once(self):
+        child_opr = LogicalGet(MagicMock(), MagicMock())
+        root_opr = LogicalFilter(MagicMock(), [child_opr])
+
+        opt_cxt, root_grp_id = self.top_down_rewrite(root_opr)
+        opt_cxt, root_grp_id = self.bottom_up_rewrite(root_grp_id, opt_cxt)
+        opt_cxt, root_grp_id = self.implement_group(root_grp_id, opt_cxt)
+        root_grp = opt_cxt.memo.groups[root_grp_id]
+        self.assertEqual(len(root_grp.logical_exprs), 1)
+        self.assertEqual(len(root_grp.physical_exprs), 1)
+
+        # optimizing the group again does not add duplicate alternatives
+        root_grp.logical_exprs[0].opr.target_list = None
+        opt_cxt.task_stack.push(OptimizeExpression(
+            root_grp.logical_exprs[0], opt_cxt))
+        self.execute_task_stack(opt_cxt.task_stack)
+        self.assertEqual(len(root_grp.physical_exprs), 1)
+
+    def test_should_share_groups_of_equal_expressions(self):
+        video, metadata = MagicMock(), MagicMock()
+        root_opr = LogicalUnion(True, [
+            LogicalGet(video, metadata), LogicalGet(video, metadata)])
+        plan = PlanGenerator().optimize(root_opr)
+
+        self.assertEqual(len(plan.children), 2)
+        self.assertIs(plan.children[0], plan.children[1])
+        self.assertEqual(len(plan.children[0].children), 1)
+
+    def test_should_not_embed_filter_into_shared_group(self):
+        video, metadata = MagicMock(), MagicMock()
+        predicates = [MagicMock(), MagicMock()]
+        root_opr = LogicalUnion(True, [
+            LogicalFilter(predicate, [LogicalGet(video, metadata)])
+            for predicate in predicates])
+
+        with patch('src.optimizer.rules.rules.reorder_predicate',
+                   side_effect=lambda predicate: predicate):
+            plan = PlanGenerator().optimize(root_opr)
+
+        self.assertEqual([child.predicate for child in plan.children],
+                         predicates)
@@ -23,9 +23,20 @@ from src.optimizer.optimizer_utils import (bind_dataset, bind_tuple_value_expr,
                                            bind_function_expr,
                                            bind_predicate_expr,
                                            bind_columns_expr,
-                                           create_video_metadata)
+                                           create_video_metadata,
+                                           extract_referenced_columns,
+                                           extract_column_ranges,
+                                           bind_udf_result_cache,
+                                           bind_shared_udf_results,
+                                           reorder_predicate)
+from src.expression.comparison_expression import ComparisonExpression
+from src.expression.constant_value_expression import \
+    ConstantValueExpression
+from src.expression.abstract_expression import ExpressionType
+from src.expression.logical_expression import LogicalExpression
 from src.parser.create_statement import ColumnDefinition
 from src.catalog.column_type import ColumnType, NdArrayType
+from src.udfs.udf_runtime_statistics import UdfRuntimeStatistics
 
 
 class OptimizerUtilsTest(unittest.TestCase):
@@ -46,8 +57,8 @@ class OptimizerUtilsTest(unittest.TestCase):
         self.assertEqual(tuple_expr.col_object, column_map['col1'])
 
     @patch('src.optimizer.optimizer_utils.CatalogManager')
-    @patch('src.optimizer.optimizer_utils.path_to_class')
-    def test_bind_function_value_expr(self, mock_str_path, mock_catalog):
+    @patch('src.optimizer.optimizer_utils.UdfRegistry')
+    def test_bind_function_value_expr(self, mock_registry, mock_catalog):
         func_expr = FunctionExpression(None, name='temp')
         mock_output = MagicMock()
         mock_output.name = 'name'
@@ -56,9 +67,137 @@ class OptimizerUtilsTest(unittest.TestCase):
         bind_function_expr(func_expr, None)
 
         mock_catalog.return_value.get_udf_by_name.assert_called_with('temp')
-        mock_str_path.assert_called_with('path', 'name')
+        mock_registry.return_value.get.assert_called_with('name', 'path')
         self.assertEqual(func_expr.function,
-                         mock_str_path.return_value.return_value)
+                         mock_registry.return_value.get.return_value)
+        self.assertEqual(func_expr.udf_obj, mock_output)
+
+    @patch('src.optimizer.optimizer_utils.ConfigurationManager')
+    @patch('src.optimizer.optimizer_utils.UdfResultCache')
+    def test_bind_udf_result_cache(self, mock_cache, mock_config):
+        mock_config.return_value.get_value.return_value = True
+        table = MagicMock()
+        udf_obj = MagicMock()
+        udf_obj.name = 'udf'
+        func_expr = FunctionExpression(None, name='udf')
+        func_expr.udf_obj = udf_obj
+        func_expr.append_child(TupleValueExpression('data'))
+        # calls on other expressions and unbound functions are not cached
+        nested_expr = FunctionExpression(None, name='udf')
+        nested_expr.udf_obj = udf_obj
+        nested_expr.append_child(func_expr)
+        unbound_expr = FunctionExpression(None, name='temp')
+        unbound_expr.append_child(TupleValueExpression('data'))
+
+        self.assertTrue(bind_udf_result_cache(
+            [nested_expr, unbound_expr, None], table))
+        mock_cache.assert_called_once_with(
+            table.file_url, table.identifier_column, 'udf',
+            udf_obj.impl_file_path, ['data'])
+        self.assertEqual(func_expr.result_cache, mock_cache.return_value)
+        self.assertIsNone(nested_expr.result_cache)
+        self.assertIsNone(unbound_expr.result_cache)
+
+        mock_config.return_value.get_value.return_value = False
+        self.assertFalse(bind_udf_result_cache([func_expr], table))
+
+    def test_bind_shared_udf_results(self):
+        func = MagicMock()
+
+        def udf_call(output=None, column='data'):
+            expr = FunctionExpression(func, name='udf', output=output)
+            expr.append_child(TupleValueExpression(column))
+            return expr
+
+        predicate = ComparisonExpression(ExpressionType.COMPARE_EQUAL,
+                                         udf_call('label'),
+                                         ConstantValueExpression('car'))
+        projection = [udf_call(), udf_call('score'), udf_call(column='id')]
+        cached = udf_call()
+        cached.result_cache = MagicMock()
+
+        self.assertEqual(
+            bind_shared_udf_results(projection + [predicate, cached]), 1)
+        for expr in [predicate.get_child(0)] + projection[:2]:
+            self.assertEqual(expr.shared_results_key, 0)
+        # different arguments and stored results are not shared
+        self.assertIsNone(projection[2].shared_results_key)
+        self.assertIsNone(cached.shared_results_key)
+
+        self.assertEqual(bind_shared_udf_results([udf_call(), None]), 0)
+
+    def _udf_predicate(self, name):
+        udf = FunctionExpression(MagicMock(), name=name, output='label')
+        udf.append_child(TupleValueExpression('data'))
+        return ComparisonExpression(ExpressionType.COMPARE_EQUAL, udf,
+                                    ConstantValueExpression('car'))
+
+    def _id_predicate(self, etype, value):
+        return ComparisonExpression(etype, TupleValueExpression('id'),
+                                    ConstantValueExpression(value))
+
+    def test_reorder_predicate_should_run_udfs_last(self):
+        udf_term = self._udf_predicate('udf')
+        lower = self._id_predicate(ExpressionType.COMPARE_GREATER, 10)
+        upper = self._id_predicate(ExpressionType.COMPARE_LESSER, 100)
+        predicate = LogicalExpression(
+            ExpressionType.LOGICAL_AND, udf_term,
+            LogicalExpression(ExpressionType.LOGICAL_AND, lower, upper))
+
+        actual = reorder_predicate(predicate)
+        expected = LogicalExpression(
+            ExpressionType.LOGICAL_AND, lower,
+            LogicalExpression(ExpressionType.LOGICAL_AND, upper, udf_term))
+        self.assertEqual(actual, expected)
+        self.assertIs(actual.get_child(0), lower)
+        # the order is already the best one
+        self.assertIs(reorder_predicate(actual), actual)
+
+    def test_reorder_predicate_should_prefer_selective_terms(self):
+        equal = self._id_predicate(ExpressionType.COMPARE_EQUAL, 10)
+        not_equal = self._id_predicate(ExpressionType.COMPARE_NEQ, 20)
+        predicate = LogicalExpression(ExpressionType.LOGICAL_AND,
+                                      not_equal, equal)
+        self.assertEqual(
+            reorder_predicate(predicate),
+            LogicalExpression(ExpressionType.LOGICAL_AND, equal, not_equal))
+
+        # disjunctions first run the terms most likely to be true
+        predicate = LogicalExpression(ExpressionType.LOGICAL_OR,
+                                      equal, not_equal)
+        self.assertEqual(
+            reorder_predicate(predicate),
+            LogicalExpression(ExpressionType.LOGICAL_OR, not_equal, equal))
+
+    def test_reorder_predicate_should_use_observed_runtimes(self):
+        statistics = UdfRuntimeStatistics()
+        statistics.reset()
+        slow, fast = self._udf_predicate('slow'), self._udf_predicate('fast')
+        predicate = LogicalExpression(ExpressionType.LOGICAL_AND, slow, fast)
+        self.assertIs(reorder_predicate(predicate), predicate)
+
+        statistics.record('slow', 1, 1.0)
+        statistics.record('fast', 1, 0.001)
+        self.assertEqual(
+            reorder_predicate(predicate),
+            LogicalExpression(ExpressionType.LOGICAL_AND, fast, slow))
+        statistics.reset()
+
+    def test_reorder_predicate_should_reorder_nested_terms(self):
+        udf_term = self._udf_predicate('udf')
+        id_term = self._id_predicate(ExpressionType.COMPARE_LESSER, 100)
+        predicate = LogicalExpression(
+            ExpressionType.LOGICAL_OR,
+            LogicalExpression(ExpressionType.LOGICAL_AND, udf_term, id_term),
+            id_term)
+        self.assertEqual(
+            reorder_predicate(predicate),
+            LogicalExpression(
+                ExpressionType.LOGICAL_OR, id_term,
+                LogicalExpression(ExpressionType.LOGICAL_AND, id_term,
+                                  udf_term)))
+        self.assertIsNone(reorder_predicate(None))
+        self.assertIs(reorder_predicate(udf_term), udf_term)
 
     def test_column_definition_to_udf_io(self):
         col = ColumnDefinition('data', ColumnType.NDARRAY, NdArrayType.UINT8,
@@ -99,6 +238,56 @@ class OptimizerUtilsTest(unittest.TestCase):
         bind_columns_expr([func_expr], {})
         mock_bind.assert_called_with(func_expr, {})
 
+    def test_extract_referenced_columns(self):
+        func_expr = FunctionExpression(None, name='temp')
+        func_expr.append_child(TupleValueExpression('data'))
+        predicate = ComparisonExpression(ExpressionType.COMPARE_GREATER,
+                                         TupleValueExpression('id'),
+                                         ConstantValueExpression(2))
+        columns = extract_referenced_columns(
+            [TupleValueExpression('id'), func_expr, predicate, None])
+        self.assertEqual(columns, ['id', 'data'])
+
+        # functions without arguments are evaluated on the whole row
+        self.assertIsNone(extract_referenced_columns(
+            [TupleValueExpression('id'), FunctionExpression(None)]))
+
+    def test_extract_column_ranges(self):
+        def compare(etype, left, right):
+            return ComparisonExpression(etype, left, right)
+
+        def conjunction(left, right):
+            return LogicalExpression(ExpressionType.LOGICAL_AND, left, right)
+
+        id_expr = TupleValueExpression('id')
+        predicate = conjunction(
+            conjunction(
+                compare(ExpressionType.COMPARE_GEQ, id_expr,
+                        ConstantValueExpression(10)),
+                compare(ExpressionType.COMPARE_GREATER,
+                        ConstantValueExpression(20), id_expr)),
+            conjunction(
+                compare(ExpressionType.COMPARE_LEQ, id_expr,
+                        ConstantValueExpression(15)),
+                compare(ExpressionType.COMPARE_EQUAL,
+                        TupleValueExpression('label'),
+                        ConstantValueExpression('car', ColumnType.TEXT))))
+        self.assertEqual(extract_column_ranges(predicate),
+                         {'id': (10, 15), 'label': ('car', 'car')})
+
+        # disjunctions and non constant comparisons do not bound a column
+        predicate = LogicalExpression(
+            ExpressionType.LOGICAL_OR,
+            compare(ExpressionType.COMPARE_GREATER, id_expr,
+                    ConstantValueExpression(10)),
+            compare(ExpressionType.COMPARE_LESSER, id_expr,
+                    ConstantValueExpression(5)))
+        self.assertEqual(extract_column_ranges(predicate), {})
+        self.assertEqual(extract_column_ranges(compare(
+            ExpressionType.COMPARE_GREATER, id_expr,
+            TupleValueExpression('label'))), {})
+        self.assertEqual(extract_column_ranges(None), {})
+
     @patch('src.optimizer.optimizer_utils.CatalogManager')
     @patch('src.optimizer.optimizer_utils.ColumnDefinition')
     @patch('src.optimizer.optimizer_utils.ColConstraintInfo')
@@ -0,0 +1,81 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+
+from mock import patch, MagicMock
+
+from src.optimizer.plan_cache import PlanCache, normalize_query
+
+
+class PlanCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        PlanCache().invalidate()
+
+    def tearDown(self):
+        PlanCache().invalidate()
+
+    def test_plan_cache_singleton_pattern(self):
+        self.assertEqual(PlanCache(), PlanCache())
+
+    def test_normalize_query(self):
+        self.assertEqual(normalize_query('  SELECT id\n FROM  MyVideo ; '),
+                         'SELECT id FROM MyVideo')
+        self.assertEqual(
+            normalize_query("SELECT id FROM MyVideo WHERE name = 'a  b';"),
+            "SELECT id FROM MyVideo WHERE name = 'a  b'")
+
+    @patch('src.optimizer.plan_cache.CatalogManager')
+    def test_should_return_cached_plan(self, mock_catalog):
+        mock_catalog.return_value.version = 0
+        plan = MagicMock()
+        PlanCache().put('SELECT id FROM MyVideo;', plan, 0)
+        self.assertEqual(PlanCache().get('SELECT  id FROM MyVideo'), plan)
+        self.assertIsNone(PlanCache().get('SELECT data FROM MyVideo;'))
+
+    @patch('src.optimizer.plan_cache.CatalogManager')
+    def test_should_miss_after_catalog_change(self, mock_catalog):
+        mock_catalog.return_value.version = 0
+        PlanCache().put('SELECT id FROM MyVideo;', MagicMock(), 0)
+        mock_catalog.return_value.version = 1
+        self.assertIsNone(PlanCache().get('SELECT id FROM MyVideo;'))
+
+    @patch('src.optimizer.plan_cache.CatalogManager')
+    def test_should_key_plan_on_version_it_was_built_for(self,
+                                                         mock_catalog):
+        # the catalog changes while the plan is optimized
+        mock_catalog.return_value.version = 1
+        PlanCache().put('SELECT id FROM MyVideo;', MagicMock(), 0)
+        self.assertIsNone(PlanCache().get('SELECT id FROM MyVideo;'))
+
+    @patch('src.optimizer.plan_cache.CatalogManager')
+    def test_should_evict_least_recently_used(self, mock_catalog):
+        mock_catalog.return_value.version = 0
+        cache = PlanCache()
+        cache._max_size = 2
+        cache.put('q1', MagicMock(), 0)
+        cache.put('q2', MagicMock(), 0)
+        cache.get('q1')
+        cache.put('q3', MagicMock(), 0)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('q2'))
+        self.assertIsNotNone(cache.get('q1'))
+
+    @patch('src.optimizer.plan_cache.CatalogManager')
+    def test_invalidate_should_drop_all_plans(self, mock_catalog):
+        mock_catalog.return_value.version = 0
+        PlanCache().put('q1', MagicMock(), 0)
+        PlanCache().invalidate()
+        self.assertEqual(len(PlanCache()), 0)
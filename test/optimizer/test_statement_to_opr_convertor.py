@@ -23,6 +23,7 @@ from src.parser.create_udf_statement import CreateUDFStatement
 from src.parser.insert_statement import InsertTableStatement
 from src.parser.create_statement import CreateTableStatement
 from src.parser.load_statement import LoadDataStatement
+from src.parser.explain_statement import ExplainStatement
 from src.parser.parser import Parser
 
 from src.optimizer.operators import (LogicalProject, LogicalGet, LogicalFilter,
@@ -30,7 +31,7 @@ from src.optimizer.operators import (LogicalProject, LogicalGet, LogicalFilter,
                                      LogicalCreateUDF, LogicalInsert,
                                      LogicalLoadData, LogicalUnion,
                                      LogicalOrderBy, LogicalLimit,
-                                     LogicalSample)
+                                     LogicalSample, LogicalExplain)
 
 from src.expression.tuple_value_expression import TupleValueExpression
 from src.expression.constant_value_expression import ConstantValueExpression
@@ -124,9 +125,9 @@ class StatementToOprTest(unittest.TestCase):
     def test_populate_column_map_should_populate_correctly(self):
         converter = StatementToPlanConvertor()
         dataset = MagicMock()
-        dataset.columns = [MagicMock() for i in range(5)]
+        dataset.schema.column_list = [MagicMock() for i in range(5)]
         expected = {}
-        for i, column in enumerate(dataset.columns):
+        for i, column in enumerate(dataset.schema.column_list):
             column.name = "NAME" + str(i)
             expected[column.name.lower()] = column
 
@@ -199,6 +200,30 @@ statement_to_opr_convertor.column_definition_to_udf_io')
         mock.assert_called_once()
         mock.assert_called_with(stmt)
 
+    def test_visit_should_call_explain(self):
+        stmt = MagicMock(spec=ExplainStatement)
+        convertor = StatementToPlanConvertor()
+        mock = MagicMock()
+        convertor.visit_explain = mock
+
+        convertor.visit(stmt)
+        mock.assert_called_once()
+        mock.assert_called_with(stmt)
+
+    def test_visit_explain_should_wrap_select_plan(self):
+        select_stmt = MagicMock()
+        convertor = StatementToPlanConvertor()
+        select_plan = MagicMock()
+
+        def visit_select(stmt):
+            convertor._plan = select_plan
+        convertor.visit_select = MagicMock(side_effect=visit_select)
+
+        actual = convertor.visit(ExplainStatement(select_stmt, True))
+        convertor.visit_select.assert_called_once_with(select_stmt)
+        self.assertEqual(actual, LogicalExplain(True, [select_plan]))
+        self.assertNotEqual(actual, LogicalExplain(False, [select_plan]))
+
     @patch('src.optimizer.statement_to_opr_convertor.LogicalLoadData')
     @patch('src.optimizer.statement_to_opr_convertor.bind_dataset')
     @patch('src.optimizer.statement_to_opr_convertor.create_video_metadata')
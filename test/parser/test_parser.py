@@ -25,6 +25,7 @@ from src.parser.create_statement import ColumnDefinition
 from src.parser.create_udf_statement import CreateUDFStatement
 from src.parser.load_statement import LoadDataStatement
 from src.parser.insert_statement import InsertTableStatement
+from src.parser.explain_statement import ExplainStatement
 
 from src.expression.abstract_expression import ExpressionType
 from src.expression.tuple_value_expression import TupleValueExpression
@@ -374,6 +375,23 @@ class ParserTests(unittest.TestCase):
         load_data_stmt = eva_statement_list[0]
         self.assertEqual(load_data_stmt, expected_stmt)
 
+    def test_explain_statement(self):
+        parser = Parser()
+        select_query = "SELECT id FROM MyVideo WHERE id > 2"
+        select_stmt = parser.parse(select_query)[0]
+
+        explain_stmt = parser.parse("EXPLAIN {};".format(select_query))[0]
+        self.assertEqual(explain_stmt.stmt_type, StatementType.EXPLAIN)
+        self.assertEqual(explain_stmt, ExplainStatement(select_stmt))
+        self.assertFalse(explain_stmt.analyze)
+
+        explain_stmt = parser.parse(
+            "EXPLAIN ANALYZE {};".format(select_query))[0]
+        self.assertEqual(explain_stmt, ExplainStatement(select_stmt, True))
+        self.assertNotEqual(explain_stmt, ExplainStatement(select_stmt))
+        self.assertNotEqual(explain_stmt, select_stmt)
+        self.assertTrue(str(explain_stmt).startswith('EXPLAIN ANALYZE'))
+
     def test_nested_select_statement(self):
         parser = Parser()
         sub_query = """SELECT CLASS FROM TAIPAI WHERE CLASS = 'VAN'"""
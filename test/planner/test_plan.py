@@ -13,6 +13,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import unittest
+
+from mock import MagicMock, patch
+
 from src.parser.table_ref import TableRef, TableInfo
 from src.catalog.models.df_column import DataFrameColumn
 from src.catalog.column_type import ColumnType
@@ -23,6 +26,17 @@ from src.planner.insert_plan import InsertPlan
 from src.planner.create_udf_plan import CreateUDFPlan
 from src.planner.load_data_plan import LoadDataPlan
 from src.planner.union_plan import UnionPlan
+from src.planner.explain_plan import ExplainPlan
+from src.planner.seq_scan_plan import SeqScanPlan
+from src.planner.storage_plan import StoragePlan
+from src.planner.topk_plan import TopKPlan
+from src.expression.abstract_expression import ExpressionType
+from src.expression.comparison_expression import ComparisonExpression
+from src.expression.constant_value_expression import \
+    ConstantValueExpression
+from src.expression.function_expression import FunctionExpression
+from src.expression.tuple_value_expression import TupleValueExpression
+from src.parser.types import ParserOrderBySortType
 from src.planner.types import PlanOprType
 
 
@@ -92,3 +106,39 @@ class PlanNodeTests(unittest.TestCase):
         plan = UnionPlan(all)
         self.assertEqual(plan.opr_type, PlanOprType.UNION)
         self.assertEqual(plan.all, all)
+
+    def test_explain_plan(self):
+        plan = ExplainPlan(True)
+        self.assertEqual(plan.opr_type, PlanOprType.EXPLAIN)
+        self.assertTrue(plan.analyze)
+        self.assertEqual(plan.describe(), 'EXPLAIN(analyze=True)')
+        self.assertEqual(ExplainPlan().describe(), 'EXPLAIN')
+
+    @patch('src.planner.storage_plan.ConfigurationManager')
+    def test_should_describe_plan_tree(self, mock_config):
+        mock_config.return_value.get_value.return_value = 10
+        predicate = ComparisonExpression(
+            ExpressionType.COMPARE_GREATER, TupleValueExpression('id'),
+            ConstantValueExpression(2))
+        udf = FunctionExpression(MagicMock(), name='Yolo', output='labels',
+                                 children=[TupleValueExpression('data')])
+        udf.result_cache = MagicMock()
+        scan = SeqScanPlan(predicate, [TupleValueExpression('id'), udf],
+                           1, 'id')
+        video = MagicMock()
+        video.name = 'MyVideo'
+        scan.append_child(StoragePlan(video, columns=['id', 'data'],
+                                      column_ranges={'id': (2, None)}))
+        topk = TopKPlan([(TupleValueExpression('id'),
+                          ParserOrderBySortType.DESC)],
+                        ConstantValueExpression(3))
+        topk.append_child(scan)
+
+        self.assertEqual(str(topk).split('\n'), [
+            'TOP_K(orderby=id DESC, limit=3)',
+            '\tSEQUENTIAL_SCAN(predicate=(id > 2), '
+            'columns=[id, Yolo(data).labels], '
+            'cached_udfs=[Yolo(data).labels], shared_udf_results=1)',
+            "\t\tSTORAGE_PLAN(table=MyVideo, columns=['id', 'data'], "
+            "column_ranges={'id': (2, None)}, batch_size=10)",
+            ''])
@@ -14,7 +14,9 @@
 # limitations under the License.
 import os
 import unittest
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
+
+import numpy as np
 
 from src.readers.opencv_reader import OpenCVReader
 
@@ -93,3 +95,73 @@ class VideoLoaderTest(unittest.TestCase):
         expected = list(create_dummy_batches())
         self.assertTrue(batches, expected)
         get_val_mock.assert_called_once_with("executor", "batch_size")
+
+    def test_should_decode_batch_into_contiguous_array(self):
+        video_loader = OpenCVReader(
+            file_url='dummy.avi', batch_size=4, start_frame_id=2)
+        batches = list(video_loader.read())
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 2])
+
+        frame_id = 2
+        for batch in batches:
+            data = batch.column_as_numpy_array()
+            self.assertEqual(data.shape, (len(batch), 2, 2, 3))
+            self.assertTrue(data.flags['C_CONTIGUOUS'])
+            self.assertEqual(list(batch.frames['id']),
+                             list(range(frame_id, frame_id + len(batch))))
+            for row, frame in enumerate(batch.frames['data']):
+                self.assertTrue(np.shares_memory(frame, data))
+                self.assertTrue(np.array_equal(frame, data[row]))
+            frame_id += len(batch)
+
+    def test_should_only_decode_sampled_frames(self):
+        video_loader = OpenCVReader(
+            file_url='dummy.avi', batch_size=2, skip_frames=3)
+        video = video_loader._video_capture()
+        spy = MagicMock(wraps=video)
+        with patch.object(video_loader, '_video_capture', return_value=spy):
+            batches = list(video_loader.read())
+
+        # the skipped frames are only grabbed, never decoded. The last
+        # grab and read hit the end of the video.
+        self.assertEqual(spy.read.call_count, 5)
+        self.assertEqual(spy.grab.call_count, 7)
+
+        self.assertEqual([len(batch) for batch in batches], [2, 2])
+        expected = list(create_dummy_batches(
+            filters=range(0, NUM_FRAMES, 3)))[0]
+        ids = [id for batch in batches for id in batch.frames['id']]
+        self.assertEqual(ids, list(expected.frames['id']))
+        for batch in batches:
+            for id, frame in zip(batch.frames['id'], batch.frames['data']):
+                self.assertTrue(np.array_equal(
+                    frame, expected.frames['data'][id // 3]))
+
+    def test_should_stop_decoding_at_limit(self):
+        video_loader = OpenCVReader(file_url='dummy.avi', limit=3)
+        video = video_loader._video_capture()
+        spy = MagicMock(wraps=video)
+        with patch.object(video_loader, '_video_capture', return_value=spy):
+            batches = list(video_loader.read())
+
+        self.assertEqual([len(batch) for batch in batches], [3])
+        self.assertEqual(list(batches[0].frames['id']), [0, 1, 2])
+        self.assertEqual(spy.read.call_count, 3)
+        spy.release.assert_called_once()
+
+        video_loader = OpenCVReader(file_url='dummy.avi', limit=0)
+        self.assertEqual(list(video_loader.read()), [])
+
+    def test_should_truncate_last_batch_at_limit(self):
+        video_loader = OpenCVReader(
+            file_url='dummy.avi', batch_size=4, limit=6)
+        batches = list(video_loader.read())
+        self.assertEqual([len(batch) for batch in batches], [4, 2])
+
+    def test_batch_decoding_should_match_frame_decoding(self):
+        video_loader = OpenCVReader(file_url='dummy.avi', offset=1)
+        batch = next(video_loader.read())
+        frames = list(video_loader._read())
+        self.assertEqual(len(batch), len(frames))
+        for row, frame in zip(batch.frames['data'], frames):
+            self.assertTrue(np.array_equal(row, frame['data']))
@@ -49,7 +49,8 @@ class PetastormLoaderTest(unittest.TestCase):
                                            shard_count=3, predicate='pred')
         list(petastorm_reader._read())
         mock.assert_called_once_with(
-            'dummy.avi', shard_count=3, cur_shard=2, predicate='pred')
+            'dummy.avi', shard_count=3, cur_shard=2, predicate='pred',
+            schema_fields=None, rowgroup_selector=None)
 
     @patch("src.readers.petastorm_reader.make_reader")
     def test_should_call_petastorm_make_reader_with_negative_shards(self,
@@ -58,7 +59,19 @@ class PetastormLoaderTest(unittest.TestCase):
                                            shard_count=-2)
         list(petastorm_reader._read())
         mock.assert_called_once_with(
-            'dummy.avi', shard_count=None, cur_shard=None, predicate=None)
+            'dummy.avi', shard_count=None, cur_shard=None, predicate=None,
+            schema_fields=None, rowgroup_selector=None)
+
+    @patch("src.readers.petastorm_reader.make_reader")
+    def test_should_call_petastorm_make_reader_for_ordered_shard(self,
+                                                                 mock):
+        petastorm_reader = PetastormReader(file_url='dummy.avi', cur_shard=0,
+                                           shard_count=2, ordered=True)
+        list(petastorm_reader._read())
+        mock.assert_called_once_with(
+            'dummy.avi', shard_count=2, cur_shard=0, predicate=None,
+            schema_fields=None, rowgroup_selector=None, workers_count=1,
+            shuffle_row_groups=False)
 
     @patch("src.readers.petastorm_reader.make_reader")
     def test_should_read_data_using_petastorm_reader(self, mock):
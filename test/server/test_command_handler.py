@@ -15,10 +15,18 @@
 import unittest
 import mock
 import asyncio
+import threading
 
 from unittest.mock import MagicMock
 
-from src.server.command_handler import handle_request
+from src.executor.execution_metrics import OperatorMetrics
+from src.models.server.response import Response, ResponseStatus
+from src.models.storage.batch import Batch
+from src.optimizer.plan_cache import PlanCache
+from src.server.command_handler import handle_request, execute_query
+from src.parser.types import StatementType
+from src.server.protocol import MessageReader, MessageType
+from test.util import create_dataframe
 
 
 class CommandHandlerTests(unittest.TestCase):
@@ -37,3 +45,176 @@ class CommandHandlerTests(unittest.TestCase):
         request_message = "query"
 
         asyncio.run(handle_request(transport, request_message))
+
+    @mock.patch('src.server.command_handler.execute_query')
+    def test_should_stream_batches_before_response(self, mock_execute):
+        batches = [Batch(frames=create_dataframe(2)),
+                   Batch(frames=create_dataframe(1))]
+        mock_execute.return_value = (batch for batch in batches)
+        transport = mock.Mock()
+
+        asyncio.run(handle_request(transport, "query"))
+
+        reader = MessageReader()
+        messages = []
+        for write_call in transport.write.call_args_list:
+            messages += reader.feed(write_call[0][0])
+        self.assertEqual([message_type for message_type, _ in messages],
+                         [MessageType.BATCH, MessageType.BATCH,
+                          MessageType.RESPONSE])
+        self.assertEqual(Batch.from_bytes(messages[0][1]), batches[0])
+        self.assertEqual(Batch.from_bytes(messages[1][1]), batches[1])
+        response = Response.from_bytes(messages[2][1])
+        self.assertEqual(response.status, ResponseStatus.SUCCESS)
+
+    @mock.patch('src.server.command_handler.LoggingManager')
+    @mock.patch('src.server.command_handler.ConfigurationManager')
+    @mock.patch('src.server.command_handler.execute_query')
+    def test_should_return_metrics_in_response(self, mock_execute,
+                                               mock_config, mock_logger):
+        def execute(query, metrics):
+            metrics.root = OperatorMetrics('SEQUENTIAL_SCAN')
+            metrics.root.add_batch(batch)
+            yield batch
+
+        batch = Batch(frames=create_dataframe(2))
+        mock_execute.side_effect = execute
+        mock_config.return_value.get_value.return_value = True
+
+        response = asyncio.run(handle_request(mock.Mock(), "query"))
+
+        self.assertEqual(response.metrics['operator'], 'SEQUENTIAL_SCAN')
+        self.assertEqual(response.metrics['output_rows'], 2)
+        self.assertEqual(Response.from_bytes(response.to_bytes()), response)
+        mock_config.return_value.get_value.assert_called_with(
+            'executor', 'log_metrics')
+        self.assertIn('SEQUENTIAL_SCAN',
+                      mock_logger.return_value.log.call_args_list[1][0][0])
+
+    def test_should_send_error_response(self):
+        transport = mock.Mock()
+        response = asyncio.run(handle_request(transport, "query"))
+        self.assertEqual(response.status, ResponseStatus.FAIL)
+        messages = MessageReader().feed(transport.write.call_args[0][0])
+        self.assertEqual(messages[0][0], MessageType.RESPONSE)
+        self.assertEqual(Response.from_bytes(messages[0][1]), response)
+
+    @mock.patch('src.server.command_handler.execute_query')
+    def test_should_stop_cancelled_query(self, mock_execute):
+        closed = threading.Event()
+
+        def batches():
+            try:
+                while True:
+                    yield Batch(frames=create_dataframe())
+            finally:
+                closed.set()
+
+        mock_execute.return_value = batches()
+        transport = mock.Mock()
+        cancelled = threading.Event()
+        cancelled.set()
+
+        asyncio.run(handle_request(transport, "query", cancelled))
+
+        self.assertTrue(closed.is_set())
+        transport.write.assert_not_called()
+
+    @mock.patch('src.server.command_handler.execute_query')
+    def test_should_not_write_while_paused(self, mock_execute):
+        mock_execute.return_value = (Batch(frames=create_dataframe())
+                                     for _ in range(3))
+        writable = threading.Event()
+        writable.set()
+        paused_writes = []
+
+        def write(data):
+            # every write fills the buffer, it drains a bit later
+            paused_writes.append(not writable.is_set())
+            writable.clear()
+            asyncio.get_event_loop().call_later(0.01, writable.set)
+
+        transport = mock.Mock()
+        transport.write.side_effect = write
+
+        response = asyncio.run(handle_request(transport, "query",
+                                              writable=writable))
+
+        self.assertEqual(response.status, ResponseStatus.SUCCESS)
+        self.assertEqual(paused_writes, [False] * 4)
+
+    @mock.patch('src.server.command_handler.execute_query')
+    def test_should_run_query_off_event_loop(self, mock_execute):
+        threads = []
+
+        def batches():
+            threads.append(threading.current_thread())
+            yield Batch(frames=create_dataframe())
+
+        mock_execute.return_value = batches()
+        asyncio.run(handle_request(mock.Mock(), "query"))
+        self.assertNotEqual(threads, [threading.current_thread()])
+
+    @mock.patch('src.server.command_handler.PlanExecutor')
+    @mock.patch('src.server.command_handler.PlanGenerator')
+    @mock.patch('src.server.command_handler.StatementToPlanConvertor')
+    @mock.patch('src.server.command_handler.Parser')
+    @mock.patch('src.server.command_handler.PlanCache')
+    def test_execute_query_should_cache_select_plans(self, mock_cache,
+                                                     mock_parser, *mocks):
+        mock_cache.return_value.get.return_value = None
+        stmt = mock_parser.return_value.parse.return_value[0]
+
+        stmt.stmt_type = StatementType.SELECT
+        execute_query('SELECT id FROM MyVideo;')
+        mock_cache.return_value.put.assert_called_once()
+
+        stmt.stmt_type = StatementType.LOAD_DATA
+        output = execute_query('LOAD DATA INFILE "dummy.avi" INTO MyVideo;')
+        mock_cache.return_value.put.assert_called_once()
+        # the plans are dropped once the statement finished
+        mock_cache.return_value.invalidate.assert_not_called()
+        list(output)
+        mock_cache.return_value.invalidate.assert_called_once_with()
+
+        stmt.stmt_type = StatementType.EXPLAIN
+        execute_query('EXPLAIN SELECT id FROM MyVideo;')
+        self.assertEqual(mock_cache.return_value.put.call_count, 2)
+        mock_cache.return_value.invalidate.assert_called_once_with()
+
+        mock_parser.reset_mock()
+        mock_cache.return_value.get.return_value = MagicMock()
+        execute_query('SELECT id FROM MyVideo;')
+        mock_parser.return_value.parse.assert_not_called()
+
+    @mock.patch('src.server.command_handler.PlanExecutor')
+    @mock.patch('src.server.command_handler.PlanGenerator')
+    @mock.patch('src.server.command_handler.StatementToPlanConvertor')
+    @mock.patch('src.server.command_handler.Parser')
+    @mock.patch('src.server.command_handler.CatalogManager')
+    @mock.patch('src.optimizer.plan_cache.CatalogManager')
+    def test_execute_query_should_cache_plan_under_version_it_was_built_for(
+            self, mock_cache_catalog, mock_catalog, mock_parser, *mocks):
+        mock_generator = mocks[1]
+        catalog = MagicMock()
+        catalog.version = 0
+        mock_catalog.return_value = catalog
+        mock_cache_catalog.return_value = catalog
+        mock_parser.return_value.parse.return_value[0].stmt_type = \
+            StatementType.SELECT
+
+        def build(l_plan):
+            # e.g. a table is created on another worker meanwhile
+            catalog.version = 1
+            return MagicMock()
+
+        mock_generator.return_value.build.side_effect = build
+        query = 'SELECT id FROM MyVideo;'
+        PlanCache().invalidate()
+        try:
+            execute_query(query)
+            self.assertIsNone(PlanCache().get(query))
+            catalog.version = 0
+            self.assertIsNotNone(PlanCache().get(query))
+        finally:
+            PlanCache().invalidate()
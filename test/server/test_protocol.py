@@ -0,0 +1,43 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+
+from src.server.protocol import MessageReader, MessageType
+from src.server.protocol import serialize_message
+
+
+class ProtocolTests(unittest.TestCase):
+
+    def test_should_split_stream_into_messages(self):
+        stream = serialize_message(MessageType.BATCH, b'first') + \
+            serialize_message(MessageType.BATCH, b'') + \
+            serialize_message(MessageType.RESPONSE, b'last')
+
+        reader = MessageReader()
+        self.assertEqual(reader.feed(stream),
+                         [(MessageType.BATCH, b'first'),
+                          (MessageType.BATCH, b''),
+                          (MessageType.RESPONSE, b'last')])
+
+    def test_should_buffer_incomplete_messages(self):
+        stream = serialize_message(MessageType.BATCH, b'payload') + \
+            serialize_message(MessageType.RESPONSE, b'done')
+
+        reader = MessageReader()
+        messages = []
+        for i in range(len(stream)):
+            messages += reader.feed(stream[i:i + 1])
+        self.assertEqual(messages, [(MessageType.BATCH, b'payload'),
+                                    (MessageType.RESPONSE, b'done')])
@@ -0,0 +1,45 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import threading
+import unittest
+
+from src.server.query_pool import QueryPool
+
+
+class QueryPoolTests(unittest.TestCase):
+
+    def test_query_pool_singleton_pattern(self):
+        self.assertEqual(QueryPool(), QueryPool())
+
+    def test_should_reject_queries_over_limit(self):
+        pool = QueryPool()
+        pool._max_pending = 2
+        self.assertTrue(pool.admit())
+        self.assertTrue(pool.admit())
+        self.assertFalse(pool.admit())
+        self.assertEqual(pool.pending, 2)
+        pool.release()
+        self.assertTrue(pool.admit())
+        pool.release()
+        pool.release()
+        self.assertEqual(pool.pending, 0)
+
+    def test_should_run_on_worker_thread(self):
+        async def run():
+            loop = asyncio.get_event_loop()
+            return await QueryPool().run(loop, threading.current_thread)
+
+        self.assertNotEqual(asyncio.run(run()), threading.current_thread())
@@ -23,6 +23,8 @@ from unittest.mock import MagicMock
 
 from src.server.server import start_server
 from src.server.server import EvaServer
+from src.server.protocol import MessageReader
+from src.models.server.response import Response, ResponseStatus
 
 
 from concurrent.futures import CancelledError
@@ -113,3 +115,74 @@ class ServerTests(unittest.TestCase):
             data.decode = MagicMock(return_value="query")
             # error due to lack of asyncio loop
             eva_server.data_received(data)
+
+    @mock.patch('src.server.server.handle_request')
+    @mock.patch('src.server.server.QueryPool')
+    def test_server_protocol_should_reject_when_busy(self, mock_pool,
+                                                     mock_handle):
+        mock_pool.return_value.admit.return_value = False
+        eva_server = EvaServer(60)
+        eva_server.transport = mock.Mock()
+
+        async def receive():
+            eva_server.data_received(b'query')
+
+        asyncio.run(receive())
+        mock_handle.assert_not_called()
+        messages = MessageReader().feed(
+            eva_server.transport.write.call_args[0][0])
+        response = Response.from_bytes(messages[0][1])
+        self.assertEqual(response.status, ResponseStatus.FAIL)
+
+    @mock.patch('src.server.server.QueryPool')
+    def test_server_protocol_should_serialize_requests(self, mock_pool):
+        mock_pool.return_value.admit.return_value = True
+        eva_server = EvaServer(60)
+        eva_server.transport = mock.Mock()
+        handled = []
+
+        async def handle_request(transport, request_message, cancelled,
+                                 writable):
+            handled.append(request_message)
+            await asyncio.sleep(0.01 if request_message == 'first' else 0)
+            handled.append(request_message)
+
+        async def receive():
+            eva_server.data_received(b'first')
+            eva_server.data_received(b'second')
+            await eva_server._last_request
+
+        with mock.patch('src.server.server.handle_request', handle_request):
+            asyncio.run(receive())
+        self.assertEqual(handled, ['first', 'first', 'second', 'second'])
+        self.assertEqual(mock_pool.return_value.release.call_count, 2)
+
+    @mock.patch('src.server.server.handle_request')
+    @mock.patch('src.server.server.QueryPool')
+    def test_server_protocol_should_skip_requests_after_disconnect(
+            self, mock_pool, mock_handle):
+        mock_pool.return_value.admit.return_value = True
+        eva_server = EvaServer(60)
+        eva_server.transport = mock.Mock()
+
+        async def receive():
+            eva_server.data_received(b'query')
+            eva_server.connection_lost(None)
+            await eva_server._last_request
+
+        asyncio.run(receive())
+        mock_handle.assert_not_called()
+        mock_pool.return_value.release.assert_called_once()
+
+    def test_server_protocol_should_pause_writing(self):
+        eva_server = EvaServer(60)
+        eva_server.pause_writing()
+        self.assertFalse(eva_server._writable.is_set())
+        eva_server.resume_writing()
+        self.assertTrue(eva_server._writable.is_set())
+
+        # a disconnect releases the paused requests
+        eva_server.transport = mock.Mock()
+        eva_server.pause_writing()
+        eva_server.connection_lost(None)
+        self.assertTrue(eva_server._writable.is_set())
@@ -38,3 +38,11 @@ class SparkSessionTest(unittest.TestCase):
         session2 = Session()
         self.assertEqual(self.session, session2)
         self.assertIsInstance(spark_session, SparkSession)
+
+    def test_should_start_session_on_demand(self):
+        self.session.stop()
+        self.assertIsNone(Session()._session)
+
+        self.assertIsInstance(self.session.get_context().getConf().get(
+            'spark.app.name'), str)
+        self.assertIsNotNone(Session()._session)
@@ -84,3 +84,123 @@ class PetastormStorageEngineTest(unittest.TestCase):
                 i for i in range(NUM_FRAMES) if i %
                 2 == 0]))
         self.assertTrue(read_batch, expected_batch)
+
+    def test_should_skip_frames_on_read(self):
+        dummy_batches = list(create_dummy_batches())
+
+        petastorm = PetastormStorageEngine()
+        petastorm.create(self.table)
+        petastorm.bulk_write(self.table, iter(dummy_batches))
+
+        read_batch = list(petastorm.read(self.table, skip_frames=3))
+        ids = sorted(id for batch in read_batch
+                     for id in batch.frames['id'])
+        self.assertEqual(ids, list(range(0, NUM_FRAMES, 3)))
+
+        read_batch = list(petastorm.read(self.table, ["id"],
+                                         lambda id: id > 3, skip_frames=3))
+        ids = sorted(id for batch in read_batch
+                     for id in batch.frames['id'])
+        self.assertEqual(ids, [6, 9])
+
+    def test_should_sample_by_position(self):
+        petastorm = PetastormStorageEngine()
+        petastorm.create(self.table)
+        # the ids are not the row positions, e.g. after several inserts
+        for start_id in [100, 10]:
+            petastorm.write(self.table, next(create_dummy_batches(
+                filters=[0, 2, 3, 7], start_id=start_id)))
+
+        read_batch = list(petastorm.read(self.table, skip_frames=3))
+        ids = [id for batch in read_batch for id in batch.frames['id']]
+        self.assertEqual(len(ids), 3)
+        # the files are read in storage order
+        self.assertIn(ids, [[100, 107, 13], [10, 17, 103]])
+
+        # ranges and shards would change the positions of the rows
+        read_batch = list(petastorm.read(self.table, skip_frames=3,
+                                         column_ranges={'id': (50, None)}))
+        self.assertEqual(sum(len(batch) for batch in read_batch), 3)
+        shards = [list(petastorm.read(self.table, skip_frames=3,
+                                      total_shards=2, curr_shard=shard))
+                  for shard in range(2)]
+        self.assertEqual(sum(len(batch) for batch in shards[0]), 3)
+        self.assertEqual(shards[1], [])
+
+    def test_should_limit_rows_on_read(self):
+        dummy_batches = list(create_dummy_batches())
+
+        petastorm = PetastormStorageEngine()
+        petastorm.create(self.table)
+        petastorm.bulk_write(self.table, iter(dummy_batches))
+
+        read_batch = list(petastorm.read(self.table, limit=3))
+        self.assertEqual(sum(len(batch) for batch in read_batch), 3)
+
+    def test_should_only_read_requested_columns(self):
+        dummy_batches = list(create_dummy_batches())
+
+        petastorm = PetastormStorageEngine()
+        petastorm.create(self.table)
+        petastorm.bulk_write(self.table, iter(dummy_batches))
+
+        read_batch = list(petastorm.read(self.table, schema_fields=['id']))
+        for batch in read_batch:
+            self.assertEqual(list(batch.frames.columns), ['id'])
+        ids = sorted(id for batch in read_batch
+                     for id in batch.frames['id'])
+        self.assertEqual(ids, list(range(NUM_FRAMES)))
+
+        # the sampling predicate needs the id column
+        read_batch = list(petastorm.read(self.table, schema_fields=['data'],
+                                         skip_frames=3))
+        self.assertEqual(sum(len(batch) for batch in read_batch), 4)
+
+    def test_should_skip_row_groups_out_of_range(self):
+        petastorm = PetastormStorageEngine()
+        petastorm.create(self.table)
+        # every write commits a new file with ids [0, 5) and [5, 10)
+        for batch in create_dummy_batches(batch_size=5):
+            petastorm.write(self.table, batch)
+
+        read_batch = list(petastorm.read(self.table,
+                                         column_ranges={'id': (6, None)}))
+        ids = sorted(id for batch in read_batch
+                     for id in batch.frames['id'])
+        self.assertEqual(ids, list(range(5, NUM_FRAMES)))
+
+        read_batch = list(petastorm.read(self.table,
+                                         column_ranges={'id': (None, -1)}))
+        self.assertEqual(sum(len(batch) for batch in read_batch), 0)
+
+    def test_should_read_shards_of_table(self):
+        petastorm = PetastormStorageEngine()
+        petastorm.create(self.table)
+        for batch in create_dummy_batches(batch_size=5):
+            petastorm.write(self.table, batch)
+
+        shards = []
+        # there are only two row groups to be sharded
+        for shard in range(3):
+            read_batch = list(petastorm.read(self.table, total_shards=3,
+                                             curr_shard=shard))
+            shards.append([id for batch in read_batch
+                           for id in batch.frames['id']])
+        self.assertEqual(shards[2], [])
+        # each shard is read in storage order
+        for ids in shards[:2]:
+            self.assertIn(ids, [list(range(5)), list(range(5, NUM_FRAMES))])
+        self.assertEqual(sorted(shards[0] + shards[1]),
+                         list(range(NUM_FRAMES)))
+
+    def test_should_bulk_write_rows_to_table(self):
+        dummy_batches = list(create_dummy_batches())
+
+        petastorm = PetastormStorageEngine()
+        petastorm.create(self.table)
+        petastorm.bulk_write(self.table, iter(dummy_batches))
+
+        read_batch = list(petastorm.read(self.table))
+        ids = sorted(id for batch in read_batch
+                     for id in batch.frames['id'])
+        self.assertEqual(ids, list(range(NUM_FRAMES)))
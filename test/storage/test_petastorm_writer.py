@@ -0,0 +1,166 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import os
+import pickle
+import shutil
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pyarrow.parquet as pq
+from petastorm import make_reader
+from petastorm.etl.dataset_metadata import ROW_GROUPS_PER_FILE_KEY
+from petastorm.etl.rowgroup_indexing import ROWGROUPS_INDEX_KEY
+
+from src.catalog.column_type import ColumnType, NdArrayType
+from src.catalog.models.df_column import DataFrameColumn
+from src.catalog.models.df_metadata import DataFrameMetadata
+from src.storage.column_statistics import ColumnRangeSelector, \
+    ColumnStatistics, STATISTICS_INDEX
+from src.storage.petastorm_writer import PetastormWriter
+
+from test.util import create_dummy_batches
+from test.util import NUM_FRAMES
+
+
+class PetastormWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = os.path.abspath('petastorm_writer_dataset')
+        table_info = DataFrameMetadata('dataset', self.path)
+        table_info.schema = [
+            DataFrameColumn('id', ColumnType.INTEGER, False),
+            DataFrameColumn('data', ColumnType.NDARRAY, False,
+                            NdArrayType.UINT8, [2, 2, 3])]
+        self.schema = table_info.schema.petastorm_schema
+
+    def tearDown(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def _row_groups(self):
+        metadata = pq.read_metadata(
+            os.path.join(self.path, '_common_metadata')).metadata
+        return json.loads(metadata[ROW_GROUPS_PER_FILE_KEY])
+
+    def test_should_write_readable_dataset(self):
+        with PetastormWriter(self.path, self.schema) as writer:
+            for batch in create_dummy_batches():
+                writer.write(batch)
+
+        with make_reader('file://' + self.path, workers_count=1,
+                         shuffle_row_groups=False) as reader:
+            rows = sorted(reader, key=lambda row: row.id)
+
+        self.assertEqual([row.id for row in rows], list(range(NUM_FRAMES)))
+        for row in rows:
+            self.assertTrue(np.array_equal(
+                row.data, np.ones((2, 2, 3), dtype=np.uint8) *
+                np.uint8((row.id + 1) * 25)))
+
+    def test_should_write_single_file_per_session(self):
+        with PetastormWriter(self.path, self.schema, 0) as writer:
+            for batch in create_dummy_batches(batch_size=2):
+                writer.write(batch)
+
+        row_groups = self._row_groups()
+        self.assertEqual(len(row_groups), 1)
+        # zero sized row groups flush on every batch
+        self.assertEqual(list(row_groups.values()), [NUM_FRAMES // 2])
+
+    def test_should_buffer_batches_into_row_groups(self):
+        with PetastormWriter(self.path, self.schema) as writer:
+            for batch in create_dummy_batches(batch_size=2):
+                writer.write(batch)
+
+        self.assertEqual(list(self._row_groups().values()), [1])
+
+    def test_should_append_files_to_metadata(self):
+        for _ in range(2):
+            with PetastormWriter(self.path, self.schema) as writer:
+                for batch in create_dummy_batches():
+                    writer.write(batch)
+
+        self.assertEqual(list(self._row_groups().values()), [1, 1])
+
+    def test_should_drop_partial_file_on_error(self):
+        with self.assertRaises(ValueError):
+            with PetastormWriter(self.path, self.schema) as writer:
+                writer.write(next(create_dummy_batches()))
+                raise ValueError('failed')
+
+        self.assertEqual(os.listdir(self.path), [])
+
+    def test_should_commit_column_statistics(self):
+        with PetastormWriter(self.path, self.schema, 0) as writer:
+            for batch in create_dummy_batches(batch_size=2):
+                writer.write(batch)
+
+        metadata = pq.read_metadata(
+            os.path.join(self.path, '_common_metadata')).metadata
+        statistics = ColumnStatistics.from_index(pickle.loads(
+            metadata[ROWGROUPS_INDEX_KEY])[STATISTICS_INDEX])
+        self.assertEqual(statistics.num_row_groups, NUM_FRAMES // 2)
+        self.assertEqual(statistics.ranges('id'),
+                         [(i, i + 1) for i in range(0, NUM_FRAMES, 2)])
+        # no statistics for the encoded ndarray columns
+        self.assertEqual(statistics.ranges('data'),
+                         [None] * (NUM_FRAMES // 2))
+
+        with make_reader('file://' + self.path, workers_count=1,
+                         shuffle_row_groups=False,
+                         rowgroup_selector=ColumnRangeSelector(
+                             {'id': (3, 4)})) as reader:
+            ids = [row.id for row in reader]
+        # only the row groups [2, 3] and [4, 5] are read
+        self.assertEqual(ids, [2, 3, 4, 5])
+
+    def test_should_not_write_file_without_rows(self):
+        with PetastormWriter(self.path, self.schema):
+            pass
+
+        self.assertEqual(os.listdir(self.path), ['_common_metadata'])
+        self.assertEqual(self._row_groups(), {})
+
+    def test_should_only_read_footer_of_new_file(self):
+        with PetastormWriter(self.path, self.schema, 0) as writer:
+            for batch in create_dummy_batches(batch_size=2):
+                writer.write(batch)
+
+        read_metadata = pq.read_metadata
+        with patch('src.storage.petastorm_writer.pq.read_metadata',
+                   side_effect=read_metadata) as mock_read:
+            with PetastormWriter(self.path, self.schema, 0) as writer:
+                writer.write(next(create_dummy_batches()))
+        # the committed metadata and the footer of the new file
+        self.assertEqual(mock_read.call_count, 2)
+
+        metadata = pq.read_metadata(
+            os.path.join(self.path, '_common_metadata')).metadata
+        statistics = ColumnStatistics.from_index(pickle.loads(
+            metadata[ROWGROUPS_INDEX_KEY])[STATISTICS_INDEX])
+        row_groups = self._row_groups()
+        self.assertEqual(sorted(row_groups.values()), [1, NUM_FRAMES // 2])
+        self.assertEqual(statistics.num_row_groups, NUM_FRAMES // 2 + 1)
+        # the row groups are numbered in the order of the file names
+        expected = []
+        for file_name in sorted(row_groups):
+            file_metadata = pq.read_metadata(
+                os.path.join(self.path, file_name))
+            file_statistics = ColumnStatistics(['id'])
+            for index in range(file_metadata.num_row_groups):
+                file_statistics.add_row_group(file_metadata.row_group(index))
+            expected += file_statistics.ranges('id')
+        self.assertEqual(statistics.ranges('id'), expected)
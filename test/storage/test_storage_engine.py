@@ -0,0 +1,34 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+
+from mock import patch
+
+from src.storage.storage_engine import _LazyStorageEngine
+
+
+class StorageEngineTest(unittest.TestCase):
+
+    @patch('src.storage.storage_engine.str_to_class')
+    def test_should_create_engine_on_first_use(self, mock_str_to_class):
+        engine = _LazyStorageEngine()
+        mock_str_to_class.assert_not_called()
+
+        engine.create('table')
+        engine.write('table', 'rows')
+        mock_str_to_class.assert_called_once()
+        mock_engine = mock_str_to_class.return_value.return_value
+        mock_engine.create.assert_called_once_with('table')
+        mock_engine.write.assert_called_once_with('table', 'rows')
@@ -17,6 +17,8 @@ import unittest
 
 import cv2
 import pandas as pd
+import torch
+from mock import patch
 
 from src.models.storage.batch import Batch
 from src.udfs.fastrcnn_object_detector import FastRCNNObjectDetector
@@ -46,3 +48,20 @@ class FastRCNNObjectDetectorTest(unittest.TestCase):
 
         self.assertEqual(["dog"], result[0].labels)
         self.assertEqual(["cat", "dog"], result[1].labels)
+
+    @patch('torchvision.models.detection.fasterrcnn_resnet50_fpn')
+    def test_should_keep_detections_above_threshold(self, mock_model):
+        mock_model.return_value.return_value = [
+            {'labels': torch.tensor([18, 17]),
+             'boxes': torch.tensor([[1., 2., 3., 4.], [5., 6., 7., 8.]]),
+             'scores': torch.tensor([0.9, 0.5])},
+            {'labels': torch.tensor([1]),
+             'boxes': torch.tensor([[1., 2., 3., 4.]]),
+             'scores': torch.tensor([0.3])}]
+        detector = FastRCNNObjectDetector()
+        result = detector._get_predictions(torch.zeros(2, 3, 4, 4))
+
+        self.assertEqual(list(result['label']), [['dog'], []])
+        self.assertEqual(result['pred_boxes'][0], [[[1., 2.], [3., 4.]]])
+        self.assertAlmostEqual(result['pred_score'][0][0], 0.9, places=5)
+        self.assertEqual(result['pred_score'][1], [])
@@ -0,0 +1,118 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+import torch
+from mock import patch
+from torch import nn, Tensor
+from torchvision.transforms import Compose, transforms
+
+from src.models.catalog.frame_info import FrameInfo
+from src.models.catalog.properties import ColorSpace
+from src.udfs.pytorch_abstract_udf import PytorchAbstractUDF
+
+
+class DummyPytorchUDF(PytorchAbstractUDF):
+
+    def __init__(self):
+        super().__init__()
+        self.weight = nn.Parameter(torch.zeros(1))
+
+    @property
+    def name(self) -> str:
+        return 'dummy'
+
+    @property
+    def input_format(self) -> FrameInfo:
+        return FrameInfo(-1, -1, 3, ColorSpace.RGB)
+
+    @property
+    def labels(self) -> List[str]:
+        return ['mean']
+
+    def _get_predictions(self, frames: Tensor) -> pd.DataFrame:
+        return pd.DataFrame(
+            {'mean': self.as_numpy(frames.mean(dim=(1, 2, 3)))})
+
+
+class ResizingPytorchUDF(DummyPytorchUDF):
+
+    @property
+    def input_size(self) -> Tuple[int, int]:
+        return 4, 6
+
+
+class CustomTransformsUDF(DummyPytorchUDF):
+
+    @property
+    def transforms(self) -> Compose:
+        return Compose([transforms.ToTensor(),
+                        transforms.Normalize([0.5] * 3, [0.5] * 3)])
+
+
+class PytorchAbstractUDFTest(unittest.TestCase):
+
+    def setUp(self):
+        self.frames = [np.random.randint(0, 256, (8, 12, 3), dtype=np.uint8)
+                       for _ in range(3)]
+
+    def _per_frame(self, udf):
+        return torch.cat([udf.transform(frame) for frame in self.frames])
+
+    def test_should_preprocess_whole_batch_like_transforms(self):
+        udf = DummyPytorchUDF()
+        actual = udf.preprocess(self.frames)
+        self.assertEqual(actual.shape, (3, 3, 8, 12))
+        self.assertEqual(actual.dtype, torch.float32)
+        self.assertTrue(torch.allclose(actual, self._per_frame(udf)))
+
+    def test_should_resize_to_input_size(self):
+        udf = ResizingPytorchUDF()
+        self.assertEqual(udf.preprocess(self.frames).shape, (3, 3, 4, 6))
+        self.assertEqual(self._per_frame(udf).shape, (3, 3, 4, 6))
+
+    def test_should_antialias_downscaled_frames(self):
+        udf = ResizingPytorchUDF()
+        # a bright column every 8 pixels falls between the pixels bilinear
+        # interpolation samples
+        self.frames = [np.zeros((32, 48, 3), dtype=np.uint8)]
+        self.frames[0][:, ::8] = 255
+        actual = udf.preprocess(self.frames)
+        expected = self._per_frame(udf)
+        self.assertAlmostEqual(actual.mean().item(), 1 / 8, delta=0.01)
+        self.assertTrue(torch.allclose(actual, expected, atol=0.05))
+
+    def test_should_preprocess_per_frame_with_custom_transforms(self):
+        udf = CustomTransformsUDF()
+        actual = udf.preprocess(self.frames)
+        self.assertTrue(torch.equal(actual, self._per_frame(udf)))
+        self.assertLess(actual.min().item(), 0)
+
+    def test_should_preprocess_frames_of_different_shapes(self):
+        udf = ResizingPytorchUDF()
+        self.frames.append(np.zeros((10, 10, 3), dtype=np.uint8))
+        self.assertEqual(udf.preprocess(self.frames).shape, (4, 3, 4, 6))
+
+    @patch('src.udfs.pytorch_abstract_udf.ConfigurationManager')
+    def test_should_merge_predictions_of_all_chunks(self, mock_config):
+        udf = DummyPytorchUDF()
+        mock_config.return_value.get_value.return_value = 2
+        outcome = udf(pd.DataFrame({'data': self.frames}))
+        expected = [frame.mean() / 255 for frame in self.frames]
+        self.assertEqual(list(outcome.index), [0, 1, 2])
+        np.testing.assert_allclose(outcome['mean'], expected, rtol=1e-5)
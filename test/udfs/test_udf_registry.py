@@ -0,0 +1,99 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import tempfile
+import unittest
+
+from mock import patch, MagicMock
+
+from src.udfs.udf_registry import UdfRegistry
+
+
+class UdfRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        UdfRegistry().reset()
+        fd, self.impl_path = tempfile.mkstemp(suffix='.py')
+        os.close(fd)
+
+    def tearDown(self):
+        UdfRegistry().reset()
+        os.remove(self.impl_path)
+
+    def test_registry_singleton_pattern(self):
+        self.assertEqual(UdfRegistry(), UdfRegistry())
+
+    @patch('src.udfs.udf_registry.path_to_class')
+    def test_should_load_udf_only_once(self, mock_path):
+        registry = UdfRegistry()
+        udf = registry.get('udf', self.impl_path)
+        self.assertEqual(udf, registry.get('udf', self.impl_path))
+        mock_path.assert_called_once_with(self.impl_path, 'udf')
+        self.assertEqual(len(registry), 1)
+
+    @patch('src.udfs.udf_registry.path_to_class')
+    def test_should_key_on_constructor_args(self, mock_path):
+        registry = UdfRegistry()
+        registry.get('udf', self.impl_path, threshold=0.5)
+        registry.get('udf', self.impl_path, threshold=0.8)
+        self.assertEqual(len(registry), 2)
+        mock_path.return_value.assert_called_with(threshold=0.8)
+
+    @patch('src.udfs.udf_registry.path_to_class')
+    def test_should_reload_modified_implementation(self, mock_path):
+        registry = UdfRegistry()
+        registry.get('udf', self.impl_path)
+        mtime = os.path.getmtime(self.impl_path)
+        os.utime(self.impl_path, (mtime + 10, mtime + 10))
+        registry.get('udf', self.impl_path)
+        self.assertEqual(mock_path.call_count, 2)
+        # stale instance is dropped
+        self.assertEqual(len(registry), 1)
+
+    @patch('src.udfs.udf_registry.path_to_class')
+    def test_should_invalidate_udf(self, mock_path):
+        registry = UdfRegistry()
+        registry.get('udf', self.impl_path)
+        registry.get('other', self.impl_path)
+        registry.invalidate('udf')
+        self.assertEqual(len(registry), 1)
+        registry.get('udf', self.impl_path)
+        self.assertEqual(mock_path.call_count, 3)
+
+    @patch('src.udfs.udf_registry.path_to_class')
+    def test_should_evict_least_recently_used(self, mock_path):
+        registry = UdfRegistry()
+        udfs = [MagicMock(), MagicMock(), MagicMock()]
+        mock_path.return_value.side_effect = udfs
+        with patch.object(UdfRegistry, '_estimate_footprint',
+                          return_value=1024 * 1024):
+            registry._max_footprint = 2 * 1024 * 1024
+            registry.get('udf', self.impl_path, 0)
+            registry.get('udf', self.impl_path, 1)
+            # touch the first one so that the second one gets evicted
+            registry.get('udf', self.impl_path, 0)
+            registry.get('udf', self.impl_path, 2)
+
+        self.assertEqual(len(registry), 2)
+        self.assertEqual(registry.footprint, 2 * 1024 * 1024)
+        self.assertEqual(registry.get('udf', self.impl_path, 0), udfs[0])
+        self.assertEqual(registry.get('udf', self.impl_path, 2), udfs[2])
+
+    @patch('src.udfs.udf_registry.path_to_class')
+    def test_warm_up_should_not_raise(self, mock_path):
+        mock_path.side_effect = Exception('failed')
+        self.assertFalse(UdfRegistry().warm_up('udf', self.impl_path))
+        mock_path.side_effect = None
+        self.assertTrue(UdfRegistry().warm_up('udf', self.impl_path))
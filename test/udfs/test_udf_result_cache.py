@@ -0,0 +1,134 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+from mock import MagicMock, patch
+
+from src.udfs.udf_result_cache import UdfResultCache, drop_udf_results
+
+
+class UdfResultCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.table_path = tempfile.mkdtemp()
+        fd, self.impl_path = tempfile.mkstemp(suffix='.py')
+        os.write(fd, b'class Udf: pass')
+        os.close(fd)
+        self.udf = MagicMock(side_effect=lambda frames: pd.DataFrame(
+            {'label': frames['data'] * 10}))
+
+    def tearDown(self):
+        shutil.rmtree(self.table_path)
+        os.remove(self.impl_path)
+
+    def _cache(self, arguments=['data']):
+        return UdfResultCache(self.table_path, 'id', 'udf', self.impl_path,
+                              arguments)
+
+    def _evaluate(self, cache, ids):
+        frames = pd.DataFrame({'data': ids})
+        return cache.evaluate(pd.Series(ids), frames, self.udf)
+
+    def test_should_only_evaluate_missing_frames(self):
+        cache = self._cache()
+        outcomes = self._evaluate(cache, [1, 2, 3])
+        self.assertEqual(list(outcomes['label']), [10, 20, 30])
+
+        outcomes = self._evaluate(cache, [3, 4, 1, 3])
+        self.assertEqual(list(outcomes['label']), [30, 40, 10, 30])
+        self.assertEqual(self.udf.call_count, 2)
+        self.assertEqual(list(self.udf.call_args[0][0]['data']), [4])
+        self.assertEqual(len(cache), 4)
+
+    def test_should_reuse_results_across_instances(self):
+        self._evaluate(self._cache(), [1, 2])
+        other = self._cache()
+        self._evaluate(self._cache(), [3])
+
+        outcomes = self._evaluate(other, [1, 2, 3])
+        self.assertEqual(list(outcomes['label']), [10, 20, 30])
+        self.assertEqual(self.udf.call_count, 2)
+
+    def test_should_not_share_results_of_other_udfs(self):
+        cache = self._cache()
+        self.assertNotEqual(cache.path, self._cache(['frame']).path)
+        with open(self.impl_path, 'a') as impl_file:
+            impl_file.write('\n# modified')
+        self.assertNotEqual(cache.path, self._cache().path)
+
+    def test_should_drop_results_of_removed_table(self):
+        cache = self._cache()
+        self._evaluate(cache, [1, 2])
+        shutil.rmtree(self.table_path)
+        os.makedirs(self.table_path)
+
+        self._evaluate(cache, [2])
+        self.assertEqual(self.udf.call_count, 2)
+        self.assertEqual(len(cache), 1)
+
+    def test_should_reload_results_after_clear(self):
+        cache = self._cache()
+        self._evaluate(cache, [1, 2])
+        cache.clear()
+        self._evaluate(cache, [1, 2])
+        self.assertEqual(self.udf.call_count, 1)
+
+    def test_should_ignore_incomplete_chunks(self):
+        cache = self._cache()
+        self._evaluate(cache, [1])
+        with open(cache.path, 'ab') as cache_file:
+            cache_file.write(b'\x80\x03}q')
+
+        other = self._cache()
+        self._evaluate(other, [1])
+        self.assertEqual(self.udf.call_count, 1)
+
+    def test_should_not_cache_non_per_frame_outputs(self):
+        udf = MagicMock(return_value=pd.DataFrame({'count': [2]}))
+        cache = self._cache()
+        outcomes = cache.evaluate(pd.Series([1, 2]),
+                                  pd.DataFrame({'data': [1, 2]}), udf)
+        self.assertEqual(list(outcomes['count']), [2])
+        self.assertEqual(len(cache), 0)
+
+    def test_should_drop_results_of_table(self):
+        cache = self._cache()
+        self._evaluate(cache, [1, 2])
+        drop_udf_results(self.table_path)
+        self.assertFalse(os.path.exists(cache.path))
+        drop_udf_results(self.table_path)
+
+        self._evaluate(cache, [1])
+        self.assertEqual(self.udf.call_count, 2)
+        self.assertEqual(len(cache), 1)
+
+    def test_should_read_results_of_requested_frames(self):
+        cache = self._cache()
+        self._evaluate(cache, [1, 2])
+        self._evaluate(cache, [3])
+
+        other = self._cache()
+        with patch('src.udfs.udf_result_cache.pickle.load',
+                   wraps=pickle.load) as load:
+            outcomes = self._evaluate(other, [3])
+        self.assertEqual(list(outcomes['label']), [30])
+        # token and two chunks to index them, then the chunk of frame 3
+        self.assertEqual(load.call_count, 5)
+        self.assertEqual(self.udf.call_count, 2)
@@ -0,0 +1,57 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+
+import pandas as pd
+from mock import MagicMock
+
+from src.udfs.udf_result_memo import UdfResultMemo
+
+
+class UdfResultMemoTest(unittest.TestCase):
+
+    def setUp(self):
+        self.udf = MagicMock(side_effect=lambda frames: pd.DataFrame(
+            {'label': frames['data'] * 10}))
+
+    def _evaluate(self, memo, ids):
+        frames = pd.DataFrame({'data': ids})
+        return memo.evaluate(pd.Series(ids), frames, self.udf)
+
+    def test_should_only_evaluate_missing_frames(self):
+        memo = UdfResultMemo('id')
+        outcomes = self._evaluate(memo, [1, 2, 3])
+        self.assertEqual(list(outcomes['label']), [10, 20, 30])
+
+        outcomes = self._evaluate(memo, [3, 1])
+        self.assertEqual(list(outcomes['label']), [30, 10])
+        self.assertEqual(self.udf.call_count, 1)
+        self.assertEqual(len(memo), 3)
+
+    def test_should_evaluate_again_after_clear(self):
+        memo = UdfResultMemo('id')
+        self._evaluate(memo, [1, 2])
+        memo.clear()
+        self.assertEqual(len(memo), 0)
+        self._evaluate(memo, [1])
+        self.assertEqual(self.udf.call_count, 2)
+
+    def test_should_not_store_non_per_frame_outputs(self):
+        udf = MagicMock(return_value=pd.DataFrame({'count': [2]}))
+        memo = UdfResultMemo('id')
+        outcomes = memo.evaluate(pd.Series([1, 2]),
+                                 pd.DataFrame({'data': [1, 2]}), udf)
+        self.assertEqual(list(outcomes['count']), [2])
+        self.assertEqual(len(memo), 0)
@@ -0,0 +1,41 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+
+from src.udfs.udf_runtime_statistics import UdfRuntimeStatistics
+
+
+class UdfRuntimeStatisticsTest(unittest.TestCase):
+
+    def setUp(self):
+        UdfRuntimeStatistics().reset()
+
+    def tearDown(self):
+        UdfRuntimeStatistics().reset()
+
+    def test_statistics_singleton_pattern(self):
+        self.assertEqual(UdfRuntimeStatistics(), UdfRuntimeStatistics())
+
+    def test_should_average_per_row_runtimes(self):
+        statistics = UdfRuntimeStatistics()
+        self.assertIsNone(statistics.cost('udf'))
+        statistics.record('udf', 10, 1.0)
+        self.assertAlmostEqual(statistics.cost('udf'), 0.1)
+        statistics.record('udf', 2, 1.2)
+        self.assertAlmostEqual(statistics.cost('udf'), 0.2)
+        # calls without rows do not tell anything about the cost
+        statistics.record('udf', 0, 1.0)
+        self.assertAlmostEqual(statistics.cost('udf'), 0.2)
+        self.assertIsNone(statistics.cost('other'))
@@ -0,0 +1,53 @@
+# coding=utf-8
+# Copyright 2018-2020 EVA
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import threading
+import unittest
+
+from src.utils.fork_utils import ForkSafeLock
+
+
+class ForkSafeLockTest(unittest.TestCase):
+
+    def _acquire_in_child(self, lock: ForkSafeLock) -> int:
+        pid = os.fork()
+        if pid == 0:
+            acquired = lock.acquire(timeout=5)
+            os._exit(0 if acquired else 1)
+        _, status = os.waitpid(pid, 0)
+        return os.WEXITSTATUS(status)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'requires fork')
+    def test_child_should_acquire_lock_held_by_other_thread(self):
+        for lock in [ForkSafeLock(), ForkSafeLock(reentrant=True)]:
+            held = threading.Event()
+            release = threading.Event()
+
+            def hold():
+                with lock:
+                    held.set()
+                    release.wait()
+
+            thread = threading.Thread(target=hold)
+            thread.start()
+            held.wait()
+            try:
+                self.assertFalse(lock.acquire(timeout=0.01))
+                self.assertEqual(self._acquire_in_child(lock), 0)
+            finally:
+                release.set()
+                thread.join()
+            self.assertTrue(lock.acquire(timeout=1))
+            lock.release()
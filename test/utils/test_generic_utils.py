@@ -18,7 +18,8 @@ from mock import patch, MagicMock
 from pathlib import Path
 
 from src.utils.generic_utils import (str_to_class, path_to_class,
-                                     is_gpu_available, generate_file_path)
+                                     is_gpu_available, generate_file_path,
+                                     structural_hash)
 from src.readers.opencv_reader import OpenCVReader
 
 
@@ -34,11 +35,11 @@ class ModulePathTest(unittest.TestCase):
         vl = path_to_class('src/readers/opencv_reader.py', 'OpenCVReader')
         self.assertEqual(vl, OpenCVReader)
 
-    @patch('src.utils.generic_utils.torch')
+    @patch('torch.cuda.is_available')
     def test_should_use_torch_to_check_if_gpu_is_available(self,
-                                                           torch):
+                                                           is_available):
         is_gpu_available()
-        torch.cuda.is_available.assert_called()
+        is_available.assert_called()
 
     @patch('src.utils.generic_utils.ConfigurationManager')
     def test_should_return_a_randon_full_path(self, mock_conf):
@@ -53,3 +54,20 @@ class ModulePathTest(unittest.TestCase):
 
         mock_conf_inst.get_value.return_value = None
         self.assertRaises(KeyError, generate_file_path)
+
+    def test_structural_hash_should_match_equal_values(self):
+        class Node:
+            def __init__(self, value):
+                self.value = value
+
+            def fingerprint(self):
+                return hash(self.value)
+
+        self.assertEqual(structural_hash([Node(1), {'a': (2, 'b')}]),
+                         structural_hash([Node(1), {'a': (2, 'b')}]))
+        self.assertNotEqual(structural_hash([Node(1)]),
+                            structural_hash([Node(2)]))
+        self.assertNotEqual(structural_hash([1]), structural_hash((1,)))
+        # unhashable values fall back to their type
+        self.assertEqual(structural_hash({'a': {1}}),
+                         structural_hash({'a': {2}}))